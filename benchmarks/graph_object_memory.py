@@ -0,0 +1,59 @@
+"""
+Measure the memory used per Annotation in a large Annotations list.
+
+create_annotated_heatmap makes one annotation per cell, so big heatmaps
+hold a lot of these. Annotations are stored as plain dicts until they're
+accessed, so this reports the bytes per annotation both before and after
+every annotation is wrapped as a graph object. Requires Python 3.4+ for
+tracemalloc.
+
+    python benchmarks/graph_object_memory.py
+
+"""
+from __future__ import absolute_import, print_function
+
+import gc
+import sys
+
+from plotly.graph_objs import Annotations
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+NUM_ANNOTATIONS = 100000
+
+
+def make_annotation_dicts(num_annotations):
+    return [dict(text=str(i), x=i % 100, y=i // 100, xref='x1', yref='y1',
+                 showarrow=False, font=dict(color='#FFFFFF'))
+            for i in range(num_annotations)]
+
+
+def main():
+    if tracemalloc is None:
+        sys.exit('This benchmark needs tracemalloc (Python 3.4+).')
+
+    annotation_dicts = make_annotation_dicts(NUM_ANNOTATIONS)
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    annotations = Annotations(annotation_dicts)
+    stored = tracemalloc.get_traced_memory()[0] - start
+
+    for annotation in annotations:
+        annotation['font']  # wrap the nested font too
+    wrapped = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    print('Memory per Annotation ({:,} annotations):'.format(NUM_ANNOTATIONS))
+    print('  {:<8} {:,.0f} bytes'.format('stored', stored / NUM_ANNOTATIONS))
+    print('  {:<8} {:,.0f} bytes'.format('wrapped',
+                                         wrapped / NUM_ANNOTATIONS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Time importing plotly in fresh interpreters.
+
+Each import runs in a new Python process, so nothing is cached in memory,
+and the best of a few runs is reported along with whether the import loaded
+requests. It also reports how long making every graph object class's
+docstring takes, which used to be done on import and is now done when a
+docstring is read.
+
+    python benchmarks/import_time.py [module ...]
+
+The modules default to plotly, plotly.offline and plotly.graph_objs.
+
+"""
+from __future__ import absolute_import, print_function
+
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ['plotly', 'plotly.offline', 'plotly.graph_objs']
+REPEAT = 5
+
+IMPORT_SCRIPT = """
+from __future__ import print_function
+import sys
+import time
+start = time.time()
+import {module}
+print(time.time() - start, 'requests' in sys.modules)
+"""
+
+
+def time_import(module):
+    times = []
+    for _ in range(REPEAT):
+        output = subprocess.check_output(
+            [sys.executable, '-c', IMPORT_SCRIPT.format(module=module)]
+        )
+        seconds, loads_requests = output.decode('utf-8').split()[-2:]
+        times.append(float(seconds))
+    return min(times), loads_requests == 'True'
+
+
+def time_docstrings():
+    from plotly import graph_reference
+    from plotly.graph_objs import graph_objs_tools
+
+    start = time.time()
+    for class_dict in graph_reference.CLASSES.values():
+        if class_dict['object_name'] is not None:
+            graph_objs_tools.get_help(class_dict['object_name'])
+    return time.time() - start
+
+
+def main():
+    modules = sys.argv[1:] or DEFAULT_MODULES
+    print('Import time (best of {}, fresh interpreters):'.format(REPEAT))
+    for module in modules:
+        seconds, loads_requests = time_import(module)
+        print('  {:<20} {:.3f} s{}'.format(
+            module, seconds, ', loads requests' if loads_requests else ''))
+    print('  {:<20} {:.3f} s'.format('all docstrings', time_docstrings()))
+
+
+if __name__ == '__main__':
+    main()
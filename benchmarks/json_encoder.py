@@ -0,0 +1,88 @@
+"""
+Compare PlotlyJSONEncoder to the old encode -> loads -> dumps round trip.
+
+The figure is a 1M-point scatter trace with some non-finite values sprinkled
+in, since those are what the strict encoding has to handle.
+
+    python benchmarks/json_encoder.py
+
+"""
+from __future__ import absolute_import, print_function
+
+import json
+import math
+import random
+import time
+
+from plotly import utils
+from plotly.graph_objs import Figure, Scatter
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None  # peak memory is only reported on Python 3.4+
+
+NUM_POINTS = 1000000
+REPEAT = 3
+
+
+class RoundTripJSONEncoder(utils.PlotlyJSONEncoder):
+    """How PlotlyJSONEncoder used to coerce to strict JSON."""
+
+    def encode(self, o):
+        encoded_o = json.JSONEncoder.encode(self, o)
+        new_o = json.loads(encoded_o, parse_constant=self.coerce_to_strict)
+        return json.dumps(new_o, sort_keys=self.sort_keys,
+                          indent=self.indent,
+                          separators=(self.item_separator,
+                                      self.key_separator))
+
+
+def make_figure(num_points):
+    random.seed(0)
+    y = [random.random() for _ in range(num_points)]
+    for i in range(0, num_points, 1000):
+        y[i] = float('nan')
+    y[1] = float('inf')
+    return Figure(data=[Scatter(x=list(range(num_points)), y=y)])
+
+
+def measure(figure, cls):
+    """Return (best time in seconds, peak memory in MB or None)."""
+    times = []
+    for _ in range(REPEAT):
+        start = time.time()
+        json.dumps(figure, cls=cls)
+        times.append(time.time() - start)
+
+    peak = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        json.dumps(figure, cls=cls)
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def main():
+    figure = make_figure(NUM_POINTS)
+    assert (json.dumps(figure, cls=utils.PlotlyJSONEncoder) ==
+            json.dumps(figure, cls=RoundTripJSONEncoder))
+
+    print('Encoding a {:,}-point scatter trace (best of {}):'
+          .format(NUM_POINTS, REPEAT))
+    results = {}
+    for name, cls in [('round trip', RoundTripJSONEncoder),
+                      ('single pass', utils.PlotlyJSONEncoder)]:
+        seconds, peak = results[name] = measure(figure, cls)
+        peak_string = 'n/a' if peak is None else '{:.1f} MB'.format(peak)
+        print('  {:<12} {:.3f} s, peak memory {}'
+              .format(name, seconds, peak_string))
+
+    speedup = results['round trip'][0] / results['single pass'][0]
+    if not math.isinf(speedup):
+        print('  speedup      {:.1f}x'.format(speedup))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure how many messages per second chunked_requests.Stream can write.
+
+Messages like the ones `plotly.plotly.Stream.write` sends are written to a
+local sink that reads the chunked request and answers once it ends. Reports
+the time to connect and the messages per second, from the first write until
+`close` returns the sink's response.
+
+    python benchmarks/stream_throughput.py
+
+"""
+from __future__ import absolute_import, print_function
+
+import socket
+import threading
+import time
+
+from plotly.plotly.chunked_requests import Stream
+
+NUM_MESSAGES = 50000
+MESSAGE = '{"x": 1.5, "y": 2.5}\n'
+REPEAT = 3
+
+
+def serve_sink(server_socket):
+    """Read each chunked request until it ends, then answer and close."""
+    while True:
+        connection, _ = server_socket.accept()
+        received = b''
+        while not received.endswith(b'0\r\n\r\n'):
+            data = connection.recv(2 ** 16)
+            if not data:
+                break
+            received = received[-16:] + data
+        connection.sendall(b'HTTP/1.1 200 OK\r\ncontent-length: 0\r\n\r\n')
+        connection.close()
+
+
+def main():
+    server_socket = socket.socket()
+    server_socket.bind(('127.0.0.1', 0))
+    server_socket.listen(1)
+    port = server_socket.getsockname()[1]
+    thread = threading.Thread(target=serve_sink, args=(server_socket,))
+    thread.daemon = True
+    thread.start()
+
+    connect_times, write_times = [], []
+    for _ in range(REPEAT):
+        start = time.time()
+        stream = Stream('127.0.0.1', port)
+        connect_times.append(time.time() - start)
+
+        start = time.time()
+        for _ in range(NUM_MESSAGES):
+            stream.write(MESSAGE)
+        response = stream.close()
+        write_times.append(time.time() - start)
+        assert response.status == 200
+
+    print('Writing {:,} messages to a local sink (best of {}):'.format(
+        NUM_MESSAGES, REPEAT))
+    print('  {:<9} {:.3f} s'.format('connect', min(connect_times)))
+    print('  {:<9} {:,.0f} messages/s'.format(
+        'write', NUM_MESSAGES / min(write_times)))
+
+
+if __name__ == '__main__':
+    main()
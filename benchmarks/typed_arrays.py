@@ -0,0 +1,65 @@
+"""
+Compare text JSON to base64 typed arrays for a 2000x2000 Heatmap.z.
+
+Reports the encoded size and the time to encode the figure with and without
+`typed_arrays=True`, plus the time to decode the typed array back to numpy.
+Requires numpy.
+
+    python benchmarks/typed_arrays.py
+
+"""
+from __future__ import absolute_import, print_function
+
+import json
+import time
+
+import numpy as np
+
+from plotly import utils
+from plotly.graph_objs import Figure, Heatmap
+
+SHAPE = (2000, 2000)
+REPEAT = 3
+
+
+def best_time(func):
+    times = []
+    for _ in range(REPEAT):
+        start = time.time()
+        result = func()
+        times.append(time.time() - start)
+    return min(times), result
+
+
+def main():
+    np.random.seed(0)
+    z = np.random.random(SHAPE)
+    figure = Figure(data=[Heatmap(z=z)])
+
+    print('Encoding a {}x{} Heatmap.z (best of {}):'.format(
+        SHAPE[0], SHAPE[1], REPEAT))
+    results = {}
+    for name, typed_arrays in [('text', False), ('typed array', True)]:
+        seconds, encoded = best_time(
+            lambda: json.dumps(figure, cls=utils.PlotlyJSONEncoder,
+                               typed_arrays=typed_arrays)
+        )
+        results[name] = seconds, len(encoded)
+        print('  {:<12} {:.3f} s, {:.1f} MB'.format(
+            name, seconds, len(encoded) / 1e6))
+
+    text_seconds, text_size = results['text']
+    typed_seconds, typed_size = results['typed array']
+    print('  {:<12} {:.1f}x faster, {:.1f}x smaller'.format(
+        'reduction', text_seconds / typed_seconds,
+        float(text_size) / typed_size))
+
+    typed_z = json.loads(json.dumps(z, cls=utils.PlotlyJSONEncoder,
+                                    typed_arrays=True))
+    seconds, decoded = best_time(lambda: utils.decode_typed_array(typed_z))
+    assert (decoded == z).all()
+    print('  {:<12} {:.3f} s'.format('decode', seconds))
+
+
+if __name__ == '__main__':
+    main()
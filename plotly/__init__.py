@@ -28,6 +28,47 @@ Modules:
 
 from __future__ import absolute_import
 
-from plotly import (plotly, graph_objs, grid_objs, tools, utils, session,
-                    offline)
+import importlib as _importlib
+import sys as _sys
+import types as _types
+
 from plotly.version import __version__
+
+# These are imported when they're first used, e.g., `plotly.tools`, so
+# `import plotly` doesn't pay for requests, ~/.plotly or the graph reference.
+# `from plotly import tools` and `import plotly.tools` work as always.
+_SUBMODULES = ('plotly', 'graph_objs', 'grid_objs', 'tools', 'utils',
+              'session', 'offline')
+
+
+class _PlotlyModule(_types.ModuleType):
+    """
+    The `plotly` module, importing its submodules on first access.
+
+    Module `__getattr__` (PEP 562) needs Python 3.7+, so `plotly` is replaced
+    in `sys.modules` with an instance of this class instead.
+
+    """
+    def __getattr__(self, name):
+        """Import a submodule, only called if `name` isn't set yet."""
+        if name in _SUBMODULES:
+            return _importlib.import_module('plotly.' + name)
+        raise AttributeError(
+            "module 'plotly' has no attribute '{}'".format(name)
+        )
+
+    def __dir__(self):
+        """List the version and the public submodules, imported or not."""
+        submodules = [name for name, value in self.__dict__.items()
+                      if isinstance(value, _types.ModuleType)
+                      and not name.startswith('_')]
+        return sorted(set(submodules) | set(_SUBMODULES) | {'__version__'})
+
+
+_module = _PlotlyModule(__name__, __doc__)
+_module.__dict__.update(globals())
+
+# the methods above use this module's globals and python 2 sets the globals
+# of a module to None when it's garbage collected, so keep it alive
+_module._original_module = _sys.modules[__name__]
+_sys.modules[__name__] = _module
@@ -5,6 +5,7 @@ PLOTLY_DIR = os.path.join(os.path.expanduser("~"), ".plotly")
 CREDENTIALS_FILE = os.path.join(PLOTLY_DIR, ".credentials")
 CONFIG_FILE = os.path.join(PLOTLY_DIR, ".config")
 GRAPH_REFERENCE_FILE = os.path.join(PLOTLY_DIR, ".graph_reference")
+GRAPH_REFERENCE_INDEX_FILE = os.path.join(PLOTLY_DIR, ".graph_reference_index")
 TEST_DIR = os.path.join(os.path.expanduser("~"), ".test")
 TEST_FILE = os.path.join(PLOTLY_DIR, ".permission_test")
 
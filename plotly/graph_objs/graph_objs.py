@@ -26,39 +26,731 @@ from __future__ import absolute_import
 
 import copy
 import re
+import threading
 import warnings
 from collections import OrderedDict
+from contextlib import contextmanager
 
 import six
 
 from plotly import exceptions, graph_reference
 from plotly.graph_objs import graph_objs_tools
 
+# 'full' validates every key of every object, 'shallow' validates the keys of
+# the object being built or set but trusts its children and 'none' trusts
+# everything. See `set_validation_mode`.
+VALIDATION_MODES = ('full', 'shallow', 'none')
+DEFAULT_VALIDATION_MODE = 'full'
+
+_validation_mode = DEFAULT_VALIDATION_MODE
+
+# `validation_mode` overrides the mode for one thread only, in `.mode`
+_thread_validation_mode = threading.local()
+
+
+def get_validation_mode():
+    """
+    Return the current validation mode for graph objects.
+
+    :return: (str) One of VALIDATION_MODES.
+
+    """
+    return getattr(_thread_validation_mode, 'mode', None) or _validation_mode
+
+
+def _check_validation_mode(mode):
+    """Raise a PlotlyError if `mode` isn't one of VALIDATION_MODES."""
+    if mode not in VALIDATION_MODES:
+        raise exceptions.PlotlyError(
+            "'{}' is not a valid validation mode. Valid modes are: {}."
+            .format(mode, ', '.join(VALIDATION_MODES))
+        )
+
+
+def set_validation_mode(mode):
+    """
+    Set how graph objects are validated as they're built and updated.
+
+        * 'full': (default) Validate every key against the graph reference,
+                  all the way down.
+        * 'shallow': Validate the keys of the object being built or set, but
+                     trust its children.
+        * 'none': Trust everything. Keys are set as-is, only nested dicts and
+                  lists are wrapped as graph objects. Use this for figures
+                  that are already known to be valid.
+
+    The mode is used by every thread, except where `validation_mode` is
+    overriding it.
+
+    :param (str) mode: One of VALIDATION_MODES.
+    :raises: (PlotlyError) If the mode isn't valid.
+
+    """
+    global _validation_mode
+    _check_validation_mode(mode)
+    _validation_mode = mode
+
+
+@contextmanager
+def validation_mode(mode):
+    """
+    Temporarily set the validation mode. See `set_validation_mode`.
+
+    Only the current thread uses `mode`, so other threads (e.g., serving
+    other requests) keep validating as before.
+
+    Example:
+    ```
+    with validation_mode('none'):
+        figure = Figure(known_good_figure_dict)
+    ```
+
+    :param (str) mode: One of VALIDATION_MODES.
+
+    """
+    _check_validation_mode(mode)
+    previous_mode = getattr(_thread_validation_mode, 'mode', None)
+    _thread_validation_mode.mode = mode
+    try:
+        yield
+    finally:
+        _thread_validation_mode.mode = previous_mode
+
+
+def _get_child_validation_mode(mode):
+    """Children are only validated in 'full' mode."""
+    return 'full' if mode == 'full' else 'none'
+
+
+# Shared parent name tuples, see `PlotlyBase._get_parent_names`. There's one
+# per object context in the graph reference at most.
+_PARENT_NAMES = {}
+
+
+class _InvalidValue(Exception):
+    """Raised by `_copy_value` when a value has to be converted eagerly."""
+
+
+def _get_subplot_key(key, subplot_attributes):
+    """Some keys can have appended integers, this handles that."""
+    match = re.search(r'(?P<digits>\d+$)', key)
+    if match:
+        root_key = key[:match.start()]
+        if (root_key in subplot_attributes and
+                not match.group('digits').startswith('0')):
+            return root_key
+
+
+def _get_entry_object_name(array_name, entry):
+    """Get the object name for a dict in an array, `None` if it's unclear."""
+    items = graph_reference.ARRAYS[array_name]['items']
+    if array_name == 'data':
+        item = entry.get('type', 'scatter')
+        return item if item in items else None
+    if len(items) == 1:
+        return items[0]
+
+
+def _copy_value(object_name, value, parent_object_names, validate):
+    """
+    Validate a value for a graph object and copy it into plain storage.
+
+    Graph objects keep nested dicts and lists as the plain copies made here
+    and only wrap them as graph objects when they're accessed, so building a
+    big figure doesn't allocate a graph object for every nested dict.
+
+    The copy has new dicts and lists for the graph objects in `value`, the
+    values in them are shared. If `validate` is False, nothing is checked
+    against the graph reference.
+
+    :param (str) object_name: The object or array name `value` is for.
+    :param (dict|list) value: The value to copy.
+    :param (tuple[str]) parent_object_names: Names of the parent objects.
+    :param (bool) validate: Raise if any key isn't valid?
+    :return: (dict|list) The plain copy.
+    :raises: (_InvalidValue) If `value` isn't valid. Converting it eagerly
+             instead raises a helpful error or drops the invalid items.
+
+    """
+    if object_name in graph_reference.ARRAYS:
+        if not isinstance(value, list):
+            raise _InvalidValue
+        parent_object_names += (object_name, )
+        copied = []
+        for entry in value:
+            if not isinstance(entry, dict):
+                raise _InvalidValue
+            entry_object_name = _get_entry_object_name(object_name, entry)
+            if entry_object_name is None:
+                raise _InvalidValue
+            copied.append(_copy_value(entry_object_name, entry,
+                                      parent_object_names, validate))
+        return copied
+
+    if not isinstance(value, dict):
+        raise _InvalidValue
+    table = graph_reference.get_attributes_table(object_name,
+                                                 parent_object_names)
+    attributes = table['attributes']
+    parent_object_names += (object_name, )
+
+    copied = {}
+    if object_name in graph_reference.TRACE_NAMES:
+        copied['type'] = object_name
+    for key, val in value.items():
+        if not isinstance(key, six.string_types):
+            raise _InvalidValue
+        attribute = attributes.get(key)
+
+        if key.endswith('src') and (attribute is not None or not validate):
+            copied[key] = graph_objs_tools.assign_id_to_src(key, val)
+            continue
+
+        if attribute is not None and attribute['is_object']:
+            child_object_name = key
+        else:
+            child_object_name = _get_subplot_key(key,
+                                                 table['subplot_attributes'])
+        if child_object_name is not None:
+            try:
+                val = _copy_value(child_object_name, val, parent_object_names,
+                                  validate)
+            except _InvalidValue:
+                if validate:
+                    raise
+        elif attribute is None and validate:
+            raise _InvalidValue
+        copied[key] = val
+    return copied
+
+
+def _wrap_value(object_name, value, parent, parent_key):
+    """
+    Wrap a plain copy from `_copy_value` as a graph object.
+
+    The graph object takes over the copy's items as they are, its own nested
+    dicts and lists are wrapped when they're accessed in turn.
+
+    """
+    if object_name in graph_reference.ARRAYS:
+        if not isinstance(value, list):
+            return value
+        graph_object = GraphObjectFactory.create(object_name, _parent=parent,
+                                                 _parent_key=parent_key)
+        list.extend(graph_object, value)
+    else:
+        if not isinstance(value, dict):
+            return value
+        graph_object = GraphObjectFactory.create(object_name, _parent=parent,
+                                                 _parent_key=parent_key)
+        dict.update(graph_object, value)
+    return graph_object
+
+
+def _get_plain_value(value):
+    """
+    Get a value's items as plain dicts and lists, like `_copy_value` stores.
+
+    Stored plain dicts and lists are never changed in place, wrapping one
+    copies its items into a new graph object. So they're shared here as they
+    are, only graph objects are copied.
+
+    """
+    if isinstance(value, PlotlyDict):
+        return dict((key, _get_plain_value(val))
+                    for key, val in dict.items(value))
+    if isinstance(value, PlotlyList):
+        return [_get_plain_value(entry) for entry in list.__iter__(value)]
+    return value
+
+
+def _copy_containers(value, copy_arrays=False):
+    """
+    Copy the dicts and lists in a stored value, other values are shared.
+
+    Graph objects are read without wrapping them, the copy is plain.
+
+    :param (*) value: A graph object, its plain storage or any other value.
+    :param (bool) copy_arrays: Copy numpy arrays and pandas objects too?
+    :return: (*)
+
+    """
+    if isinstance(value, dict):
+        return dict((key, _copy_containers(val, copy_arrays))
+                    for key, val in dict.items(value))
+    if isinstance(value, list):
+        return [_copy_containers(entry, copy_arrays)
+                for entry in list.__iter__(value)]
+    if copy_arrays and hasattr(value, 'ndim') and hasattr(value, 'copy'):
+        return value.copy()
+    return value
+
+
+def _copy_storage(object_name, value, parent_object_names):
+    """
+    Copy a stored graph object and the graph objects in it, see `__deepcopy__`.
+
+    Unlike `_get_plain_value`, the copy shares no dicts or lists that hold
+    graph objects with `value`. Data arrays and other values are shared.
+
+    :param (str) object_name: The object or array name of `value`.
+    :param (dict|list) value: The graph object or its plain storage.
+    :param (tuple[str]) parent_object_names: Names of the parent objects.
+    :return: (dict|list)
+
+    """
+    if object_name in graph_reference.ARRAYS:
+        parent_object_names += (object_name, )
+        copied = []
+        for entry in list.__iter__(value):
+            if isinstance(entry, PlotlyBase):
+                entry_object_name = entry._name
+            else:
+                entry_object_name = _get_entry_object_name(object_name, entry)
+            if entry_object_name is None:
+                copied.append(dict(entry))
+            else:
+                copied.append(_copy_storage(entry_object_name, entry,
+                                            parent_object_names))
+        return copied
+
+    table = graph_reference.get_attributes_table(object_name,
+                                                 parent_object_names)
+    child_parent_object_names = parent_object_names + (object_name, )
+    copied = {}
+    for key, val in dict.items(value):
+        child_object_name = _get_child_object_name(key, table)
+        if _is_graph_object_value(child_object_name, val):
+            val = _copy_storage(child_object_name, val,
+                                child_parent_object_names)
+        copied[key] = val
+    return copied
+
+
+def _get_child_object_name(key, table):
+    """Get the object name of the graph object at `key`, if any."""
+    attribute = table['attributes'].get(key)
+    if attribute is not None and attribute['is_object']:
+        return key
+    return _get_subplot_key(key, table['subplot_attributes'])
+
+
+def _is_graph_object_value(object_name, value):
+    """Is `value` stored (or wrapped) as the graph object `object_name`?"""
+    if object_name is None:
+        return False
+    if object_name in graph_reference.ARRAYS:
+        return isinstance(value, list)
+    return isinstance(value, dict)
+
+
+def _get_data(object_name, value, parent_object_names, flatten):
+    """
+    Get the data in a stored graph object, see `PlotlyDict.get_data`.
+
+    `value` is a graph object or its plain storage. It's read through
+    `dict.items` and `list.__iter__`, so nothing gets wrapped, and roles are
+    resolved with one attributes table per object.
+
+    :param (str) object_name: The object or array name of `value`.
+    :param (dict|list) value: The graph object or its plain storage.
+    :param (tuple[str]) parent_object_names: Names of the parent objects.
+    :param (bool) flatten: {'a': {'b': ''}} --> {'a.b': ''}
+    :returns: (dict|list) Depending on (flat|unflat)
+
+    """
+    if object_name in graph_reference.ARRAYS:
+        if isinstance(value, PlotlyList):
+            return value.get_data(flatten=flatten)
+        entries_data = _get_entries_data(object_name, value,
+                                         parent_object_names, flatten)
+        if not flatten:
+            return entries_data
+        d = {}
+        for i, e in enumerate(entries_data):
+            for k, v in e.items():
+                d["{0}.{1}".format(i, k)] = v
+        return d
+
+    table = graph_reference.get_attributes_table(object_name,
+                                                 parent_object_names)
+    is_trace = object_name in graph_reference.TRACE_NAMES
+    child_parent_object_names = parent_object_names + (object_name, )
+    d = {}
+    for key, val in dict.items(value):
+        child_object_name = _get_child_object_name(key, table)
+        if _is_graph_object_value(child_object_name, val):
+            if (isinstance(value, PlotlyDict) and isinstance(val, list) and
+                    not all(list.__iter__(val))):
+                val = value[key]  # PlotlyList.get_data drops empty entries
+            sub_data = _get_data(child_object_name, val,
+                                 child_parent_object_names, flatten)
+            if flatten:
+                for sub_key, sub_val in sub_data.items():
+                    key_string = "{0}.{1}".format(key, sub_key)
+                    d[key_string] = sub_val
+            else:
+                d[key] = sub_data
+        elif is_trace and key == 'type':
+            continue
+
+        # we use the name to help make data frames
+        elif is_trace and key == 'name':
+            d[key] = val
+        elif graph_reference.get_role_from_table(table, key, val) == 'data':
+            d[key] = val
+    for key in list(d.keys()):
+        if isinstance(d[key], (dict, list)):
+            if len(d[key]) == 0:
+                del d[key]
+    return d
+
+
+def _get_entries_data(array_name, value, parent_object_names, flatten):
+    """Get the data of every entry of a stored array, see `_get_data`."""
+    parent_object_names += (array_name, )
+    entries_data = []
+    for entry in list.__iter__(value):
+        if isinstance(entry, PlotlyBase):
+            object_name = entry._name
+        else:
+            object_name = _get_entry_object_name(array_name, entry)
+        entries_data.append(_get_data(object_name, entry, parent_object_names,
+                                      flatten))
+    return entries_data
+
+
+def _strip_style(object_name, value, parent_object_names):
+    """
+    Strip style from a stored graph object, see `PlotlyDict.strip_style`.
+
+    Graph objects are stripped in place. Plain storage may be shared with
+    copies so it isn't changed, a stripped copy is returned instead (or
+    `value` itself if there was nothing to strip).
+
+    :param (str) object_name: The object or array name of `value`.
+    :param (dict|list) value: The graph object or its plain storage.
+    :param (tuple[str]) parent_object_names: Names of the parent objects.
+    :return: (dict|list)
+
+    """
+    if isinstance(value, PlotlyBase):
+        value.strip_style()
+        return value
+
+    if object_name in graph_reference.ARRAYS:
+        parent_object_names += (object_name, )
+        stripped = [
+            _strip_style(_get_entry_object_name(object_name, entry), entry,
+                         parent_object_names)
+            for entry in value
+        ]
+        if all(new is old for new, old in zip(stripped, value)):
+            return value
+        return stripped
+
+    changed, removed = _get_stripped_items(object_name, value,
+                                           parent_object_names)
+    if not changed and not removed:
+        return value
+    stripped = dict(value)
+    stripped.update(changed)
+    for key in removed:
+        del stripped[key]
+    return stripped
+
+
+def _get_stripped_items(object_name, value, parent_object_names):
+    """
+    Get what stripping style from a stored dict changes, see `_strip_style`.
+
+    :return: (dict, list) The changed items and the keys to remove.
+
+    """
+    table = graph_reference.get_attributes_table(object_name,
+                                                 parent_object_names)
+    is_trace = object_name in graph_reference.TRACE_NAMES
+    child_parent_object_names = parent_object_names + (object_name, )
+    changed = {}
+    removed = []
+    for key, val in dict.items(value):
+        child_object_name = _get_child_object_name(key, table)
+        if _is_graph_object_value(child_object_name, val):
+            stripped = _strip_style(child_object_name, val,
+                                    child_parent_object_names)
+            if stripped is not val:
+                changed[key] = stripped
+        elif is_trace and key == 'type':
+            continue
+        elif graph_reference.get_role_from_table(table, key, val) == 'style':
+            removed.append(key)
+
+        # this is for backwards compat when we updated graph reference.
+        elif object_name == 'layout' and key == 'autosize':
+            removed.append(key)
+    return changed, removed
+
+
+def _get_group_slices(values):
+    """
+    Group equal values, see `Data.from_frame`.
+
+    Groups are in order of first appearance and missing values are dropped,
+    like `DataFrame.groupby(sort=False)`.
+
+    :param (Series|ndarray) values: The values to group by.
+    :return: (ndarray|None, list) The order that puts the rows of each group
+             together (None if they already are) and a (value, slice of the
+             ordered rows) pair per group.
+
+    """
+    import numpy as np
+    from pandas import factorize
+    codes, uniques = factorize(values)
+    if len(codes) and (np.diff(codes) >= 0).all() and codes[0] >= 0:
+        order = None
+        ordered_codes = codes
+    else:
+        order = np.argsort(codes, kind='mergesort')  # stable
+        ordered_codes = codes[order]
+    group_codes = np.arange(len(uniques))
+    starts = np.searchsorted(ordered_codes, group_codes, side='left')
+    stops = np.searchsorted(ordered_codes, group_codes, side='right')
+    return order, [(uniques[i], slice(starts[i], stops[i]))
+                   for i in group_codes]
+
+
+def _is_equal(value, other):
+    """Compare stored values, numpy arrays and pandas objects by element."""
+    if value is other:
+        return True
+    if hasattr(value, 'ndim') or hasattr(other, 'ndim'):
+        import numpy as np
+        return np.array_equal(np.asarray(value), np.asarray(other))
+    try:
+        return bool(value == other)
+    except (TypeError, ValueError):
+        return False  # e.g., lists holding numpy arrays
+
+
+def _get_extension(value, other):
+    """
+    Get the points appended to the array `value` to make `other`, if any.
+
+    :return: (list|ndarray|None) None unless `other` is `value` plus points.
+
+    """
+    for array in (value, other):
+        if isinstance(array, list):
+            if array and isinstance(array[0], (dict, list)):
+                return None
+        elif getattr(array, 'ndim', None) != 1:
+            return None
+    if len(other) <= len(value) or not _is_equal(value, other[:len(value)]):
+        return None
+    return other[len(value):]
+
+
+def _add_changes(value, other, prefix, changes, extensions=None):
+    """
+    Add the changes that turn the stored dict `value` into `other`.
+
+    Changes are keyed by attribute strings like 'marker.color' or
+    'annotations[0].text', as plotly.js' restyle and relayout take them.
+    Removed attributes are changed to None. Values that are the same object
+    are never looked into, so copies that share values compare quickly.
+
+    :param (dict) value: A graph object or its plain storage.
+    :param (dict) other: A graph object or its plain storage.
+    :param (str) prefix: Prepended to the keys of `changes`.
+    :param (dict) changes: Filled with attribute strings and new values.
+    :param (dict|None) extensions: If given, arrays that only had points
+                                   appended go here, with just the new
+                                   points, instead of in `changes`.
+
+    """
+    for key, val in dict.items(other):
+        attribute = prefix + key
+        if dict.__contains__(value, key):
+            _add_value_changes(dict.__getitem__(value, key), val, attribute,
+                               changes, extensions)
+        else:
+            changes[attribute] = _get_plain_value(val)
+    for key in dict.keys(value):
+        if not dict.__contains__(other, key):
+            changes[prefix + key] = None
+
+
+def _add_value_changes(value, other, attribute, changes, extensions):
+    """See `_add_changes`, for the values at `attribute`."""
+    if value is other:
+        return
+    if isinstance(value, dict) and isinstance(other, dict):
+        _add_changes(value, other, attribute + '.', changes, extensions)
+        return
+
+    if (isinstance(value, list) and isinstance(other, list) and
+            len(value) == len(other) and
+            all(isinstance(entry, dict)
+                for entries in (value, other)
+                for entry in list.__iter__(entries))):
+        entries = zip(list.__iter__(value), list.__iter__(other))
+        for index, (entry, other_entry) in enumerate(entries):
+            entry_attribute = '{0}[{1}]'.format(attribute, index)
+            _add_value_changes(entry, other_entry, entry_attribute, changes,
+                               extensions)
+        return
+
+    if extensions is not None:
+        extension = _get_extension(value, other)
+        if extension is not None:
+            extensions[attribute] = extension
+            return
+    if not _is_equal(value, other):
+        changes[attribute] = _get_plain_value(other)
+
+
+# Per-object state of PlotlyDict and PlotlyList. It's kept in slots, not in
+# a `__dict__`, since figures can hold a huge number of graph objects. `_path`
+# and `_parent_names` are caches, see `PlotlyBase._set_parent`. `__weakref__`
+# keeps graph objects weak referenceable, as they were with a `__dict__`.
+GRAPH_OBJECT_SLOTS = ('_name', '_parent', '_parent_key', '_path',
+                      '_parent_names', '__weakref__')
+
+
+def _unpickle_graph_object(cls, object_name, value):
+    """Recreate a pickled graph object, see `PlotlyBase.__reduce__`."""
+    kwargs = {'_validation_mode': 'none'}
+    if cls in (PlotlyDict, PlotlyList):
+        kwargs['_name'] = object_name
+    return cls(value, **kwargs)
+
 
 class PlotlyBase(object):
     """
     Base object for PlotlyList and PlotlyDict.
 
     """
-    _name = None
-    _parent = None
-    _parent_key = None
+    # `dict` and `list` can't share a layout, so the slots are declared in
+    # the subclasses. See GRAPH_OBJECT_SLOTS.
+    __slots__ = ()
+
+    def _init_slots(self, name, parent, parent_key):
+        """
+        Give every slot a value, reading an unset slot raises.
+
+        :param (str|None) name: Only used if the class doesn't set `_name`.
+        :param (PlotlyBase|None) parent: See `_set_parent`.
+        :param (str|int|None) parent_key: See `_set_parent`.
+
+        """
+        if getattr(self, '_name', None) is None:
+            object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_path', None)
+        object.__setattr__(self, '_parent_names', None)
+        self._set_parent(parent, parent_key)
+
+    def __reduce__(self):
+        """
+        Pickle as a new, top-level graph object. Parents aren't kept.
+
+        Default pickling sets items before any slots are set, which fails.
+
+        """
+        if isinstance(self, dict):
+            value = dict(self)
+        else:
+            value = list.__getitem__(self, slice(None))
+        return _unpickle_graph_object, (type(self), self._name, value)
+
+    def __copy__(self):
+        """
+        Copy without revalidating anything, see `_get_plain_value`.
+
+        Copies share nested values that haven't been accessed yet, these are
+        only copied when either side wraps them as graph objects (and so can
+        change them). Copying is therefore cheap even for large figures. Data
+        arrays and other values are shared like in any shallow copy.
+
+        """
+        return self._copy_with(_get_plain_value(self))
+
+    def __deepcopy__(self, memo):
+        """
+        Copy without revalidating, reusing any copy already made in `memo`.
+
+        Every nested graph object is copied too, so nothing that holds them
+        is shared, however it's reached. Data arrays and other values are
+        still shared, as they've always been.
+
+        """
+        copied = memo.get(id(self))
+        if copied is None:
+            value = _copy_storage(self._name, self, self._get_parent_names())
+            copied = memo[id(self)] = self._copy_with(value)
+        return copied
+
+    def _copy_with(self, value):
+        """Make a graph object like this one, holding the storage `value`."""
+        kwargs = {'_parent': self._parent, '_parent_key': self._parent_key,
+                  '_validation_mode': 'none'}
+        if type(self) in (PlotlyDict, PlotlyList):
+            kwargs['_name'] = self._name
+        copied = type(self)(**kwargs)
+        if isinstance(self, dict):
+            dict.update(copied, value)
+        else:
+            list.extend(copied, value)
+        if hasattr(self, '__dict__'):
+            copied.__dict__.update(self.__dict__)  # e.g., a Figure's grid
+        return copied
+
+    def _set_parent(self, parent, parent_key):
+        """
+        Attach this object to a (new) parent.
+
+        The paths and parent names cached on this object and on the graph
+        objects below it are cleared, they're recomputed when needed.
+
+        :param (PlotlyBase|None) parent: The new parent object.
+        :param (str|int|None) parent_key: The key or index in `parent`.
+
+        """
+        object.__setattr__(self, '_parent', parent)
+        object.__setattr__(self, '_parent_key', parent_key)
+        self._clear_cached_paths()
+
+    def _clear_cached_paths(self):
+        """Clear cached paths and parent names here and in objects below."""
+        if self._path is None and self._parent_names is None:
+            return  # nothing below can have been cached without this
+        object.__setattr__(self, '_path', None)
+        object.__setattr__(self, '_parent_names', None)
+        if isinstance(self, dict):
+            children = dict.values(self)
+        else:
+            children = list.__iter__(self)
+        for child in children:
+            if isinstance(child, PlotlyBase):
+                child._clear_cached_paths()
 
     def _get_path(self):
         """
         Get a tuple of the str keys and int indices for this object's path.
 
+        This is computed once and cached, parents cache theirs too.
+
         :return: (tuple)
 
         """
-        path = []
-        parents = self._get_parents()
-        parents.reverse()
-        children = [self] + parents[:-1]
-        for parent, child in zip(parents, children):
-            path.append(child._parent_key)
-        path.reverse()
-        return tuple(path)
+        path = self._path
+        if path is None:
+            if self._parent is None:
+                path = ()
+            else:
+                path = self._parent._get_path() + (self._parent_key, )
+            object.__setattr__(self, '_path', path)
+        return path
 
     def _get_parents(self):
         """
@@ -82,8 +774,29 @@ class PlotlyBase(object):
         :return: (list[str])
 
         """
-        parents = self._get_parents()
-        return [parent._name for parent in parents]
+        return list(self._get_parent_names())
+
+    def _get_parent_names(self):
+        """
+        Like `_get_parent_object_names`, but cached and returned as a tuple.
+
+        Equal tuples are shared between objects, so caching them costs little.
+        Don't mutate the result.
+
+        :return: (tuple[str])
+
+        """
+        parent_names = self._parent_names
+        if parent_names is None:
+            parent = self._parent
+            if parent is None:
+                parent_names = ()
+            else:
+                parent_names = parent._get_parent_names() + (parent._name, )
+                parent_names = _PARENT_NAMES.setdefault(parent_names,
+                                                        parent_names)
+            object.__setattr__(self, '_parent_names', parent_names)
+        return parent_names
 
     def _get_class_name(self):
         """For convenience. See `graph_reference.object_name_to_class_name`."""
@@ -106,6 +819,21 @@ class PlotlyBase(object):
             return help_string
         print(help_string)
 
+    def _copy_child_value(self, object_name, value, validation_mode=None):
+        """
+        Try to copy a value for a child of this object, see `_copy_value`.
+
+        :return: (dict|list|None) `None` if the value isn't valid.
+
+        """
+        validate = (validation_mode or get_validation_mode()) == 'full'
+        parent_object_names = self._get_parent_names() + (self._name, )
+        try:
+            return _copy_value(object_name, value, parent_object_names,
+                               validate)
+        except _InvalidValue:
+            return None
+
     def to_graph_objs(self, **kwargs):
         """Everything is cast into graph_objs. Here for backwards compat."""
         pass
@@ -120,14 +848,13 @@ class PlotlyList(list, PlotlyBase):
     Base class for list-like Plotly objects.
 
     """
-    _name = None
+    __slots__ = GRAPH_OBJECT_SLOTS
 
     def __init__(self, *args, **kwargs):
         _raise = kwargs.get('_raise', True)
-        if self._name is None:
-            self.__dict__['_name'] = kwargs.pop('_name', None)
-        self.__dict__['_parent'] = kwargs.get('_parent')
-        self.__dict__['_parent_key'] = kwargs.get('_parent_key')
+        mode = kwargs.get('_validation_mode') or get_validation_mode()
+        self._init_slots(kwargs.pop('_name', None), kwargs.get('_parent'),
+                         kwargs.get('_parent_key'))
 
         if self._name is None:
             raise exceptions.PlotlyError(
@@ -152,11 +879,14 @@ class PlotlyList(list, PlotlyBase):
 
         super(PlotlyList, self).__init__()
 
+        child_mode = _get_child_validation_mode(mode)
         for index, value in enumerate(list(*args)):
-            value = self._value_to_graph_object(index, value, _raise=_raise)
+            value = self._value_to_graph_object(index, value, _raise=_raise,
+                                                _validation_mode=child_mode)
 
-            if isinstance(value, PlotlyBase):
-                self.append(value)
+            # the value is already converted, don't convert it again
+            if value is not None:
+                super(PlotlyList, self).append(value)
 
     def __setitem__(self, index, value, _raise=True):
         """Override to enforce validation."""
@@ -169,10 +899,56 @@ class PlotlyList(list, PlotlyBase):
         if index >= len(self):
             raise IndexError(index)
 
-        value = self._value_to_graph_object(index, value, _raise=_raise)
-        if isinstance(value, (PlotlyDict, PlotlyList)):
+        child_mode = _get_child_validation_mode(get_validation_mode())
+        value = self._value_to_graph_object(index, value, _raise=_raise,
+                                            _validation_mode=child_mode)
+        if value is not None:
             super(PlotlyList, self).__setitem__(index, value)
 
+    def __getitem__(self, index):
+        """Wraps entries as graph objects the first time they're accessed."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        value = super(PlotlyList, self).__getitem__(index)
+        if isinstance(value, dict) and not isinstance(value, PlotlyBase):
+            if index < 0:
+                index += len(self)
+            object_name = self._get_entry_object_name(value)
+            if object_name is not None:
+                value = _wrap_value(object_name, value, self, index)
+                super(PlotlyList, self).__setitem__(index, value)
+        return value
+
+    def pop(self, index=-1):
+        """Like `list.pop`, but entries are wrapped like in `[]`."""
+        value = self[index]
+        del self[index]
+        return value
+
+    def __getslice__(self, i, j):
+        """Python 2 slices lists here instead of in `__getitem__`."""
+        return self.__getitem__(slice(i, j))
+
+    def __iter__(self):
+        """Go through `__getitem__` so entries are wrapped."""
+        index = 0
+        while index < len(self):
+            yield self[index]
+            index += 1
+
+    def __reversed__(self):
+        """Like `__iter__`, from the last entry to the first."""
+        index = len(self) - 1
+        while index >= 0:
+            if index < len(self):
+                yield self[index]
+            index -= 1
+
+    def copy(self):
+        """Like `list.copy`, but entries are wrapped like in `[]`."""
+        return self[:]
+
     def __setattr__(self, key, value):
         raise exceptions.PlotlyError('Setting attributes on a PlotlyList is '
                                      'not allowed')
@@ -182,18 +958,12 @@ class PlotlyList(list, PlotlyBase):
         self.extend(other)
         return self
 
-    def __copy__(self):
-
-        # TODO: https://github.com/plotly/python-api/issues/291
-        return GraphObjectFactory.create(self._name, _parent=self._parent,
-                                         _parent_key=self._parent_key, *self)
-
-    def __deepcopy__(self, memodict={}):
+    def _get_entry_object_name(self, value):
+        """See `_get_entry_object_name`."""
+        return _get_entry_object_name(self._name, value)
 
-        # TODO: https://github.com/plotly/python-api/issues/291
-        return self.__copy__()
-
-    def _value_to_graph_object(self, index, value, _raise=True):
+    def _value_to_graph_object(self, index, value, _raise=True,
+                               _validation_mode=None):
         """
         Attempt to change the given value into a graph object.
 
@@ -201,9 +971,13 @@ class PlotlyList(list, PlotlyBase):
         `None` is returned, meaning the caller should ignore the value or
         discard it as a failed conversion.
 
+        Valid values are returned as plain copies which are wrapped when
+        they're accessed, see `_copy_value`.
+
         :param (dict) value: A dict to be converted into a graph object.
         :param (bool) _raise: If False, ignore bad values instead of raising.
-        :return: (PlotlyBase|None) The graph object or possibly `None`.
+        :param (str) _validation_mode: How to validate the new graph object.
+        :return: (PlotlyBase|dict|None) The graph object or possibly `None`.
 
         """
         if not isinstance(value, dict):
@@ -213,12 +987,20 @@ class PlotlyList(list, PlotlyBase):
             else:
                 return
 
+        object_name = self._get_entry_object_name(value)
+        if object_name is not None:
+            copied_value = self._copy_child_value(object_name, value,
+                                                  _validation_mode)
+            if copied_value is not None:
+                return copied_value
+
         items = graph_reference.ARRAYS[self._name]['items']
         for i, item in enumerate(items, 1):
             try:
-                return GraphObjectFactory.create(item, _raise=_raise,
-                                                 _parent=self,
-                                                 _parent_key=index, **value)
+                return GraphObjectFactory.create(
+                    item, _raise=_raise, _parent=self, _parent_key=index,
+                    _validation_mode=_validation_mode, **value
+                )
             except exceptions.PlotlyGraphObjectError:
                 if i == len(items) and _raise:
                     raise
@@ -226,19 +1008,25 @@ class PlotlyList(list, PlotlyBase):
     def append(self, value):
         """Override to enforce validation."""
         index = len(self)  # used for error messages
-        value = self._value_to_graph_object(index, value)
+        child_mode = _get_child_validation_mode(get_validation_mode())
+        value = self._value_to_graph_object(index, value,
+                                            _validation_mode=child_mode)
         super(PlotlyList, self).append(value)
 
     def extend(self, iterable):
         """Override to enforce validation."""
+        child_mode = _get_child_validation_mode(get_validation_mode())
         for value in iterable:
             index = len(self)
-            value = self._value_to_graph_object(index, value)
+            value = self._value_to_graph_object(index, value,
+                                                _validation_mode=child_mode)
             super(PlotlyList, self).append(value)
 
     def insert(self, index, value):
         """Override to enforce validation."""
-        value = self._value_to_graph_object(index, value)
+        child_mode = _get_child_validation_mode(get_validation_mode())
+        value = self._value_to_graph_object(index, value,
+                                            _validation_mode=child_mode)
         super(PlotlyList, self).insert(index, value)
 
     def update(self, changes, make_copies=False):
@@ -269,9 +1057,16 @@ class PlotlyList(list, PlotlyBase):
                     self[index].update(update)
 
     def strip_style(self):
-        """Strip style by calling `stip_style` on children items."""
-        for plotly_dict in self:
-            plotly_dict.strip_style()
+        """Strip style from children items, see `_strip_style`."""
+        parent_object_names = self._get_parent_names() + (self._name, )
+        for index, entry in enumerate(list.__iter__(self)):
+            if isinstance(entry, PlotlyBase):
+                object_name = entry._name
+            else:
+                object_name = self._get_entry_object_name(entry)
+            stripped = _strip_style(object_name, entry, parent_object_names)
+            if stripped is not entry:
+                list.__setitem__(self, index, stripped)
 
     def get_data(self, flatten=False):
         """
@@ -281,11 +1076,10 @@ class PlotlyList(list, PlotlyBase):
         :returns: (dict|list) Depending on (flat|unflat)
 
         """
-        l = list()
-        for plotly_dict in self:
-            l += [plotly_dict.get_data(flatten=flatten)]
-        del_indicies = [index for index, item in enumerate(self)
-                        if len(item) == 0]
+        l = _get_entries_data(self._name, self, self._get_parent_names(),
+                              flatten)
+        del_indicies = [index for index, item in
+                        enumerate(list.__iter__(self)) if len(item) == 0]
         del_ct = 0
         for index in del_indicies:
             del self[index - del_ct]
@@ -345,19 +1139,15 @@ class PlotlyDict(dict, PlotlyBase):
     Base class for dict-like Plotly objects.
 
     """
-    _name = None
-    _parent_key = None
-    _valid_attributes = None
-    _deprecated_attributes = None
-    _subplot_attributes = None
+    __slots__ = GRAPH_OBJECT_SLOTS
 
     def __init__(self, *args, **kwargs):
 
         _raise = kwargs.pop('_raise', True)
-        if self._name is None:
-            self.__dict__['_name'] = kwargs.pop('_name', None)
-        self.__dict__['_parent'] = kwargs.pop('_parent', None)
-        self.__dict__['_parent_key'] = kwargs.pop('_parent_key', None)
+        mode = kwargs.pop('_validation_mode', None) or get_validation_mode()
+        self._init_slots(kwargs.pop('_name', None),
+                         kwargs.pop('_parent', None),
+                         kwargs.pop('_parent_key', None))
 
         if self._name is None:
             raise exceptions.PlotlyError(
@@ -367,12 +1157,12 @@ class PlotlyDict(dict, PlotlyBase):
         super(PlotlyDict, self).__init__()
 
         if self._name in graph_reference.TRACE_NAMES:
-            self['type'] = self._name
+            super(PlotlyDict, self).__setitem__('type', self._name)
 
         # force key-value pairs to go through validation
         d = {key: val for key, val in dict(*args, **kwargs).items()}
         for key, val in d.items():
-            self.__setitem__(key, val, _raise=_raise)
+            self.__setitem__(key, val, _raise=_raise, _validation_mode=mode)
 
     def __dir__(self):
         """Dynamically return the existing and possible attributes."""
@@ -382,34 +1172,58 @@ class PlotlyDict(dict, PlotlyBase):
         """Calls __missing__ when key is not found. May mutate object."""
         if key not in self:
             self.__missing__(key)
-        return super(PlotlyDict, self).__getitem__(key)
+        value = super(PlotlyDict, self).__getitem__(key)
+
+        # nested objects are kept as plain copies until they're accessed,
+        # lists are only objects for array keys, e.g., not for x=[1, 2, 3]
+        if isinstance(value, list):
+            is_plain = (key in graph_reference.ARRAYS and
+                        not isinstance(value, PlotlyBase))
+        else:
+            is_plain = (isinstance(value, dict) and
+                        not isinstance(value, PlotlyBase))
+        if is_plain:
+            object_name = self._get_child_object_name(key)
+            if object_name is not None:
+                value = _wrap_value(object_name, value, self, object_name)
+                super(PlotlyDict, self).__setitem__(key, value)
+        return value
 
     def __setattr__(self, key, value):
         """Maps __setattr__ onto __setitem__"""
         self.__setitem__(key, value)
 
-    def __setitem__(self, key, value, _raise=True):
+    def __setitem__(self, key, value, _raise=True, _validation_mode=None):
         """Validates/Converts values which should be Graph Objects."""
         if not isinstance(key, six.string_types):
             if _raise:
                 raise TypeError('Key must be string, not {}'.format(type(key)))
             return
 
+        mode = _validation_mode or get_validation_mode()
+        if mode == 'none':
+            return self._set_trusted_item(key, value)
+        child_mode = _get_child_validation_mode(mode)
+
+        table = self._get_attributes_table()
+        valid_attributes = table['valid_attributes']
+
         if key.endswith('src'):
-            if key in self._get_valid_attributes():
+            if key in valid_attributes:
                 value = graph_objs_tools.assign_id_to_src(key, value)
                 return super(PlotlyDict, self).__setitem__(key, value)
 
         subplot_key = self._get_subplot_key(key)
         if subplot_key is not None:
             value = self._value_to_graph_object(subplot_key, value,
-                                                _raise=_raise)
-            if isinstance(value, (PlotlyDict, PlotlyList)):
+                                                _raise=_raise,
+                                                _validation_mode=child_mode)
+            if value is not None:
                 return super(PlotlyDict, self).__setitem__(key, value)
 
-        if key not in self._get_valid_attributes():
+        if key not in valid_attributes:
 
-            if key in self._get_deprecated_attributes():
+            if key in table['deprecated_attributes']:
                 warnings.warn(
                     "Oops! '{attribute}' has been deprecated in "
                     "'{object_name}'\nThis may still work, but you should "
@@ -426,31 +1240,100 @@ class PlotlyDict(dict, PlotlyBase):
                     raise exceptions.PlotlyDictKeyError(self, path)
                 return
 
-        if self._get_attribute_role(key) == 'object':
-            value = self._value_to_graph_object(key, value, _raise=_raise)
-            if not isinstance(value, (PlotlyDict, PlotlyList)):
+        if table['attributes'][key]['is_object']:
+            value = self._value_to_graph_object(key, value, _raise=_raise,
+                                                _validation_mode=child_mode)
+            if value is None:
                 return
 
         super(PlotlyDict, self).__setitem__(key, value)
 
+    def _set_trusted_item(self, key, value):
+        """
+        Set an item without validating it, see `set_validation_mode`.
+
+        Nested dicts and lists are still wrapped as (trusted) graph objects
+        when the key names an object, everything else is set as-is.
+
+        """
+        if key.endswith('src'):
+            value = graph_objs_tools.assign_id_to_src(key, value)
+        elif isinstance(value, (dict, list)):
+            object_name = self._get_child_object_name(key)
+            if object_name is not None:
+                value = self._value_to_graph_object(
+                    object_name, value, _raise=False, _validation_mode='none'
+                ) or value
+        super(PlotlyDict, self).__setitem__(key, value)
+
+    def get(self, key, default=None):
+        """Like `dict.get`, but nested objects are wrapped like in `[]`."""
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *default):
+        """Like `dict.pop`, but nested objects are wrapped like in `[]`."""
+        if key in self:
+            self[key]
+        return super(PlotlyDict, self).pop(key, *default)
+
+    def popitem(self):
+        """Like `dict.popitem`, but nested objects are wrapped like in `[]`."""
+        key, value = super(PlotlyDict, self).popitem()
+        super(PlotlyDict, self).__setitem__(key, value)
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        """
+        Like `dict.setdefault`, but nested objects are wrapped like in `[]`.
+
+        A missing `key` is set through `__setitem__`, so it's validated.
+
+        """
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def _wrap_values(self):
+        """Wrap every nested object that's still plain storage."""
+        for key in list(super(PlotlyDict, self).keys()):
+            self[key]
+
+    def items(self):
+        """Like `dict.items`, but nested objects are wrapped like in `[]`."""
+        self._wrap_values()
+        return super(PlotlyDict, self).items()
+
+    def values(self):
+        """Like `dict.values`, but nested objects are wrapped like in `[]`."""
+        self._wrap_values()
+        return super(PlotlyDict, self).values()
+
+    if six.PY2:
+        def iteritems(self):
+            """See `items`."""
+            self._wrap_values()
+            return super(PlotlyDict, self).iteritems()
+
+        def itervalues(self):
+            """See `values`."""
+            self._wrap_values()
+            return super(PlotlyDict, self).itervalues()
+
+    def copy(self):
+        """Like `dict.copy`, but nested objects are wrapped like in `[]`."""
+        return dict(self.items())
+
     def __getattr__(self, key):
         """Python only calls this when key is missing!"""
+        if key.startswith('_'):
+            raise AttributeError(key)  # e.g., unset slots, never attributes
         try:
             return self.__getitem__(key)
         except KeyError:
             raise AttributeError(key)
 
-    def __copy__(self):
-
-        # TODO: https://github.com/plotly/python-api/issues/291
-        return GraphObjectFactory.create(self._name, _parent=self.parent,
-                                         _parent_key=self._parent_key, **self)
-
-    def __deepcopy__(self, memodict={}):
-
-        # TODO: https://github.com/plotly/python-api/issues/291
-        return self.__copy__()
-
     def __missing__(self, key):
         """Mimics defaultdict. This is called from __getitem__ when key DNE."""
         if key in self._get_valid_attributes():
@@ -468,62 +1351,70 @@ class PlotlyDict(dict, PlotlyBase):
     def _get_attribute_role(self, key, value=None):
         """See `graph_reference.get_role`."""
         object_name = self._name
-        parent_object_names = self._get_parent_object_names()
+        parent_object_names = self._get_parent_names()
         return graph_reference.get_role(
             object_name, key, value=value,
             parent_object_names=parent_object_names
         )
 
+    def _get_attributes_table(self):
+        """
+        See `graph_reference.get_attributes_table`.
+
+        Tables are shared by every object with the same name and parents, so
+        instances don't keep their own copies.
+
+        """
+        parent_object_names = self._get_parent_names()
+        return graph_reference.get_attributes_table(self._name,
+                                                    parent_object_names)
+
     def _get_valid_attributes(self):
         """See `graph_reference.get_valid_attributes`."""
-        if self._valid_attributes is None:
-            parent_object_names = self._get_parent_object_names()
-            valid_attributes = graph_reference.get_valid_attributes(
-                self._name, parent_object_names
-            )
-            self.__dict__['_valid_attributes'] = valid_attributes
-        return self._valid_attributes
+        return self._get_attributes_table()['valid_attributes']
 
     def _get_deprecated_attributes(self):
         """See `graph_reference.get_deprecated_attributes`."""
-        if self._deprecated_attributes is None:
-            parent_object_names = self._get_parent_object_names()
-            deprecated_attributes = graph_reference.get_deprecated_attributes(
-                self._name, parent_object_names
-            )
-            self.__dict__['_deprecated_attributes'] = deprecated_attributes
-        return self._deprecated_attributes
+        return self._get_attributes_table()['deprecated_attributes']
 
     def _get_subplot_attributes(self):
         """See `graph_reference.get_subplot_attributes`."""
-        if self._subplot_attributes is None:
-            parent_object_names = self._get_parent_object_names()
-            subplot_attributes = graph_reference.get_subplot_attributes(
-                self._name, parent_object_names
-            )
-            self.__dict__['_subplot_attributes'] = subplot_attributes
-        return self._subplot_attributes
+        return self._get_attributes_table()['subplot_attributes']
 
     def _get_subplot_key(self, key):
-        """Some keys can have appended integers, this handles that."""
-        match = re.search(r'(?P<digits>\d+$)', key)
-        if match:
-            root_key = key[:match.start()]
-            if (root_key in self._get_subplot_attributes() and
-                    not match.group('digits').startswith('0')):
-                return root_key
+        """See `_get_subplot_key`."""
+        return _get_subplot_key(key, self._get_subplot_attributes())
 
-    def _value_to_graph_object(self, key, value, _raise=True):
+    def _get_child_object_name(self, key):
+        """Get the object name of the graph object at `key`, if any."""
+
+        # quick check, object keys are object names or subplot keys like x2
+        if (key not in graph_reference.OBJECTS and
+                key not in graph_reference.ARRAYS and not key[-1:].isdigit()):
+            return None
+        return _get_child_object_name(key, self._get_attributes_table())
+
+    def _value_to_graph_object(self, key, value, _raise=True,
+                               _validation_mode=None):
         """
         Attempt to convert value to graph object.
 
         :param (str|unicode) key: Should be an object_name from GRAPH_REFERENCE
         :param (dict) value: This will fail if it's not a dict.
         :param (bool) _raise: Flag to prevent inappropriate erring.
+        :param (str) _validation_mode: How to validate the new graph object.
+
+        Valid values are returned as plain copies which are wrapped when
+        they're accessed, see `_copy_value`.
 
-        :return: (PlotlyList|PlotlyDict|None) `None` if `_raise` and failure.
+        :return: (PlotlyList|PlotlyDict|dict|list|None) `None` if `_raise` and
+                 failure.
 
         """
+        copied_value = self._copy_child_value(key, value, _validation_mode)
+        if copied_value is not None:
+            return copied_value
+
         if key in graph_reference.ARRAYS:
             val_types = (list, )
         else:
@@ -538,7 +1429,8 @@ class PlotlyDict(dict, PlotlyBase):
 
         # this can be `None` when `_raise == False`
         return GraphObjectFactory.create(key, value, _raise=_raise,
-                                         _parent=self, _parent_key=key)
+                                         _parent=self, _parent_key=key,
+                                         _validation_mode=_validation_mode)
 
     def help(self, attribute=None, return_help=False):
         """
@@ -624,43 +1516,22 @@ class PlotlyDict(dict, PlotlyBase):
         style, but with an array as a value may still be considered data.
 
         """
-        keys = list(self.keys())
-        for key in keys:
-            if isinstance(self[key], (PlotlyDict, PlotlyList)):
-                self[key].strip_style()
-            else:
-                if self._get_attribute_role(key, value=self[key]) == 'style':
-                    del self[key]
-
-                # this is for backwards compat when we updated graph reference.
-                elif self._name == 'layout' and key == 'autosize':
-                    del self[key]
+        changed, removed = _get_stripped_items(self._name, self,
+                                               self._get_parent_names())
+        for key, val in changed.items():
+            super(PlotlyDict, self).__setitem__(key, val)
+        for key in removed:
+            del self[key]
 
     def get_data(self, flatten=False):
-        """Returns the JSON for the plot with non-data elements stripped."""
-        d = dict()
-        for key, val in list(self.items()):
-            if isinstance(val, (PlotlyDict, PlotlyList)):
-                sub_data = val.get_data(flatten=flatten)
-                if flatten:
-                    for sub_key, sub_val in sub_data.items():
-                        key_string = "{0}.{1}".format(key, sub_key)
-                        d[key_string] = sub_val
-                else:
-                    d[key] = sub_data
-            else:
-                if self._get_attribute_role(key, value=val) == 'data':
-                    d[key] = val
+        """
+        Returns the JSON for the plot with non-data elements stripped.
 
-                # we use the name to help make data frames
-                if self._name in graph_reference.TRACE_NAMES and key == 'name':
-                    d[key] = val
-        keys = list(d.keys())
-        for key in keys:
-            if isinstance(d[key], (dict, list)):
-                if len(d[key]) == 0:
-                    del d[key]
-        return d
+        Data values are returned as they're stored, numpy arrays and pandas
+        objects aren't copied or converted to lists.
+
+        """
+        return _get_data(self._name, self, self._get_parent_names(), flatten)
 
     def get_ordered(self, **kwargs):
         """Return a predictable, OrderedDict version of self."""
@@ -797,6 +1668,24 @@ class GraphObjectFactory(object):
                 return PlotlyDict(*args, **kwargs)
 
 
+class _LazyDocstring(object):
+    """
+    A graph object class docstring that's only made once it's read.
+
+    `type.__doc__` calls `__get__` on a class's `__doc__`, so this works for
+    `help(Scatter)` and `Scatter().__doc__` alike. See `get_help`.
+
+    """
+    def __init__(self, object_name):
+        self.object_name = object_name
+        self.doc = None
+
+    def __get__(self, instance, owner):
+        if self.doc is None:
+            self.doc = graph_objs_tools.get_help(self.object_name)
+        return self.doc
+
+
 def _add_classes_to_globals(globals):
     """
     Create and add all the Graph Objects to this module for export.
@@ -813,7 +1702,7 @@ def _add_classes_to_globals(globals):
             globals[class_name] = base_type
             continue
 
-        doc = graph_objs_tools.get_help(object_name)
+        doc = _LazyDocstring(object_name)
         if object_name in graph_reference.ARRAYS:
             class_bases = (PlotlyList, )
         else:
@@ -822,6 +1711,10 @@ def _add_classes_to_globals(globals):
         class_dict = {'__doc__': doc, '__name__': class_name,
                       '_name': object_name}
 
+        # Figure keeps a `__dict__` for the subplot grid from make_subplots
+        if class_name != 'Figure':
+            class_dict['__slots__'] = ()
+
         cls = type(str(class_name), class_bases, class_dict)
 
         globals[class_name] = cls
@@ -853,14 +1746,115 @@ def _patch_figure_class(figure_class):
         """
         Create a pandas dataframe with trace names and keys as column names.
 
+        1-d numpy arrays and pandas objects are passed to pandas as they are,
+        which avoids copying them where pandas allows (pandas 1.3+). Rows of
+        n-d arrays become the cells of an object column.
+        Columns of different lengths are padded with NaN.
+
         :return: (DataFrame)
 
         """
         data = self.get_data(flatten=True)
         from pandas import DataFrame, Series
-        return DataFrame(dict([(k, Series(v)) for k, v in data.items()]))
+        columns = {}
+        for key, val in data.items():
+            if getattr(val, 'ndim', 1) > 1:
+                val = list(val)
+            columns[key] = val
+
+        # lists and 1-d arrays of one length don't need Series to align them
+        is_plain = all(isinstance(val, list) or
+                       (getattr(val, 'ndim', None) == 1 and
+                        not isinstance(val, Series))
+                       for val in columns.values())
+        if not is_plain or len(set(len(val) for val in columns.values())) > 1:
+            columns = dict((key, Series(val, copy=False))
+                           for key, val in columns.items())
+        return DataFrame(columns, copy=False)
     figure_class.to_dataframe = to_dataframe
 
+    def checkpoint(self):
+        """
+        Remember the figure as it is now, `diff` compares against this.
+
+        The checkpoint has its own copies of the figure's dicts, lists and
+        arrays, so changes made to them in place, like appending points to
+        a trace's `x`, show up in `diff`. Other values are shared.
+
+        """
+        checkpoint = self._copy_with(_copy_containers(self, copy_arrays=True))
+        checkpoint.__dict__.pop('_checkpoint', None)
+        self.__dict__['_checkpoint'] = checkpoint
+    figure_class.checkpoint = checkpoint
+
+    def diff(self, other=None):
+        """
+        Get the plotly.js calls that turn `other` into this figure.
+
+        Only what changed is sent, e.g., to a GraphWidget. Traces with only
+        new points appended (like a stream) are extended. Values are first
+        compared by identity, so if `other` is given, changes made in place
+        to a list or array it shares with this figure can't be seen. A
+        `checkpoint` doesn't share them.
+
+        Example:
+        fig.checkpoint()
+        fig['layout']['title'] = 'New title'
+        fig['data'][0]['x'].append(4)
+        fig.diff()
+        [('extendTraces', {'x': [[4]]}, [0]),
+         ('relayout', {'title': 'New title'})]
+
+        :param (dict|None) other: The figure before the changes. If None, the
+                                  last `checkpoint` is used.
+        :return: (list[tuple]) Calls with plotly.js' function names and
+                               arguments, e.g., ('restyle', update, indices).
+                               The order is 'deleteTraces', 'extendTraces'
+                               and 'restyle' (for each trace), 'addTraces',
+                               then 'relayout'.
+
+        """
+        if other is None:
+            try:
+                other = self.__dict__['_checkpoint']
+            except KeyError:
+                raise exceptions.PlotlyError(
+                    "Call Figure.checkpoint or pass the figure to diff with."
+                )
+        data = dict.get(self, 'data') or []
+        other_data = dict.get(other, 'data') or []
+        patches = []
+        if len(other_data) > len(data):
+            patches.append(('deleteTraces',
+                            list(range(len(data), len(other_data)))))
+
+        traces = zip(list.__iter__(other_data), list.__iter__(data))
+        for index, (other_trace, trace) in enumerate(traces):
+            changes = {}
+            extensions = {}
+            _add_changes(other_trace, trace, '', changes, extensions)
+            if extensions:
+                update = dict((key, [val]) for key, val in extensions.items())
+                patches.append(('extendTraces', update, [index]))
+            if changes:
+                update = dict((key, [val]) for key, val in changes.items())
+                patches.append(('restyle', update, [index]))
+
+        if len(data) > len(other_data):
+            patches.append(('addTraces', [
+                _get_plain_value(trace)
+                for trace in list.__getitem__(data, slice(len(other_data),
+                                                          None))
+            ]))
+
+        changes = {}
+        _add_changes(dict.get(other, 'layout') or {},
+                     dict.get(self, 'layout') or {}, '', changes)
+        if changes:
+            patches.append(('relayout', changes))
+        return patches
+    figure_class.diff = diff
+
     def print_grid(self):
         """
         Print a visual layout of the figure's axes arrangement.
@@ -939,7 +1933,8 @@ def _patch_figure_class(figure_class):
 
 def _patch_data_class(data_class):
 
-    def _value_to_graph_object(self, index, value, _raise=True):
+    def _value_to_graph_object(self, index, value, _raise=True,
+                               _validation_mode=None):
 
         if not isinstance(value, dict):
             if _raise:
@@ -949,6 +1944,13 @@ def _patch_data_class(data_class):
             else:
                 return
 
+        object_name = self._get_entry_object_name(value)
+        if object_name is not None:
+            copied_value = self._copy_child_value(object_name, value,
+                                                  _validation_mode)
+            if copied_value is not None:
+                return copied_value
+
         item = value.get('type', 'scatter')
         if item not in graph_reference.ARRAYS['data']['items']:
             if _raise:
@@ -956,7 +1958,9 @@ def _patch_data_class(data_class):
                 raise exceptions.PlotlyDataTypeError(self, path)
 
         return GraphObjectFactory.create(item, _raise=_raise, _parent=self,
-                                         _parent_key=index, **value)
+                                         _parent_key=index,
+                                         _validation_mode=_validation_mode,
+                                         **value)
     data_class._value_to_graph_object = _value_to_graph_object
 
     def get_data(self, flatten=False):
@@ -968,7 +1972,8 @@ def _patch_data_class(data_class):
 
         """
         if flatten:
-            data = [v.get_data(flatten=flatten) for v in self]
+            data = _get_entries_data(self._name, self,
+                                     self._get_parent_names(), flatten)
             d = {}
             taken_names = []
             for i, trace in enumerate(data):
@@ -994,6 +1999,62 @@ def _patch_data_class(data_class):
             return super(data_class, self).get_data(flatten=flatten)
     data_class.get_data = get_data
 
+    def from_frame(cls, df, x=None, y=None, group=None, trace_type='scatter',
+                   **attributes):
+        """
+        Build a trace for every group of rows in a pandas DataFrame.
+
+        `attributes` are validated once, as a template trace, and every trace
+        is a plain copy of it, with its own dicts and lists. Columns are
+        sliced, not copied, when the rows of each group are already
+        together, otherwise each column is put in group order once.
+
+        Example:
+        data = Data.from_frame(df, x='date', y='price', group='ticker',
+                               mode='lines')
+
+        :param (DataFrame) df: The frame with the data.
+        :param (str|None) x: The column for `x`, the index if None.
+        :param (str|None) y: The column for `y`, if any.
+        :param (str|None) group: The column to group rows by. Traces are
+                                 named after their group. If None, all rows
+                                 go in one trace.
+        :param (str) trace_type: The type of every trace.
+        :param attributes: Other trace attributes, shared by every trace.
+        :return: (Data)
+
+        """
+        columns = {'x': df.index.values if x is None else df[x].values}
+        if y is not None:
+            columns['y'] = df[y].values
+
+        data = cls()
+        template = dict(attributes, type=trace_type)
+        template.update((key, []) for key in columns)
+        template = _get_plain_value(data._value_to_graph_object(0, template))
+
+        if group is None:
+            groups = [(None, slice(None))]
+        else:
+            order, groups = _get_group_slices(df[group])
+            if order is not None:
+                for key, val in columns.items():
+                    columns[key] = val[order]
+
+        traces = []
+        for group_value, rows in groups:
+            trace = _copy_containers(template)
+            for key, val in columns.items():
+                trace[key] = val[rows]
+            if group is not None:
+                if not isinstance(group_value, six.string_types):
+                    group_value = str(group_value)
+                trace['name'] = group_value
+            traces.append(trace)
+        list.extend(data, traces)
+        return data
+    data_class.from_frame = classmethod(from_frame)
+
 
 _add_classes_to_globals(globals())
 _patch_figure_class(globals()['Figure'])
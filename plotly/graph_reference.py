@@ -8,16 +8,34 @@ import hashlib
 import json
 import os
 import re
+import sys
+import threading
+import warnings
 from pkg_resources import resource_string
 
-import requests
 import six
+from six.moves import cPickle as pickle
 
-from plotly import files, utils
+from plotly import exceptions, files, utils
 
 GRAPH_REFERENCE_PATH = '/v2/plot-schema'
 GRAPH_REFERENCE_DOWNLOAD_TIMEOUT = 5  # seconds
 
+# See `get_graph_reference_mode` for what these mean.
+GRAPH_REFERENCE_MODES = ('offline', 'online', 'background')
+GRAPH_REFERENCE_MODE_ENV_VAR = 'PLOTLY_GRAPH_REFERENCE_MODE'
+DEFAULT_GRAPH_REFERENCE_MODE = 'offline'
+
+# Bump the version whenever the structure of the index changes. The protocol
+# needs to stay readable by every version of Python we support.
+GRAPH_REFERENCE_INDEX_VERSION = 2
+GRAPH_REFERENCE_INDEX_PICKLE_PROTOCOL = 2
+DEFAULT_GRAPH_REFERENCE_INDEX_PATH = os.path.join('graph_reference',
+                                                  'default-schema.index')
+
+# How many (object_name, parent_object_names) contexts to cache lookups for.
+ATTRIBUTE_CACHE_SIZE = 2048
+
 
 # For backwards compat, we keep this list of previously known objects.
 # Moving forward, we only add new trace names.
@@ -63,27 +81,179 @@ _BACKWARDS_COMPAT_CLASS_NAMES = {
 }
 
 
-def get_graph_reference():
+def get_graph_reference_mode():
     """
-    Attempts to load local copy of graph reference or makes GET request if DNE.
+    Return how the graph reference should be resolved on import.
+
+    The mode is read from the `PLOTLY_GRAPH_REFERENCE_MODE` environment
+    variable and can be one of:
 
+        * 'offline': (default) Use the local cache in `~/.plotly` if there is
+          one, else the default schema bundled with this package. This never
+          touches the network.
+        * 'online': Ask Plotly if there's a newer graph reference first. The
+          request blocks for up to GRAPH_REFERENCE_DOWNLOAD_TIMEOUT seconds.
+        * 'background': Like 'offline', but refresh the local cache in a
+          daemon thread so that the *next* import picks up any changes.
+
+    :return: (str) One of GRAPH_REFERENCE_MODES.
+
+    """
+    mode = os.environ.get(GRAPH_REFERENCE_MODE_ENV_VAR,
+                          DEFAULT_GRAPH_REFERENCE_MODE).lower()
+    if mode not in GRAPH_REFERENCE_MODES:
+        warnings.warn(
+            "Unrecognized {env_var} '{mode}', using '{default}' instead. "
+            "Valid modes are: {modes}."
+            .format(env_var=GRAPH_REFERENCE_MODE_ENV_VAR, mode=mode,
+                    default=DEFAULT_GRAPH_REFERENCE_MODE,
+                    modes=', '.join(GRAPH_REFERENCE_MODES))
+        )
+        mode = DEFAULT_GRAPH_REFERENCE_MODE
+    return mode
+
+
+def get_graph_reference(mode=None):
+    """
+    Load the graph reference according to `mode`.
+
+    :param (str|None) mode: See `get_graph_reference_mode`. Defaults to the
+                            mode set in the environment.
     :return: (dict) The graph reference.
-    :raises: (PlotlyError) When graph reference DNE and GET request fails.
+    :raises: (PlotlyError) When `mode` isn't a valid mode.
+
+    """
+    mode = _validate_graph_reference_mode(mode)
+    graph_reference = _load_local_graph_reference()
+
+    if mode == 'online':
+        downloaded_graph_reference = _download_graph_reference(graph_reference)
+        if downloaded_graph_reference is not None:
+            graph_reference = downloaded_graph_reference
+    elif mode == 'background':
+        refresh_graph_reference(block=False)
+
+    if not graph_reference:
+        graph_reference = _load_default_graph_reference()
+
+    return utils.decode_unicode(graph_reference)
+
+
+def refresh_graph_reference(block=True):
+    """
+    Download the latest graph reference from Plotly into the local cache.
+
+    This does *not* change the graph reference used by the current process,
+    it only updates the cache that later imports load from.
+
+    :param (bool) block: If False, download in a daemon thread instead.
+    :return: (bool|threading.Thread) Whether the cache was updated, or the
+                                     started thread if `block` is False.
+
+    """
+    if not block:
+        thread = threading.Thread(target=refresh_graph_reference,
+                                  name='plotly-graph-reference-refresh')
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    local_graph_reference = _load_local_graph_reference()
+    return _download_graph_reference(local_graph_reference) is not None
+
+
+def _validate_graph_reference_mode(mode):
+    """Default to the environment's mode and raise if `mode` is invalid."""
+    if mode is None:
+        return get_graph_reference_mode()
+    if mode not in GRAPH_REFERENCE_MODES:
+        raise exceptions.PlotlyError(
+            "'{}' is not a valid graph reference mode. Valid modes are: {}."
+            .format(mode, ', '.join(GRAPH_REFERENCE_MODES))
+        )
+    return mode
+
+
+def _load_local_graph_reference():
+    """Load the cached graph reference from `~/.plotly`. {} if unavailable."""
+    if files.check_file_permissions():
+        return utils.load_json_dict(files.GRAPH_REFERENCE_FILE)
+    return {}
+
+
+def _load_default_graph_reference():
+    """Load the graph reference that ships with this package."""
+    path = os.path.join('graph_reference', 'default-schema.json')
+    s = resource_string('plotly', path).decode('utf-8')
+    return json.loads(s)
+
 
+def _save_local_graph_reference(graph_reference):
     """
+    Write a graph reference to the local cache, if we're allowed to.
+
+    The file is written next to the cache and then moved into place so that
+    concurrent readers never see a partially-written graph reference.
+
+    """
+    if not files.check_file_permissions():
+        return
+    tmp_filename = '{}.{}.tmp'.format(files.GRAPH_REFERENCE_FILE, os.getpid())
+    utils.save_json_dict(tmp_filename, graph_reference)
+    _replace_file(tmp_filename, files.GRAPH_REFERENCE_FILE)
+
+
+def _replace_file(src, dst):
+    """Move `src` to `dst` atomically, where the platform allows it."""
+    try:
+        getattr(os, 'replace', os.rename)(src, dst)
+    except OSError:
+        # e.g., `os.rename` won't overwrite existing files on Windows.
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _download_graph_reference(local_graph_reference):
+    """
+    Ask Plotly for a graph reference newer than `local_graph_reference`.
+
+    A newer graph reference is also saved to the local cache.
+
+    :param (dict) local_graph_reference: The graph reference we already have.
+    :return: (dict|None) The new graph reference or None if N/A.
+
+    """
+    downloaded = _request_graph_reference(local_graph_reference)
+    if downloaded is None:
+        return None
+    graph_reference = downloaded[0]
+    _save_local_graph_reference(graph_reference)
+    return graph_reference
+
+
+def _request_graph_reference(local_graph_reference):
+    """
+    Like `_download_graph_reference`, but don't save and include the sha1.
+
+    :param (dict) local_graph_reference: The graph reference we already have.
+    :return: (tuple|None) The new graph reference and the sha1 of the
+             response it came in, or None if N/A.
+
+    """
+    import requests  # it's slow to import and only needed online
+
     default_config = files.FILE_CONTENT[files.CONFIG_FILE]
     if files.check_file_permissions():
-        graph_reference = utils.load_json_dict(files.GRAPH_REFERENCE_FILE)
         config = utils.load_json_dict(files.CONFIG_FILE)
 
         # TODO: https://github.com/plotly/python-api/issues/293
         plotly_api_domain = config.get('plotly_api_domain',
                                        default_config['plotly_api_domain'])
     else:
-        graph_reference = {}
         plotly_api_domain = default_config['plotly_api_domain']
 
-    sha1 = hashlib.sha1(six.b(str(graph_reference))).hexdigest()
+    sha1 = hashlib.sha1(six.b(str(local_graph_reference))).hexdigest()
 
     graph_reference_url = '{}{}?sha1={}'.format(plotly_api_domain,
                                                 GRAPH_REFERENCE_PATH, sha1)
@@ -93,20 +263,17 @@ def get_graph_reference():
                                 timeout=GRAPH_REFERENCE_DOWNLOAD_TIMEOUT)
         response.raise_for_status()
     except requests.exceptions.RequestException:
-        if not graph_reference:
-            path = os.path.join('graph_reference', 'default-schema.json')
-            s = resource_string('plotly', path).decode('utf-8')
-            graph_reference = json.loads(s)
+        return None
+
+    if six.PY3:
+        content = str(response.content, encoding='utf-8')
     else:
-        if six.PY3:
-            content = str(response.content, encoding='utf-8')
-        else:
-            content = response.content
-        data = json.loads(content)
-        if data['modified']:
-            graph_reference = data['schema']
+        content = response.content
+    data = json.loads(content)
+    if not data['modified']:
+        return None
 
-    return utils.decode_unicode(graph_reference)
+    return data['schema'], hashlib.sha1(response.content).hexdigest()
 
 
 def string_to_class_name(string):
@@ -164,83 +331,49 @@ def get_attributes_dicts(object_name, parent_object_names=()):
     :return: (dict)
 
     """
-    object_dict = OBJECTS[object_name]
+    parent_object_names = _get_attribute_context(parent_object_names)
+    return dict(_get_attributes_dicts(object_name, parent_object_names))
 
-    # If we patched this object, we may have added hard-coded attrs.
-    additional_attributes = object_dict['additional_attributes']
 
-    # We should also one or more paths where attributes are defined.
-    attribute_paths = list(object_dict['attribute_paths'])  # shallow copy
+def get_attributes_table(object_name, parent_object_names=()):
+    """
+    Return a lookup table for the attributes of an object given its parents.
 
-    # If we have parent_names, some of these attribute paths may be invalid.
-    for parent_object_name in reversed(parent_object_names):
-        if parent_object_name in ARRAYS:
-            continue
-        parent_object_dict = OBJECTS[parent_object_name]
-        parent_attribute_paths = parent_object_dict['attribute_paths']
-        for path in list(attribute_paths):
-            if not _is_valid_sub_path(path, parent_attribute_paths):
-                attribute_paths.remove(path)
+    Tables are cached per context, so don't mutate them. The response has the
+    form:
+    {
+      'attributes': {
+        'some_key': {'role': 'style', 'array_ok': True, 'is_object': False,
+                     'is_subplot': False, 'deprecated': False},
+        ...
+      },
+      'valid_attributes': frozenset(),
+      'deprecated_attributes': frozenset(),
+      'subplot_attributes': frozenset()
+    }
 
-    # We return a dict mapping paths to attributes. We also add in additional
-    # attributes if defined.
-    attributes_dicts = {path: utils.get_by_path(GRAPH_REFERENCE, path)
-                  for path in attribute_paths}
-    attributes_dicts['additional_attributes'] = additional_attributes
+    :param (str|unicode) object_name: The object name whose attributes we want.
+    :param (list[str|unicode]) parent_object_names: Names of parent objects.
+    :return: (dict)
 
-    return attributes_dicts
+    """
+    parent_object_names = _get_attribute_context(parent_object_names)
+    return _get_attributes_table(object_name, parent_object_names)
 
 
 def get_valid_attributes(object_name, parent_object_names=()):
-    attributes = get_attributes_dicts(object_name, parent_object_names)
-    # These are for documentation and quick lookups. They're just strings.
-    valid_attributes = set()
-    for attributes_dict in attributes.values():
-
-        for key, val in attributes_dict.items():
-            if key not in GRAPH_REFERENCE['defs']['metaKeys']:
-                valid_attributes.add(key)
-
-        deprecated_attributes = attributes_dict.get('_deprecated', {})
-        for key, val in deprecated_attributes.items():
-            if key not in GRAPH_REFERENCE['defs']['metaKeys']:
-                valid_attributes.add(key)
-
-    return valid_attributes
+    table = get_attributes_table(object_name, parent_object_names)
+    return table['valid_attributes']
 
 
 def get_deprecated_attributes(object_name, parent_object_names=()):
-    attributes = get_attributes_dicts(object_name, parent_object_names)
-    # These are for documentation and quick lookups. They're just strings.
-    deprecated_attributes = set()
-    for attributes_dict in attributes.values():
-
-        deprecated_attributes_dict = attributes_dict.get('_deprecated', {})
-        for key, val in deprecated_attributes_dict.items():
-            if key not in GRAPH_REFERENCE['defs']['metaKeys']:
-                deprecated_attributes.add(key)
-
-    return deprecated_attributes
+    table = get_attributes_table(object_name, parent_object_names)
+    return table['deprecated_attributes']
 
 
 def get_subplot_attributes(object_name, parent_object_names=()):
-    attributes = get_attributes_dicts(object_name, parent_object_names)
-    # These are for documentation and quick lookups. They're just strings.
-    subplot_attributes = set()
-    for attributes_dict in attributes.values():
-
-        for key, val in attributes_dict.items():
-            if key not in GRAPH_REFERENCE['defs']['metaKeys']:
-                if isinstance(val, dict) and val.get('_isSubplotObj'):
-                    subplot_attributes.add(key)
-
-        deprecated_attributes = attributes_dict.get('_deprecated', {})
-        for key, val in deprecated_attributes.items():
-            if key not in GRAPH_REFERENCE['defs']['metaKeys']:
-                if isinstance(val, dict) and val.get('_isSubplotObj'):
-                    subplot_attributes.add(key)
-
-    return subplot_attributes
+    table = get_attributes_table(object_name, parent_object_names)
+    return table['subplot_attributes']
 
 
 def attribute_path_to_object_names(attribute_container_path):
@@ -311,6 +444,8 @@ def get_role(object_name, attribute, value=None, parent_object_names=()):
     'data' type values are always kept
     'style' values are kept if they're sequences (but not strings)
 
+    Arrays are recognized without iterating them, see `_is_array`.
+
     :param (str) object_name: The name of the object containing 'attribute'.
     :param (str) attribute: The attribute we want the `role` of.
     :param (*) value: If the value is an array, the return can be different.
@@ -320,36 +455,133 @@ def get_role(object_name, attribute, value=None, parent_object_names=()):
     """
     if object_name in TRACE_NAMES and attribute == 'type':
         return 'info'
-    attributes_dicts = get_attributes_dicts(object_name, parent_object_names)
-    matches = []
-    for attributes_dict in attributes_dicts.values():
+    table = get_attributes_table(object_name, parent_object_names)
+    return get_role_from_table(table, attribute, value=value)
+
+
+def get_role_from_table(table, attribute, value=None):
+    """
+    Like `get_role`, but for an attribute in a `get_attributes_table` table.
+
+    Use this to get the roles of many attributes of one object, the table is
+    only looked up once. Unlike `get_role`, a trace's 'type' isn't special.
+
+    :param (dict) table: The table for the object containing 'attribute'.
+    :param (str) attribute: The attribute we want the `role` of.
+    :param (*) value: If the value is an array, the return can be different.
+    :returns: (str|None) This will be 'data', 'style', or 'info', or None if
+              'attribute' isn't in the table (objects built without
+              validation can hold keys the graph reference doesn't know).
+
+    """
+    attribute_dict = table['attributes'].get(attribute)
+    if attribute_dict is None:
+        return None
+    if value is not None and attribute_dict['array_ok']:
+        if _is_array(value):
+            return 'data'
+    return attribute_dict['role']
+
+
+def _is_array(value):
+    """
+    Is `value` an array of values (and not a string, dict or scalar)?
+
+    numpy arrays and pandas objects are told apart by `ndim`, so 0-d arrays
+    are scalars and nothing is converted or iterated.
+
+    """
+    if isinstance(value, (six.string_types, dict)):
+        return False
+    ndim = getattr(value, 'ndim', None)
+    if ndim is not None:
+        return ndim > 0
+    return hasattr(value, '__iter__')
 
-        for key, val in attributes_dict.items():
-            if key == attribute:
-                matches.append(val)
 
+def _get_attribute_context(parent_object_names):
+    """
+    Normalize parent object names so equivalent contexts share cache entries.
+
+    Arrays never narrow down which attributes are valid, so they're dropped.
+
+    """
+    return tuple(name for name in parent_object_names if name not in ARRAYS)
+
+
+@utils.memoize(maxsize=ATTRIBUTE_CACHE_SIZE)
+def _get_attributes_dicts(object_name, parent_object_names):
+    """See `get_attributes_dicts`. Don't mutate the result, it's cached."""
+    object_dict = OBJECTS[object_name]
+
+    # If we patched this object, we may have added hard-coded attrs.
+    additional_attributes = object_dict['additional_attributes']
+
+    # We should also one or more paths where attributes are defined.
+    attribute_paths = list(object_dict['attribute_paths'])  # shallow copy
+
+    # If we have parent_names, some of these attribute paths may be invalid.
+    for parent_object_name in reversed(parent_object_names):
+        parent_object_dict = OBJECTS[parent_object_name]
+        parent_attribute_paths = parent_object_dict['attribute_paths']
+        for path in list(attribute_paths):
+            if not _is_valid_sub_path(path, parent_attribute_paths):
+                attribute_paths.remove(path)
+
+    # We return a dict mapping paths to attributes. We also add in additional
+    # attributes if defined.
+    attributes_dicts = {path: utils.get_by_path(GRAPH_REFERENCE, path)
+                        for path in attribute_paths}
+    attributes_dicts['additional_attributes'] = additional_attributes
+
+    return attributes_dicts
+
+
+@utils.memoize(maxsize=ATTRIBUTE_CACHE_SIZE)
+def _get_attributes_table(object_name, parent_object_names):
+    """See `get_attributes_table`."""
+    meta_keys = GRAPH_REFERENCE['defs']['metaKeys']
+    attributes_dicts = _get_attributes_dicts(object_name, parent_object_names)
+
+    # Gather every definition of every key, deprecated or not.
+    matches = {}
+    deprecated_attributes = set()
+    for attributes_dict in attributes_dicts.values():
+        for key, val in attributes_dict.items():
+            if key not in meta_keys:
+                matches.setdefault(key, []).append(val)
         for key, val in attributes_dict.get('_deprecated', {}).items():
-            if key == attribute:
-                matches.append(val)
-
-    roles = []
-    for match in matches:
-        role = match['role']
-        array_ok = match.get('arrayOk')
-        if value is not None and array_ok:
-            iterable = hasattr(value, '__iter__')
-            stringy = isinstance(value, six.string_types)
-            dicty = isinstance(value, dict)
-            if iterable and not stringy and not dicty:
-                role = 'data'
-        roles.append(role)
-
-    # TODO: this is ambiguous until the figure is in place...
-    if 'data' in roles:
-        role = 'data'
-    else:
-        role = roles[0]
-    return role
+            if key not in meta_keys:
+                matches.setdefault(key, []).append(val)
+                deprecated_attributes.add(key)
+
+    attributes = {}
+    for key, vals in matches.items():
+        vals = [val for val in vals if isinstance(val, dict)]
+        roles = [val.get('role') for val in vals]
+
+        # TODO: this is ambiguous until the figure is in place...
+        if 'data' in roles:
+            role = 'data'
+        else:
+            role = roles[0] if roles else None
+
+        attributes[key] = {
+            'role': role,
+            'array_ok': any(val.get('arrayOk') for val in vals),
+            'is_object': role == 'object',
+            'is_subplot': any(val.get('_isSubplotObj') for val in vals),
+            'deprecated': key in deprecated_attributes
+        }
+
+    subplot_attributes = [key for key, attribute_dict in attributes.items()
+                          if attribute_dict['is_subplot']]
+    return {
+        'attributes': attributes,
+        'valid_attributes': frozenset(attributes),
+        'deprecated_attributes': frozenset(deprecated_attributes),
+        'subplot_attributes': frozenset(subplot_attributes)
+    }
 
 
 def _is_valid_sub_path(path, parent_paths):
@@ -376,9 +608,174 @@ def _is_valid_sub_path(path, parent_paths):
     return False
 
 
-def _get_objects():
+def build_graph_reference_index(graph_reference, sha1=None):
+    """
+    Derive the lookup tables we need from a graph reference.
+
+    Building this means walking the whole graph reference, which is a large
+    part of what importing plotly costs. The result only depends on the graph
+    reference, so it is pickled and reused by later imports (see
+    `load_graph_reference_index`).
+
+    :param (dict) graph_reference: A *decoded* graph reference.
+    :param (str|None) sha1: sha1 of the file `graph_reference` was loaded from.
+    :return: (dict) The graph reference and the tables derived from it.
+
+    """
+    trace_names = sorted(graph_reference['traces'].keys())
+    objects, arrays, layout_attribute_paths = _get_objects_and_arrays(
+        graph_reference
+    )
+    _patch_objects(objects, trace_names, layout_attribute_paths)
+    _patch_arrays(arrays, trace_names)
+
+    # paths are found in dict order, which differs between dicts with the
+    # same items on python 2, sort them so the index is always the same
+    for object_dict in objects.values():
+        object_dict['meta_paths'].sort()
+        object_dict['attribute_paths'].sort()
+    for array_dict in arrays.values():
+        array_dict['meta_paths'].sort()
+    classes = _get_classes(objects, arrays, trace_names)
+    object_name_to_class_name = {
+        class_dict['object_name']: class_name
+        for class_name, class_dict in classes.items()
+        if class_dict['object_name'] is not None
+    }
+    return {
+        'key': _get_graph_reference_index_key(sha1),
+        'graph_reference': graph_reference,
+        'trace_names': trace_names,
+        'objects': objects,
+        'arrays': arrays,
+        'classes': classes,
+        'object_name_to_class_name': object_name_to_class_name
+    }
+
+
+def load_graph_reference_index(mode=None):
+    """
+    Load the graph reference index, building it if there's no usable copy.
+
+    The graph reference is resolved as in `get_graph_reference`. A pickled
+    index is looked for in `~/.plotly` and then next to the default schema
+    in this package. An index is only used if it was built from the exact
+    same graph reference file (by sha1), by the same index version, and for
+    the same major version of Python.
+
+    :param (str|None) mode: See `get_graph_reference_mode`.
+    :return: (dict) See `build_graph_reference_index`.
+    :raises: (PlotlyError) When `mode` isn't a valid mode.
+
+    """
+    mode = _validate_graph_reference_mode(mode)
+    if mode == 'online':
+
+        # the download is only saved if we're allowed to, so use it directly
+        downloaded = _request_graph_reference(_load_local_graph_reference())
+        if downloaded is not None:
+            graph_reference, sha1 = downloaded
+            _save_local_graph_reference(graph_reference)
+            return _get_graph_reference_index(
+                utils.decode_unicode(graph_reference), sha1
+            )
+    elif mode == 'background':
+        refresh_graph_reference(block=False)
+
+    for s in _get_graph_reference_sources():
+        sha1 = hashlib.sha1(s).hexdigest()
+        index = _load_graph_reference_index(sha1)
+        if index is not None:
+            return index
+
+        try:
+            graph_reference = json.loads(s.decode('utf-8'))
+        except ValueError:
+            continue
+        if not graph_reference or not isinstance(graph_reference, dict):
+            continue
+
+        graph_reference = utils.decode_unicode(graph_reference)
+        index = build_graph_reference_index(graph_reference, sha1=sha1)
+        _save_graph_reference_index(index)
+        return index
+
+    raise exceptions.PlotlyError('The default graph reference is invalid.')
+
+
+def _get_graph_reference_index(graph_reference, sha1):
+    """Load the index for `sha1` or build (and save) it from the schema."""
+    index = _load_graph_reference_index(sha1)
+    if index is None:
+        index = build_graph_reference_index(graph_reference, sha1=sha1)
+        _save_graph_reference_index(index)
+    return index
+
+
+def _get_graph_reference_index_key(sha1):
+    """Indices are only valid for one schema, index version, and Python."""
+    return GRAPH_REFERENCE_INDEX_VERSION, sys.version_info[0], sha1
+
+
+def _get_graph_reference_sources():
+    """Yield the raw graph reference files we can load from, in order."""
+    if (files.check_file_permissions() and
+            os.path.exists(files.GRAPH_REFERENCE_FILE)):
+        with open(files.GRAPH_REFERENCE_FILE, 'rb') as f:
+            yield f.read()
+    path = os.path.join('graph_reference', 'default-schema.json')
+    yield resource_string('plotly', path)
+
+
+def _load_graph_reference_index(sha1):
+    """Return a pickled index built from the schema with `sha1` or None."""
+    key = _get_graph_reference_index_key(sha1)
+    for s in _get_graph_reference_index_sources():
+        try:
+            index = pickle.loads(s)
+        except Exception:
+            continue  # e.g., truncated or written by an incompatible version
+        if isinstance(index, dict) and index.get('key') == key:
+            return index
+    return None
+
+
+def _get_graph_reference_index_sources():
+    """Yield pickled indices we can load from, in order."""
+    if (files.check_file_permissions() and
+            os.path.exists(files.GRAPH_REFERENCE_INDEX_FILE)):
+        with open(files.GRAPH_REFERENCE_INDEX_FILE, 'rb') as f:
+            yield f.read()
+    try:
+        yield resource_string('plotly', DEFAULT_GRAPH_REFERENCE_INDEX_PATH)
+    except (IOError, OSError):
+        pass  # the default index is a build artifact, it may not exist.
+
+
+def _save_graph_reference_index(index, filename=None):
+    """
+    Pickle an index to `filename`, defaulting to the local cache.
+
+    :param (dict) index: See `build_graph_reference_index`.
+    :param (str|None) filename: Where to save the index.
+
     """
-    Create a reorganization of graph reference which organizes by object name.
+    if filename is None:
+        if not files.check_file_permissions():
+            return
+        filename = files.GRAPH_REFERENCE_INDEX_FILE
+    tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    try:
+        with open(tmp_filename, 'wb') as f:
+            pickle.dump(index, f, GRAPH_REFERENCE_INDEX_PICKLE_PROTOCOL)
+        _replace_file(tmp_filename, filename)
+    except (IOError, OSError):
+        pass  # caching the index is best-effort, we can always rebuild it.
+
+
+def _get_objects_and_arrays(graph_reference):
+    """
+    Reorganize graph reference by object name in a single walk.
 
     Each object can have *many* different definitions in the graph reference.
     These possibilities get narrowed down when we have contextual information
@@ -386,7 +783,7 @@ def _get_objects():
     definition than Marker in Pie. However, we need Marker, Scatter, and Pie
     to exist on their own as well.
 
-    Each value has the form:
+    Each object has the form:
     {
         'meta_paths': [],
         'attribute_paths': [],
@@ -397,20 +794,45 @@ def _get_objects():
     * attribute_paths describes all the locations where attributes exist
     * additional_attributes can be used to hard-code (patch) the plot schema
 
-    :return: (dict)
+    Very few arrays, they're the complement of objects and have the form:
+    {
+        'meta_paths': [],
+        'items': []
+    }
+
+    :param (dict) graph_reference: The graph reference to reorganize.
+    :return: (tuple) objects, arrays, and the paths to layout attributes.
 
     """
+    meta_keys = set(graph_reference['defs']['metaKeys'])
     objects = {}
-    for node, path in utils.node_generator(GRAPH_REFERENCE):
+    arrays = {}
+    layout_attribute_paths = []
+    for node, path in utils.node_generator(graph_reference):
 
-        if any([key in path for key in GRAPH_REFERENCE['defs']['metaKeys']]):
+        if not meta_keys.isdisjoint(path):
             continue  # objects don't exist under nested meta keys
+
+        if path and path[-1] == 'layoutAttributes':
+            layout_attribute_paths.append(path)
+
         if node.get('role') != 'object':
             continue
+
+        object_name = path[-1]
         if 'items' in node:
+            if object_name not in arrays:
+                items = node['items']
+
+                # If items is a dict, it's anyOf them.
+                if isinstance(items, dict):
+                    item_names = list(items.keys())
+                else:
+                    item_names = [object_name[:-1]]
+                arrays[object_name] = {'meta_paths': [path],
+                                       'items': item_names}
             continue
 
-        object_name = path[-1]
         if object_name not in objects:
             objects[object_name] = {'meta_paths': [], 'attribute_paths': [],
                                     'additional_attributes': {}}
@@ -424,69 +846,35 @@ def _get_objects():
 
         objects[object_name]['meta_paths'].append(path)
 
-    return objects
+    return objects, arrays, layout_attribute_paths
 
 
-def _patch_objects():
+def _patch_objects(objects, trace_names, layout_attribute_paths):
     """Things like Layout, Figure, and Data need to be included."""
-    layout_attribute_paths = []
-    for node, path in utils.node_generator(GRAPH_REFERENCE):
-        if any([key in path for key in GRAPH_REFERENCE['defs']['metaKeys']]):
-            continue  # objects don't exist under nested meta keys
-
-        if path and path[-1] == 'layoutAttributes':
-            layout_attribute_paths.append(path)
-
-    for trace_name in TRACE_NAMES:
-        OBJECTS[trace_name] = {
+    for trace_name in trace_names:
+        objects[trace_name] = {
             'meta_paths': [('traces', trace_name)],
             'attribute_paths': [('traces', trace_name, 'attributes')],
             'additional_attributes': {}
         }
 
-    OBJECTS['layout'] = {'meta_paths': [('layout', )],
+    objects['layout'] = {'meta_paths': [('layout', )],
                          'attribute_paths': layout_attribute_paths,
                          'additional_attributes': {}}
 
     figure_attributes = {'layout': {'role': 'object'},
                          'data': {'role': 'object', '_isLinkedToArray': True}}
-    OBJECTS['figure'] = {'meta_paths': [],
+    objects['figure'] = {'meta_paths': [],
                          'attribute_paths': [],
                          'additional_attributes': figure_attributes}
 
 
-def _get_arrays():
-    """Very few arrays, but this dict is the complement of OBJECTS."""
-    arrays = {}
-    for node, path in utils.node_generator(GRAPH_REFERENCE):
-
-        if any([key in path for key in GRAPH_REFERENCE['defs']['metaKeys']]):
-            continue  # objects don't exist under nested meta keys
-        if node.get('role') != 'object':
-            continue
-        if 'items' not in node:
-            continue
-
-        object_name = path[-1]
-        if object_name not in arrays:
-            items = node['items']
-
-            # If items is a dict, it's anyOf them.
-            if isinstance(items, dict):
-                item_names = list(items.keys())
-            else:
-                item_names = [object_name[:-1]]
-            arrays[object_name] = {'meta_paths': [path], 'items': item_names}
-
-    return arrays
-
-
-def _patch_arrays():
+def _patch_arrays(arrays, trace_names):
     """Adds information on our eventual Data array."""
-    ARRAYS['data'] = {'meta_paths': [('traces', )], 'items': list(TRACE_NAMES)}
+    arrays['data'] = {'meta_paths': [('traces', )], 'items': list(trace_names)}
 
 
-def _get_classes():
+def _get_classes(objects, arrays, trace_names):
     """
     We eventually make classes out of the objects in GRAPH_REFERENCE.
 
@@ -500,14 +888,14 @@ def _get_classes():
     for class_name, class_dict in _BACKWARDS_COMPAT_CLASS_NAMES.items():
         object_name = class_dict['object_name']
         base_type = class_dict['base_type']
-        if object_name in OBJECTS or object_name in ARRAYS:
+        if object_name in objects or object_name in arrays:
             classes[class_name] = {'object_name': object_name,
                                    'base_type': base_type}
         else:
             classes[class_name] = {'object_name': None, 'base_type': base_type}
 
     # always keep the trace dicts up to date
-    for object_name in TRACE_NAMES:
+    for object_name in trace_names:
         class_name = string_to_class_name(object_name)
         classes[class_name] = {'object_name': object_name, 'base_type': dict}
 
@@ -515,18 +903,15 @@ def _get_classes():
 
 
 # The ordering here is important.
-GRAPH_REFERENCE = get_graph_reference()
+_GRAPH_REFERENCE_INDEX = load_graph_reference_index()
 
-# See http://blog.labix.org/2008/06/27/watch-out-for-listdictkeys-in-python-3
-TRACE_NAMES = list(GRAPH_REFERENCE['traces'].keys())
+GRAPH_REFERENCE = _GRAPH_REFERENCE_INDEX['graph_reference']
 
-OBJECTS = _get_objects()
-_patch_objects()
-ARRAYS = _get_arrays()
-_patch_arrays()
+# See http://blog.labix.org/2008/06/27/watch-out-for-listdictkeys-in-python-3
+TRACE_NAMES = _GRAPH_REFERENCE_INDEX['trace_names']
 
-CLASSES = _get_classes()
+OBJECTS = _GRAPH_REFERENCE_INDEX['objects']
+ARRAYS = _GRAPH_REFERENCE_INDEX['arrays']
+CLASSES = _GRAPH_REFERENCE_INDEX['classes']
 
-OBJECT_NAME_TO_CLASS_NAME = {class_dict['object_name']: class_name
-                             for class_name, class_dict in CLASSES.items()
-                             if class_dict['object_name'] is not None}
+OBJECT_NAME_TO_CLASS_NAME = _GRAPH_REFERENCE_INDEX['object_name_to_class_name']
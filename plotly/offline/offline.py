@@ -13,7 +13,7 @@ from pkg_resources import resource_string
 import webbrowser
 
 import plotly
-from plotly import tools, utils
+from plotly import graph_reference, tools, utils
 from plotly.exceptions import PlotlyError
 
 
@@ -32,6 +32,41 @@ except ImportError:
 
 __PLOTLY_OFFLINE_INITIALIZED = False
 
+# plotly.js doesn't understand base64 typed arrays (see
+# `utils.encode_typed_array`), so they're decoded in the browser before
+# the figure is plotted.
+_DECODE_TYPED_ARRAYS_SCRIPT = (
+    'window.PLOTLYENV.decodeTypedArrays = function(obj) {'
+    'var types = {i1: Int8Array, u1: Uint8Array, i2: Int16Array, '
+    'u2: Uint16Array, i4: Int32Array, u4: Uint32Array, '
+    'f4: Float32Array, f8: Float64Array};'
+    'function decode(spec) {'
+    'var raw = window.atob(spec.bdata);'
+    'var bytes = new Uint8Array(raw.length);'
+    'for (var i = 0; i < raw.length; i++) { bytes[i] = raw.charCodeAt(i); }'
+    'var values = Array.prototype.slice.call('
+    'new types[spec.dtype](bytes.buffer));'
+    'if (spec.shape === undefined) { return values; }'
+    'var shape = String(spec.shape).split(",").map(Number);'
+    'function nest(start, dim) {'
+    'if (dim === shape.length - 1) {'
+    'return values.slice(start, start + shape[dim]); }'
+    'var stride = 1, rows = [];'
+    'for (var d = dim + 1; d < shape.length; d++) { stride *= shape[d]; }'
+    'for (var r = 0; r < shape[dim]; r++) {'
+    'rows.push(nest(start + r * stride, dim + 1)); }'
+    'return rows; }'
+    'return nest(0, 0); }'
+    'function walk(value) {'
+    'if (value === null || typeof value !== "object") { return value; }'
+    'if (typeof value.bdata === "string" && types[value.dtype]) {'
+    'return decode(value); }'
+    'for (var key in value) {'
+    'if (value.hasOwnProperty(key)) { value[key] = walk(value[key]); } }'
+    'return value; }'
+    'return walk(obj); };'
+)
+
 
 def download_plotlyjs(download_url):
     warnings.warn('''
@@ -73,8 +108,33 @@ def init_notebook_mode():
 
 
 def _plot_html(figure_or_data, show_link, link_text,
-               validate, default_width, default_height, global_requirejs):
+               validate, default_width, default_height, global_requirejs,
+               typed_arrays=False):
+
+    plot_html_chunks, plotdivid, width, height = _iter_plot_html(
+        figure_or_data, show_link, link_text, validate, default_width,
+        default_height, global_requirejs, typed_arrays=typed_arrays
+    )
+    plotly_html_div = ''.join(plot_html_chunks)
+
+    return plotly_html_div, plotdivid, width, height
+
+
+def _iter_plot_html(figure_or_data, show_link, link_text,
+                    validate, default_width, default_height, global_requirejs,
+                    typed_arrays=False):
+    """
+    Like `_plot_html`, but yield the html in chunks instead of returning it.
+
+    The figure is JSON-encoded as the chunks are consumed, so writing them
+    out one at a time never holds the whole encoded figure in memory.
+
+    If `typed_arrays` is True, numeric numpy arrays are embedded as base64
+    typed arrays and decoded in the browser before plotting.
 
+    :return: (tuple) An iterator of html chunks, plotdivid, width and height.
+
+    """
     figure = tools.return_figure_from_figure_or_data(figure_or_data, validate)
 
     width = figure.get('layout', {}).get('width', default_width)
@@ -95,8 +155,6 @@ def _plot_html(figure_or_data, show_link, link_text,
         width = str(width) + 'px'
 
     plotdivid = uuid.uuid4()
-    jdata = json.dumps(figure.get('data', []), cls=utils.PlotlyJSONEncoder)
-    jlayout = json.dumps(figure.get('layout', {}), cls=utils.PlotlyJSONEncoder)
 
     config = {}
     config['showLink'] = show_link
@@ -115,37 +173,45 @@ def _plot_html(figure_or_data, show_link, link_text,
             .replace('http://', '')
         link_text = link_text.replace('plot.ly', link_domain)
 
-    script = 'Plotly.newPlot("{id}", {data}, {layout}, {config})'.format(
-        id=plotdivid,
-        data=jdata,
-        layout=jlayout,
-        config=jconfig)
-
-    optional_line1 = ('require(["plotly"], function(Plotly) {{ '
+    optional_line1 = ('require(["plotly"], function(Plotly) { '
                       if global_requirejs else '')
-    optional_line2 = '}});' if global_requirejs else ''
-
-    plotly_html_div = (
-        ''
-        '<div id="{id}" style="height: {height}; width: {width};" '
-        'class="plotly-graph-div">'
-        '</div>'
-        '<script type="text/javascript">' +
-        optional_line1 +
-        'window.PLOTLYENV=window.PLOTLYENV || {{}};'
-        'window.PLOTLYENV.BASE_URL="' + plotly_platform_url + '";'
-        '{script}' +
-        optional_line2 +
-        '</script>'
-        '').format(
-        id=plotdivid, script=script,
-        height=height, width=width)
+    optional_line2 = '});' if global_requirejs else ''
 
-    return plotly_html_div, plotdivid, width, height
+    if typed_arrays:
+        decode_start, decode_end = 'window.PLOTLYENV.decodeTypedArrays(', ')'
+    else:
+        decode_start, decode_end = '', ''
+
+    def iter_plot_html():
+        encoder = utils.PlotlyJSONEncoder(typed_arrays=typed_arrays)
+        yield (
+            '<div id="{id}" style="height: {height}; width: {width};" '
+            'class="plotly-graph-div">'
+            '</div>'
+            '<script type="text/javascript">'
+        ).format(id=plotdivid, height=height, width=width)
+        yield optional_line1
+        yield ('window.PLOTLYENV=window.PLOTLYENV || {};'
+               'window.PLOTLYENV.BASE_URL="' + plotly_platform_url + '";')
+        if typed_arrays:
+            yield _DECODE_TYPED_ARRAYS_SCRIPT
+        yield 'Plotly.newPlot("{id}", '.format(id=plotdivid)
+        yield decode_start
+        for chunk in encoder.iterencode(figure.get('data', [])):
+            yield chunk
+        yield decode_end + ', ' + decode_start
+        for chunk in encoder.iterencode(figure.get('layout', {})):
+            yield chunk
+        yield decode_end
+        yield ', {config})'.format(config=jconfig)
+        yield optional_line2
+        yield '</script>'
+
+    return iter_plot_html(), plotdivid, width, height
 
 
 def iplot(figure_or_data, show_link=True, link_text='Export to plot.ly',
-          validate=True):
+          validate=True, typed_arrays=False):
     """
     Draw plotly graphs inside an IPython notebook without
     connecting to an external server.
@@ -168,6 +234,10 @@ def iplot(figure_or_data, show_link=True, link_text='Export to plot.ly',
                                has become outdated with your version of
                                graph_reference.json or if you need to include
                                extra, unnecessary keys in your figure.
+    typed_arrays (default=False) -- embed numeric numpy arrays as compact,
+                                    base64 typed arrays which are decoded
+                                    in the browser. Much smaller and faster
+                                    for large arrays.
 
     Example:
     ```
@@ -193,7 +263,7 @@ def iplot(figure_or_data, show_link=True, link_text='Export to plot.ly',
 
     plot_html, plotdivid, width, height = _plot_html(
         figure_or_data, show_link, link_text, validate,
-        '100%', 525, global_requirejs=True)
+        '100%', 525, global_requirejs=True, typed_arrays=typed_arrays)
 
     display(HTML(plot_html))
 
@@ -203,7 +273,7 @@ def plot(figure_or_data,
          validate=True, output_type='file',
          include_plotlyjs=True,
          filename='temp-plot.html',
-         auto_open=True):
+         auto_open=True, typed_arrays=False):
     """ Create a plotly graph locally as an HTML document or string.
 
     Example:
@@ -249,6 +319,9 @@ def plot(figure_or_data,
     auto_open (default=True) -- If True, open the saved file in a
         web browser after saving.
         This argument only applies if `output_type` is 'file'.
+    typed_arrays (default=False) -- If True, embed numeric numpy arrays as
+        compact, base64 typed arrays which are decoded in the browser.
+        Much smaller and faster to write for large arrays.
     """
     if output_type not in ['div', 'file']:
         raise ValueError(
@@ -260,9 +333,9 @@ def plot(figure_or_data,
             "Adding .html to the end of your file.")
         filename += '.html'
 
-    plot_html, plotdivid, width, height = _plot_html(
+    plot_html_chunks, plotdivid, width, height = _iter_plot_html(
         figure_or_data, show_link, link_text, validate,
-        '100%', '100%', global_requirejs=False)
+        '100%', '100%', global_requirejs=False, typed_arrays=typed_arrays)
 
     resize_script = ''
     if width == '100%' or height == '100%':
@@ -276,25 +349,30 @@ def plot(figure_or_data,
         ).format(id=plotdivid)
 
     if output_type == 'file':
-        with open(filename, 'w') as f:
-            if include_plotlyjs:
-                plotly_js_script = ''.join([
-                    '<script type="text/javascript">',
-                    get_plotlyjs(),
-                    '</script>',
-                ])
-            else:
-                plotly_js_script = ''
-
-            f.write(''.join([
-                '<html>',
-                '<head><meta charset="utf-8" /></head>',
-                '<body>',
-                plotly_js_script,
-                plot_html,
-                resize_script,
-                '</body>',
-                '</html>']))
+
+        # write as we encode so we never hold the whole figure's html. It's
+        # written next to `filename` and moved into place once it's done, so
+        # an error while encoding doesn't leave a broken file behind.
+        tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+        try:
+            with open(tmp_filename, 'w') as f:
+                f.write('<html>'
+                        '<head><meta charset="utf-8" /></head>'
+                        '<body>')
+                if include_plotlyjs:
+                    f.write('<script type="text/javascript">')
+                    f.write(get_plotlyjs())
+                    f.write('</script>')
+                for chunk in plot_html_chunks:
+                    f.write(chunk)
+                f.write(resize_script)
+                f.write('</body>'
+                        '</html>')
+            graph_reference._replace_file(tmp_filename, filename)
+        except Exception:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
 
         url = 'file://' + os.path.abspath(filename)
         if auto_open:
@@ -303,6 +381,7 @@ def plot(figure_or_data,
         return url
 
     elif output_type == 'div':
+        plot_html = ''.join(plot_html_chunks)
         if include_plotlyjs:
             return ''.join([
                 '<div>',
@@ -13,6 +13,7 @@ from . plotly import (
     get_credentials,
     iplot,
     plot,
+    plot_many,
     iplot_mpl,
     plot_mpl,
     get_figure,
@@ -21,5 +22,6 @@ from . plotly import (
     grid_ops,
     meta_ops,
     file_ops,
-    get_config
+    get_config,
+    set_request_options
 )
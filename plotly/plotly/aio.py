@@ -0,0 +1,612 @@
+"""
+aio
+===
+
+Asyncio versions of the functions in `plotly.plotly` that talk to plotly's
+REST apis, so many figures can be sent from one event loop without a thread
+for each. Requires Python 3.5+.
+
+    from plotly.plotly import aio
+
+    async def publish(figures):
+        return await asyncio.gather(*[
+            aio.plot(figure, filename=filename, auto_open=False)
+            for filename, figure in figures.items()
+        ])
+
+Requests are sent with the transport from `get_transport`. By default, that's
+a `StreamTransport`, which keeps connections alive with asyncio streams. Use
+`set_transport` to send requests with another http client.
+
+"""
+import asyncio
+import json
+import ssl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from six.moves.urllib.parse import urlsplit
+
+from plotly import exceptions, utils, version
+from plotly.plotly import plotly as py
+
+# requests < 2.4 only has `Timeout`, which both of these subclass
+_ConnectTimeout = getattr(requests.exceptions, 'ConnectTimeout',
+                          requests.exceptions.Timeout)
+_ReadTimeout = getattr(requests.exceptions, 'ReadTimeout',
+                       requests.exceptions.Timeout)
+
+__all__ = ['plot', 'get_figure', 'image', 'grid_ops', 'meta_ops', 'file_ops',
+           'Response', 'Transport', 'StreamTransport', 'get_transport',
+           'set_transport', 'close']
+
+
+class Response(object):
+    """
+    An http response, with the parts of `requests.Response` plotly uses.
+
+    :param (str) url: The url that was requested.
+    :param (int) status_code: e.g., 200
+    :param (str) reason: e.g., 'OK'
+    :param (dict) headers: The response headers.
+    :param (bytes) content: The response body.
+
+    """
+    def __init__(self, url, status_code, reason, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        """Raise a `requests.exceptions.HTTPError` for 4xx and 5xx statuses."""
+        if 400 <= self.status_code < 600:
+            raise requests.exceptions.HTTPError(
+                '{} Error: {} for url: {}'.format(self.status_code,
+                                                  self.reason, self.url),
+                response=self
+            )
+
+
+class Transport(object):
+    """
+    Sends http requests for the functions in this module.
+
+    Subclass this to send requests with another http client, e.g., aiohttp,
+    and pass an instance to `set_transport`.
+
+    """
+    async def request(self, method, url, headers=None, body=None,
+                      verify=True):
+        """
+        Send a request and read the whole response.
+
+        :param (str) method: e.g., 'GET' or 'POST'
+        :param (str) url: An http or https url.
+        :param (dict) headers: Headers to send.
+        :param (bytes) body: The request body, if there is one.
+        :param (bool) verify: Verify the server's ssl certificate.
+        :return: (Response)
+
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Close any connections that are kept open."""
+
+
+class StreamTransport(Transport):
+    """
+    HTTP/1.1 over asyncio streams, keeping connections alive between
+    requests.
+
+    Proxies aren't supported. Read and connect errors are raised as
+    `requests.exceptions.ConnectionError`, timeouts as
+    `requests.exceptions.ConnectTimeout` and `ReadTimeout`.
+
+    :param (int) limit: The most connections to have open at once. Requests
+                        wait for a connection when they're all in use.
+    :param (tuple) timeout: (connect, read) timeouts in seconds. If None,
+                            `plotly.plotly.plotly.REQUEST_TIMEOUT` is used,
+                            as it is when each request is sent.
+
+    """
+    def __init__(self, limit=100, timeout=None):
+        self.limit = limit
+        self.timeout = timeout
+        self._loop = None
+        self._semaphore = None
+        self._connections = {}  # {(scheme, host, port, verify): [streams]}
+
+    def _check_loop(self):
+        """Drop the connections and limit made for another event loop."""
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._close_connections()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+    def _get_timeout(self):
+        """Get the (connect, read) timeouts, see `__init__`."""
+        if self.timeout is None:
+            return py.REQUEST_TIMEOUT
+        return self.timeout
+
+    def _close_connections(self):
+        for connections in self._connections.values():
+            for reader, writer in connections:
+                writer.close()
+        self._connections = {}
+
+    async def close(self):
+        self._close_connections()
+
+    async def request(self, method, url, headers=None, body=None,
+                      verify=True):
+        self._check_loop()
+        split_url = urlsplit(url)
+        if split_url.scheme not in ('http', 'https'):
+            raise exceptions.PlotlyError(
+                "Can't request '{}', only http and https urls are supported."
+                .format(url)
+            )
+        port = split_url.port or (443 if split_url.scheme == 'https' else 80)
+        key = (split_url.scheme, split_url.hostname, port, verify)
+        request = _get_request_bytes(method, split_url, headers, body)
+
+        async with self._semaphore:
+            idle_connections = self._connections.setdefault(key, [])
+            while idle_connections:
+                # servers close idle connections whenever they like, so try
+                # kept-alive connections until one works
+                reader, writer = idle_connections.pop()
+                try:
+                    response = await self._send(method, url, reader, writer,
+                                                request, reused=True)
+                except _StaleConnection:
+                    writer.close()
+                else:
+                    return self._release(key, reader, writer, response)
+            reader, writer = await self._connect(key)
+            response = await self._send(method, url, reader, writer, request)
+            return self._release(key, reader, writer, response)
+
+    async def _connect(self, key):
+        scheme, host, port, verify = key
+        context = None
+        if scheme == 'https':
+            context = ssl.create_default_context()
+            if not verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+        try:
+            return await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=context),
+                self._get_timeout()[0]
+            )
+        except asyncio.TimeoutError:
+            raise _ConnectTimeout(
+                'Timed out connecting to {}:{}'.format(host, port)
+            )
+        except (OSError, ssl.SSLError) as err:
+            raise requests.exceptions.ConnectionError(err)
+
+    async def _send(self, method, url, reader, writer, request,
+                    reused=False):
+        try:
+            writer.write(request)
+            await writer.drain()
+            return await asyncio.wait_for(
+                _read_response(method, url, reader, reused),
+                self._get_timeout()[1]
+            )
+        except asyncio.TimeoutError:
+            writer.close()
+            raise _ReadTimeout(
+                'Timed out reading a response from {}'.format(url)
+            )
+        except _StaleConnection:
+            raise
+        except (OSError, asyncio.IncompleteReadError, ValueError) as err:
+            writer.close()
+            if reused and isinstance(err, ConnectionError):
+                raise _StaleConnection()
+            raise requests.exceptions.ConnectionError(err)
+        except BaseException:
+            # e.g., the task was cancelled mid-request, don't leak the socket
+            writer.close()
+            raise
+
+    def _release(self, key, reader, writer, response):
+        response, keep_alive = response
+        idle_connections = self._connections.setdefault(key, [])
+        if keep_alive and len(idle_connections) < self.limit:
+            idle_connections.append((reader, writer))
+        else:
+            writer.close()
+        return response
+
+
+class _StaleConnection(Exception):
+    """A kept-alive connection was closed before the request was answered."""
+
+
+def _get_request_bytes(method, split_url, headers, body):
+    """Get an HTTP/1.1 request, headers and all, as bytes."""
+    path = split_url.path or '/'
+    if split_url.query:
+        path += '?' + split_url.query
+    headers = CaseInsensitiveDict(headers or {})
+    headers.setdefault('host', split_url.netloc)
+    headers.setdefault('user-agent', 'python-plotly/' + version.__version__)
+    headers.setdefault('accept', '*/*')
+    headers.setdefault('accept-encoding', 'identity')
+    headers.setdefault('connection', 'keep-alive')
+    if body is not None or method.upper() in ('POST', 'PUT', 'PATCH'):
+        headers['content-length'] = str(len(body or b''))
+    lines = ['{} {} HTTP/1.1'.format(method.upper(), path)]
+    lines.extend('{}: {}'.format(name, value)
+                 for name, value in headers.items())
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return request + (body or b'')
+
+
+async def _read_response(method, url, reader, reused=False):
+    """
+    Read an HTTP/1.x response from a stream.
+
+    :return: (tuple) The Response and whether the connection can be reused.
+
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        if reused:
+            raise _StaleConnection()
+        raise requests.exceptions.ConnectionError(
+            'The connection to {} was closed without a response.'.format(url)
+        )
+    http_version, status, reason = (
+        status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + ['']
+    )[:3]
+    status_code = int(status)
+
+    headers = CaseInsensitiveDict()
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip(), value.strip()
+        if name in headers:
+            value = headers[name] + ', ' + value
+        headers[name] = value
+
+    connection = headers.get('connection', '').lower()
+    if http_version == 'HTTP/1.0':
+        keep_alive = connection == 'keep-alive'
+    else:
+        keep_alive = connection != 'close'
+
+    if (method.upper() == 'HEAD' or status_code in (204, 304) or
+            100 <= status_code < 200):
+        content = b''
+    elif 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';')[0].strip(), 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # the chunk's trailing CRLF
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass  # ignore trailers
+        content = b''.join(chunks)
+    elif 'content-length' in headers:
+        content = await reader.readexactly(int(headers['content-length']))
+    else:
+        content = await reader.read()  # the server closes to end the body
+        keep_alive = False
+
+    return Response(url, status_code, reason, headers, content), keep_alive
+
+
+_transport = None
+
+
+def get_transport():
+    """Return the transport requests are sent with, see `set_transport`."""
+    global _transport
+    if _transport is None:
+        _transport = StreamTransport()
+    return _transport
+
+
+def set_transport(transport):
+    """
+    Send requests with `transport` from now on.
+
+    The old transport isn't closed, see `close`.
+
+    :param (Transport) transport: e.g., a Transport subclass that uses
+                                  aiohttp.
+
+    """
+    global _transport
+    _transport = transport
+
+
+async def close():
+    """Close the connections the current transport keeps open."""
+    if _transport is not None:
+        await _transport.close()
+
+
+async def _request(method, url, headers=None, body=None):
+    """Send a request with the current transport, see `Transport.request`."""
+    return await get_transport().request(
+        method, url, headers=headers, body=body,
+        verify=py.get_config()['plotly_ssl_verification']
+    )
+
+
+async def _request_form(method, url, fields, headers=None):
+    """Send (name, value) form fields, see `py._iter_form_encoded`."""
+    headers = dict(headers or {}, **{'content-type': py.FORM_CONTENT_TYPE})
+    body = _get_body(py._iter_form_encoded(fields))
+    return await _request(method, url, headers=headers, body=body)
+
+
+def _get_body(chunks):
+    """Join str or bytes chunks into a request body."""
+    return b''.join(chunk.encode('utf-8') if isinstance(chunk, str)
+                    else chunk for chunk in chunks)
+
+
+async def plot(figure_or_data, validate=True, **plot_options):
+    """
+    Create a unique url for this plot in Plotly and optionally open url.
+
+    Returns the url, see `plotly.plotly.plot` for the arguments.
+
+    """
+    figure, plot_options = py._prepare_plot(figure_or_data, validate,
+                                            plot_options)
+    res = await _send_to_plotly(figure, **plot_options)
+    if res['error'] == '':
+        if plot_options['auto_open']:
+            py._open_url(res['url'])
+
+        return res['url']
+    else:
+        raise exceptions.PlotlyAccountError(res['error'])
+
+
+async def _send_to_plotly(figure, **plot_options):
+    """See `plotly.plotly.plotly._send_to_plotly`."""
+    url = py.get_config()['plotly_domain'] + "/clientresp"
+    payload = py._get_plot_payload(figure, plot_options)
+    r = py._get_plot_response(await _request_form('POST', url, payload))
+
+    # Check if the url needs a secret key
+    if (plot_options['sharing'] == 'secret' and
+            'share_key=' not in r['url']):
+
+        # add_share_key_to_url updates the url to include the share_key
+        r['url'] = await _add_share_key_to_url(r['url'])
+
+    py._show_plot_messages(r)
+
+    return r
+
+
+async def _add_share_key_to_url(plot_url, attempt=0):
+    """See `plotly.plotly.plotly.add_share_key_to_url`."""
+    url = py._get_file_api_url(plot_url)
+    new_response = await _request_form(
+        'PATCH', url, sorted(py.SHARE_KEY_PAYLOAD.items()),
+        headers=py._api_v2.headers()
+    )
+
+    plot_url, embed_url = py._get_share_key_urls(plot_url, new_response)
+
+    # sometimes a share key is added, but access is still denied
+    access_res = await _request('GET', embed_url)
+    if access_res.status_code == 404:
+        attempt += 1
+        if attempt == 5:
+            return plot_url
+        plot_url = await _add_share_key_to_url(plot_url.split('?')[0],
+                                               attempt)
+
+    return plot_url
+
+
+async def get_figure(file_owner_or_url, file_id=None, raw=False):
+    """
+    Returns a JSON figure representation for the specified file.
+
+    See `plotly.plotly.get_figure` for the arguments.
+
+    """
+    url, headers = py._get_figure_request(file_owner_or_url, file_id)
+    response = await _request('GET', url, headers=headers)
+    return py._get_figure_from_response(response, raw)
+
+
+class image:
+    """
+    Helper functions wrapped around plotly's static image generation api.
+
+    """
+    @staticmethod
+    async def get(figure_or_data, format='png', width=None, height=None,
+                  scale=None):
+        """
+        Return a static image of the plot described by `figure_or_data`.
+
+        See `plotly.plotly.image.get` for the arguments.
+
+        """
+        url, headers, payload = py.image._get_request(
+            figure_or_data, format, width, height, scale
+        )
+        body = _get_body(utils.PlotlyJSONEncoder().iterencode(payload))
+        res = await _request('POST', url, headers=headers, body=body)
+        return py.image._get_from_response(res)
+
+
+class file_ops:
+    """
+    Interface to Plotly's File System API
+
+    """
+    @classmethod
+    async def mkdirs(cls, folder_path):
+        """
+        Create folder(s) specified by folder_path in your Plotly account.
+
+        See `plotly.plotly.file_ops.mkdirs`.
+
+        """
+        if folder_path[-1] == '/':
+            folder_path = folder_path[0:-1]
+
+        res = await _request_form('POST', py._api_v2.api_url('folders'),
+                                  [('path', folder_path)],
+                                  headers=py._api_v2.headers())
+
+        py._api_v2.response_handler(res)
+
+        return res.status_code
+
+
+class grid_ops:
+    """
+    Interface to Plotly's Grid API, see `plotly.plotly.grid_ops`.
+
+    """
+    @classmethod
+    async def upload(cls, grid, filename,
+                     world_readable=True, auto_open=True, meta=None):
+        """
+        Upload a grid to your Plotly account with the specified filename.
+
+        Returns the grid's url, see `plotly.plotly.grid_ops.upload` for the
+        arguments.
+
+        """
+        parent_path, payload = py.grid_ops._get_upload_payload(
+            grid, filename, world_readable, meta
+        )
+        if parent_path != '':
+            await file_ops.mkdirs(parent_path)
+
+        req = await _request_form('POST', py._api_v2.api_url('grids'),
+                                  payload, headers=py._api_v2.headers())
+
+        res = py._api_v2.response_handler(req)
+        grid_url = py.grid_ops._update_uploaded_grid(grid, res)
+
+        if meta is not None:
+            await meta_ops.upload(meta, grid=grid)
+
+        if auto_open:
+            py._open_url(grid_url)
+
+        return grid_url
+
+    @classmethod
+    async def append_columns(cls, columns, grid=None, grid_url=None):
+        """
+        Append columns to a Plotly grid.
+
+        See `plotly.plotly.grid_ops.append_columns`.
+
+        """
+        grid_id, payload = py.grid_ops._get_append_columns_payload(
+            columns, grid, grid_url
+        )
+
+        api_url = (py._api_v2.api_url('grids') +
+                   '/{grid_id}/col'.format(grid_id=grid_id))
+        res = await _request_form('POST', api_url, payload,
+                                  headers=py._api_v2.headers())
+        res = py._api_v2.response_handler(res)
+
+        py.grid_ops._fill_in_response_column_ids(columns, res['cols'],
+                                                 grid_id)
+
+        if grid:
+            grid.extend(columns)
+
+    @classmethod
+    async def append_rows(cls, rows, grid=None, grid_url=None):
+        """
+        Append rows to a Plotly grid.
+
+        See `plotly.plotly.grid_ops.append_rows`.
+
+        """
+        grid_id, payload = py.grid_ops._get_append_rows_payload(
+            rows, grid, grid_url
+        )
+
+        api_url = (py._api_v2.api_url('grids') +
+                   '/{grid_id}/row'.format(grid_id=grid_id))
+        res = await _request_form('POST', api_url, payload,
+                                  headers=py._api_v2.headers())
+        py._api_v2.response_handler(res)
+
+        if grid:
+            py.grid_ops._append_rows_to_grid(rows, grid)
+
+    @classmethod
+    async def delete(cls, grid=None, grid_url=None):
+        """
+        Delete a grid from your Plotly account.
+
+        See `plotly.plotly.grid_ops.delete`.
+
+        """
+        grid_id = py._api_v2.parse_grid_id_args(grid, grid_url)
+        api_url = py._api_v2.api_url('grids') + '/' + grid_id
+        res = await _request('DELETE', api_url,
+                             headers=py._api_v2.headers())
+        py._api_v2.response_handler(res)
+
+
+class meta_ops:
+    """
+    Interface to Plotly's Metadata API, see `plotly.plotly.meta_ops`.
+
+    """
+    @classmethod
+    async def upload(cls, meta, grid=None, grid_url=None):
+        """
+        Upload Metadata to a Plotly grid.
+
+        See `plotly.plotly.meta_ops.upload`.
+
+        """
+        grid_id = py._api_v2.parse_grid_id_args(grid, grid_url)
+
+        payload = [
+            ('metadata', json.dumps(meta, cls=utils.PlotlyJSONEncoder))
+        ]
+
+        api_url = (py._api_v2.api_url('grids') +
+                   '/{grid_id}'.format(grid_id=grid_id))
+
+        res = await _request_form('PATCH', api_url, payload,
+                                  headers=py._api_v2.headers())
+
+        return py._api_v2.response_handler(res)
@@ -1,10 +1,28 @@
+import errno
+import select
 import time
 import six
 import os
 from six.moves import http_client
 from six.moves.urllib.parse import urlparse
 
+try:
+    from selectors import DefaultSelector, EVENT_READ
+except ImportError:
+    # Python 2, fall back to select.select
+    DefaultSelector = None
+
+# errors raised when connecting to a server that isn't accepting connections
+CONNECTION_REFUSED_ERRNOS = (errno.ECONNREFUSED, 10061)
+
+# errors raised when reading from a socket the server has closed
+CONNECTION_RESET_ERRNOS = (errno.ECONNRESET, 10054)
+
+
 class Stream:
+    # bytes to read from the socket at a time
+    bufsize = 2 ** 16
+
     def __init__(self, server, port=80, headers={}, url='/'):
         ''' Initialize a stream object and an HTTP Connection
         with chunked Transfer-Encoding to server:port with optional headers.
@@ -17,6 +35,8 @@ class Stream:
         self._port = port
         self._headers = headers
         self._url = url
+        self._selector = None
+        self._conn = None
         self._connect()
 
     def write(self, data, reconnect_on=('', 200, )):
@@ -58,14 +78,12 @@ class Stream:
                 raise Exception("Attempted to write but socket "
                                 "was not connected.")
 
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+        msglen = format(len(data), 'x').encode('ascii')  # length in hex
         try:
-            msg = data
-            msglen = format(len(msg), 'x')  # msg length in hex
             # Send the message in chunk-encoded form
-            self._conn.sock.setblocking(1)
-            self._conn.send('{msglen}\r\n{msg}\r\n'
-                            .format(msglen=msglen, msg=msg).encode('utf-8'))
-            self._conn.sock.setblocking(0)
+            self._conn.send(msglen + b'\r\n' + data + b'\r\n')
         except http_client.socket.error:
             self._reconnect()
             self.write(data)
@@ -101,6 +119,8 @@ class Stream:
         headers = self._headers
         proxy_server, proxy_port = self._get_proxy_config()
 
+        if self._conn is not None:
+            self._conn.close()
         if (proxy_server and proxy_port):
             self._conn = http_client.HTTPConnection(proxy_server, proxy_port)
             self._conn.set_tunnel(server, port)
@@ -113,12 +133,29 @@ class Stream:
             self._conn.putheader(header, headers[header])
         self._conn.endheaders()
 
-        # Set blocking to False prevents recv
-        # from blocking while waiting for a response.
-        self._conn.sock.setblocking(False)
-        self._bytes = six.b('')
+        # The socket stays blocking. Before each write, a selector tells us
+        # whether the server has sent anything (i.e., responded or closed
+        # the connection) without reading from the socket.
+        self._close_selector()
+        if DefaultSelector is not None:
+            self._selector = DefaultSelector()
+            self._selector.register(self._conn.sock, EVENT_READ)
+        self._bytes = b''
         self._reset_retries()
-        time.sleep(0.5)
+
+    def _close_selector(self):
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+
+    def _has_data(self):
+        ''' Return True if the server has sent data, or closed the
+        connection, so a read from the socket won't block.
+        '''
+        if self._selector is not None:
+            return bool(self._selector.select(0))
+        readable, _, _ = select.select([self._conn.sock], [], [], 0)
+        return bool(readable)
 
     def close(self):
         ''' Close the connection to server.
@@ -130,6 +167,7 @@ class Stream:
         '''
         self._reset_retries()
         self._closed = True
+        self._close_selector()
 
         # Chunked-encoded posts are terminated with '0\r\n\r\n'
         # For some reason, either Python or node.js seems to
@@ -149,27 +187,24 @@ class Stream:
         2 - The server has already closed the connection: Return the response
             if possible.
         '''
-        # Wait for a response
-        self._conn.sock.setblocking(True)
-        # Parse the response
-        response = self._bytes
+        # Wait for the server to finish responding and close the connection
+        chunks = [self._bytes]
+        self._bytes = b''
         while True:
             try:
-                _bytes = self._conn.sock.recv(1)
+                _bytes = self._conn.sock.recv(self.bufsize)
             except http_client.socket.error:
                 # For error 54: Connection reset by peer
                 # (and perhaps others)
-                return six.b('')
-            if _bytes == six.b(''):
+                return ''
+            if not _bytes:
                 break
-            else:
-                response += _bytes
-        # Set recv to be non-blocking again
-        self._conn.sock.setblocking(False)
+            chunks.append(_bytes)
+        response = b''.join(chunks)
 
         # Convert the response string to a http_client.HTTPResponse
         # object with a bit of a hack
-        if response != six.b(''):
+        if response:
             # Taken from
             # http://pythonwise.blogspot.ca/2010/02/parse-http-response.html
             try:
@@ -177,7 +212,9 @@ class Stream:
                 response.begin()
             except:
                 # Bad headers ... etc.
-                response = six.b('')
+                response = ''
+        else:
+            response = ''
         return response
 
     def _isconnected(self):
@@ -201,44 +238,29 @@ class Stream:
         if self._conn.sock is None:
             return False
 
+        # 3 - Check if the server has returned any data.
+        # If they have, then start to store the response
+        # in _bytes.
         try:
-            # 3 - Check if the server has returned any data.
-            # If they have, then start to store the response
-            # in _bytes.
-            self._bytes = six.b('')
-            self._bytes = self._conn.sock.recv(1)
-            return False
-        except http_client.socket.error as e:
-            # Check why recv failed
-            # Windows machines are the error codes
-            # that start with 1
-            # (http://msdn.microsoft.com/en-ca/library/windows/desktop/ms740668(v=vs.85).aspx)
-            if e.errno == 35 or e.errno == 10035:
-                # This is the "Resource temporarily unavailable" error
-                # which is thrown cuz there was nothing to receive, i.e.
-                # the server hasn't returned a response yet.
-                # This is a non-fatal error and the operation
-                # should be tried again.
-                # So, assume that the connection is still open.
+            if not self._has_data():
                 return True
-            elif e.errno == 54 or e.errno == 10054:
+            self._bytes = self._conn.sock.recv(self.bufsize)
+        except ValueError:
+            # The socket was closed, so it has no file descriptor
+            return False
+        except (http_client.socket.error, select.error) as e:
+            if e.args and e.args[0] in CONNECTION_RESET_ERRNOS:
                 # This is the "Connection reset by peer" error
                 # which is thrown cuz the server reset the
                 # socket, so the connection is closed.
                 return False
-            elif e.errno == 11:
-                # This is the "Resource temporarily unavailable" error
-                # which happens because the "operation would have blocked
-                # but nonblocking operation was requested".
-                # We require non-blocking reading of this socket because
-                # we don't want to wait around for a response, we just
-                # want to see if a response is currently available. So
-                # let's just assume that we're still connected and
-                # hopefully recieve some data on the next try.
-                return True
+            elif e.args and e.args[0] == errno.EBADF:
+                # The socket was closed
+                return False
             else:
                 # Unknown scenario
                 raise e
+        return False
 
     def _reconnect(self):
         ''' Connect if disconnected.
@@ -249,8 +271,7 @@ class Stream:
                 self._connect()
             except http_client.socket.error as e:
                 # Attempt to reconnect if the connection was refused
-                if e.errno == 61 or e.errno == 10061:
-                    # errno 61 is the "Connection Refused" error
+                if e.errno in CONNECTION_REFUSED_ERRNOS:
                     time.sleep(self._delay)
                     self._delay += self._delay  # fibonacii delays
                     self._tries += 1
@@ -273,7 +294,7 @@ class Stream:
         self._delay = 1
 
 
-class _FakeSocket(six.StringIO):
+class _FakeSocket(six.BytesIO):
     # Used to construct a http_client.HTTPResponse object
     # from a string.
     # Thx to: http://pythonwise.blogspot.ca/2010/02/parse-http-response.html
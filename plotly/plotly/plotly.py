@@ -20,7 +20,11 @@ import base64
 import copy
 import json
 import os
+import tempfile
+import threading
+import types
 import warnings
+from multiprocessing.pool import ThreadPool
 
 import requests
 import six
@@ -28,6 +32,11 @@ import six.moves
 
 from requests.auth import HTTPBasicAuth
 
+try:
+    from requests.packages.urllib3.util.retry import Retry
+except ImportError:
+    Retry = None  # requests < 2.4.1 only takes a number of retries
+
 from plotly import exceptions, tools, utils, version, files
 from plotly.plotly import chunked_requests
 from plotly.session import (sign_in, update_session_plot_options,
@@ -45,6 +54,30 @@ DEFAULT_PLOT_OPTIONS = {
     'sharing': files.FILE_CONTENT[files.CONFIG_FILE]['sharing']
 }
 
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+
+# sent to make a plot's url secret, see `add_share_key_to_url`
+SHARE_KEY_PAYLOAD = {"share_key_enabled": "True", "world_readable": "False"}
+
+# Request bodies larger than this are spooled to a temporary file as they're
+# encoded instead of being held in memory.
+REQUEST_BODY_MAX_MEMORY = 2 ** 20  # bytes
+
+# Requests to plotly share one `requests.Session` so connections are kept
+# alive and reused, see `_get_session`. Change these with
+# `set_request_options`, which makes a new session that uses them.
+REQUEST_POOL_SIZE = 10  # connections kept alive per host
+REQUEST_RETRIES = 3
+REQUEST_BACKOFF_FACTOR = 0.5  # seconds, doubled for each retry after that
+REQUEST_RETRY_STATUSES = (502, 503, 504)
+REQUEST_TIMEOUT = (10, 300)  # (connect, read) seconds
+
+# Methods that are safe to send twice, like urllib3's default method
+# whitelist. Other requests (e.g., POST to make a plot) aren't retried once
+# they may have been sent, see `_get_retry`.
+_IDEMPOTENT_METHODS = frozenset(['HEAD', 'GET', 'PUT', 'DELETE', 'OPTIONS',
+                                 'TRACE'])
+
 # test file permissions and make sure nothing is corrupted
 tools.ensure_local_plotly_files()
 
@@ -80,6 +113,47 @@ def get_config():
     return config
 
 
+def set_request_options(pool_size=None, retries=None, backoff_factor=None,
+                        retry_statuses=None, timeout=None):
+    """
+    Configure how requests to plotly are sent.
+
+    Options left as None aren't changed. Open connections are closed, the
+    next request opens new ones with the new options.
+
+    Example:
+
+        py.set_request_options(pool_size=20, retries=5, timeout=(5, 60))
+
+    :param (int) pool_size: How many connections to keep alive per host.
+                            Defaults to 10.
+    :param (int) retries: How many times to retry connection errors and
+                          `retry_statuses`. Defaults to 3.
+    :param (float) backoff_factor: Seconds to wait before the second retry,
+                                   doubled for each retry after that.
+                                   Defaults to 0.5.
+    :param (tuple[int]) retry_statuses: Statuses to retry requests other
+                                        than POST and PATCH on. Defaults to
+                                        (502, 503, 504).
+    :param (float|tuple) timeout: Seconds to wait, or (connect, read)
+                                  seconds. Defaults to (10, 300).
+
+    """
+    global REQUEST_POOL_SIZE, REQUEST_RETRIES, REQUEST_BACKOFF_FACTOR
+    global REQUEST_RETRY_STATUSES, REQUEST_TIMEOUT
+    if pool_size is not None:
+        REQUEST_POOL_SIZE = pool_size
+    if retries is not None:
+        REQUEST_RETRIES = retries
+    if backoff_factor is not None:
+        REQUEST_BACKOFF_FACTOR = backoff_factor
+    if retry_statuses is not None:
+        REQUEST_RETRY_STATUSES = tuple(retry_statuses)
+    if timeout is not None:
+        REQUEST_TIMEOUT = timeout
+    _reset_session()
+
+
 def _plot_option_logic(plot_options_from_call_signature):
     """
     Given some plot_options as part of a plot call, decide on final options.
@@ -208,6 +282,28 @@ def plot(figure_or_data, validate=True, **plot_options):
     world_readable (default=True) -- Deprecated: use "sharing".
                                      Make this figure private/public
 
+    """
+    figure, plot_options = _prepare_plot(figure_or_data, validate,
+                                         plot_options)
+    res = _send_to_plotly(figure, **plot_options)
+    if res['error'] == '':
+        if plot_options['auto_open']:
+            _open_url(res['url'])
+
+        return res['url']
+    else:
+        raise exceptions.PlotlyAccountError(res['error'])
+
+
+def _prepare_plot(figure_or_data, validate, plot_options):
+    """
+    Get the figure and the final plot options for a call to `plot`.
+
+    :param (dict|list) figure_or_data: See `plot`.
+    :param (bool) validate: See `plot`.
+    :param (dict) plot_options: The plot options given to `plot`.
+    :return: (tuple) The figure and the plot options to send with it.
+
     """
     figure = tools.return_figure_from_figure_or_data(figure_or_data, validate)
 
@@ -237,15 +333,55 @@ def plot(figure_or_data, validate=True, **plot_options):
             except TypeError:
                 pass
 
-    plot_options = _plot_option_logic(plot_options)
-    res = _send_to_plotly(figure, **plot_options)
-    if res['error'] == '':
-        if plot_options['auto_open']:
-            _open_url(res['url'])
+    return figure, _plot_option_logic(plot_options)
 
-        return res['url']
-    else:
-        raise exceptions.PlotlyAccountError(res['error'])
+
+def plot_many(figures, filenames=None, max_workers=None, validate=True,
+              **plot_options):
+    """
+    Plot many figures, sending up to `max_workers` of them at a time.
+
+    Each figure is validated, encoded and sent in a worker thread, so the
+    time spent waiting on plotly's servers overlaps. Unlike `plot`, the plots
+    aren't opened in the browser unless `auto_open=True` is given.
+
+    Example:
+
+        urls = py.plot_many(figures, filenames=['daily/sales',
+                                                'daily/returns'])
+
+    :param (list) figures: The figure (or data) for each plot, see `plot`.
+    :param (list[str]) filenames: The filename for each plot, see `plot`.
+    :param (int) max_workers: How many plots to send at once. Defaults to
+                              REQUEST_POOL_SIZE.
+    :param (bool) validate: Validate the figures, see `plot`.
+    :param plot_options: Options for every plot, see `plot`.
+    :return: (list) The url for each plot, in the order of `figures`, or the
+             exception that was raised while plotting it.
+
+    """
+    figures = list(figures)
+    if filenames is not None:
+        filenames = list(filenames)
+        if len(filenames) != len(figures):
+            raise exceptions.PlotlyError(
+                "Got {} filenames for {} figures. Give one filename for each "
+                "figure.".format(len(filenames), len(figures))
+            )
+    plot_options.setdefault('auto_open', False)
+
+    # the workers validate like this thread, see `graph_objs.validation_mode`
+    from plotly.graph_objs import graph_objs
+    mode = graph_objs.get_validation_mode()
+
+    def plot_figure(index):
+        options = dict(plot_options)
+        if filenames is not None:
+            options['filename'] = filenames[index]
+        with graph_objs.validation_mode(mode):
+            return plot(figures[index], validate=validate, **options)
+
+    return _map_in_threads(plot_figure, range(len(figures)), max_workers)
 
 
 def iplot_mpl(fig, resize=True, strip_style=False, update=None,
@@ -345,6 +481,21 @@ def get_figure(file_owner_or_url, file_id=None, raw=False):
     representation, and converts the JSON dictionary objects to plotly
     `graph objects`.
 
+    """
+    url, headers = _get_figure_request(file_owner_or_url, file_id)
+    response = _request('get', url, headers=headers,
+                        verify=get_config()['plotly_ssl_verification'])
+    return _get_figure_from_response(response, raw)
+
+
+def _get_figure_request(file_owner_or_url, file_id):
+    """
+    Get the url and headers to request a figure with, see `get_figure`.
+
+    :param (str) file_owner_or_url: See `get_figure`.
+    :param (int|str) file_id: See `get_figure`.
+    :return: (tuple) The url and a dict of headers.
+
     """
     plotly_rest_url = get_config()['plotly_domain']
     if file_id is None:  # assume we're using a url
@@ -384,9 +535,11 @@ def get_figure(file_owner_or_url, file_id=None, raw=False):
         raise exceptions.PlotlyError(
             "The 'file_id' argument must be a non-negative number."
         )
-    response = requests.get(plotly_rest_url + resource,
-                            headers=headers,
-                            verify=get_config()['plotly_ssl_verification'])
+    return plotly_rest_url + resource, headers
+
+
+def _get_figure_from_response(response, raw):
+    """Get the figure from a `get_figure` response, see `get_figure`."""
     if response.status_code == 200:
         if six.PY3:
             content = json.loads(response.content.decode('utf-8'))
@@ -611,6 +764,25 @@ class image:
         py.image.get(fig, 'png', scale=3)
         ```
 
+        """
+        url, headers, payload = image._get_request(figure_or_data, format,
+                                                   width, height, scale)
+        res = _post(
+            url, utils.PlotlyJSONEncoder().iterencode(payload),
+            headers=headers, verify=get_config()['plotly_ssl_verification'],
+        )
+        return image._get_from_response(res)
+
+    @staticmethod
+    def _get_request(figure_or_data, format, width, height, scale):
+        """
+        Get the url, headers and payload to request an image with.
+
+        See `image.get` for the arguments.
+
+        :return: (tuple) The url, a dict of headers and the payload to send
+                 as json.
+
         """
         # TODO: format is a built-in name... we shouldn't really use it
         if isinstance(figure_or_data, dict):
@@ -651,11 +823,11 @@ class image:
             payload['scale'] = scale
         url = _api_v2.api_url('images/')
 
-        res = requests.post(
-            url, data=json.dumps(payload, cls=utils.PlotlyJSONEncoder),
-            headers=headers, verify=get_config()['plotly_ssl_verification'],
-        )
+        return url, headers, payload
 
+    @staticmethod
+    def _get_from_response(res):
+        """Get the image from an `image.get` response, see `image.get`."""
         headers = res.headers
 
         if res.status_code == 200:
@@ -804,8 +976,8 @@ class file_ops:
 
         url = _api_v2.api_url('folders')
 
-        res = requests.post(url, data=payload, headers=_api_v2.headers(),
-                            verify=get_config()['plotly_ssl_verification'])
+        res = _request('post', url, data=payload, headers=_api_v2.headers(),
+                       verify=get_config()['plotly_ssl_verification'])
 
         _api_v2.response_handler(res)
 
@@ -899,6 +1071,37 @@ class grid_ops:
         py.plot([trace], filename='graph from grid')
         ```
 
+        """
+        parent_path, payload = cls._get_upload_payload(grid, filename,
+                                                       world_readable, meta)
+        if parent_path != '':
+            file_ops.mkdirs(parent_path)
+
+        upload_url = _api_v2.api_url('grids')
+        headers = _api_v2.headers()
+        headers['content-type'] = FORM_CONTENT_TYPE
+        req = _post(upload_url, _iter_form_encoded(payload), headers=headers,
+                    verify=get_config()['plotly_ssl_verification'])
+
+        res = _api_v2.response_handler(req)
+        grid_url = cls._update_uploaded_grid(grid, res)
+
+        if meta is not None:
+            meta_ops.upload(meta, grid=grid)
+
+        if auto_open:
+            _open_url(grid_url)
+
+        return grid_url
+
+    @classmethod
+    def _get_upload_payload(cls, grid, filename, world_readable, meta):
+        """
+        Get the form fields to upload a grid with, see `grid_ops.upload`.
+
+        :return: (tuple) The grid's parent folder path ('' for none) and a
+                 list of (name, value) form fields.
+
         """
         # Make a folder path
         if filename[-1] == '/':
@@ -908,30 +1111,25 @@ class grid_ops:
         parent_path = '/'.join(paths[0:-1])
         filename = paths[-1]
 
-        if parent_path != '':
-            file_ops.mkdirs(parent_path)
-
         # transmorgify grid object into plotly's format
         grid_json = grid._to_plotly_grid_json()
         if meta is not None:
             grid_json['metadata'] = meta
 
-        payload = {
-            'filename': filename,
-            'data': json.dumps(grid_json, cls=utils.PlotlyJSONEncoder),
-            'world_readable': world_readable
-        }
+        payload = [
+            ('filename', filename),
+            ('data', utils.PlotlyJSONEncoder().iterencode(grid_json)),
+            ('world_readable', world_readable)
+        ]
 
         if parent_path != '':
-            payload['parent_path'] = parent_path
+            payload.append(('parent_path', parent_path))
 
-        upload_url = _api_v2.api_url('grids')
-        req = requests.post(upload_url, data=payload,
-                            headers=_api_v2.headers(),
-                            verify=get_config()['plotly_ssl_verification'])
-
-        res = _api_v2.response_handler(req)
+        return parent_path, payload
 
+    @classmethod
+    def _update_uploaded_grid(cls, grid, res):
+        """Set the ids plotly gave an uploaded grid. Return its url."""
         response_columns = res['file']['cols']
         grid_id = res['file']['fid']
         grid_url = res['file']['web_url']
@@ -941,13 +1139,42 @@ class grid_ops:
 
         grid.id = grid_id
 
-        if meta is not None:
-            meta_ops.upload(meta, grid=grid)
+        return grid_url
 
-        if auto_open:
-            _open_url(grid_url)
+    @classmethod
+    def upload_many(cls, grids, filenames, max_workers=None,
+                    **upload_options):
+        """
+        Upload many grids, sending up to `max_workers` of them at a time.
 
-        return grid_url
+        Each grid is encoded and sent in a worker thread, like `plot_many`.
+        Grids aren't opened in the browser unless `auto_open=True` is given.
+
+        :param (list) grids: plotly.grid_objs.Grid objects to upload.
+        :param (list[str]) filenames: The filename for each grid, see
+                                      `grid_ops.upload`.
+        :param (int) max_workers: How many grids to send at once. Defaults to
+                                  REQUEST_POOL_SIZE.
+        :param upload_options: `world_readable`, `auto_open` and `meta` for
+                               every grid, see `grid_ops.upload`.
+        :return: (list) The url for each grid, in the order of `grids`, or
+                 the exception that was raised while uploading it.
+
+        """
+        grids = list(grids)
+        filenames = list(filenames)
+        if len(filenames) != len(grids):
+            raise exceptions.PlotlyError(
+                "Got {} filenames for {} grids. Give one filename for each "
+                "grid.".format(len(filenames), len(grids))
+            )
+        upload_options.setdefault('auto_open', False)
+
+        def upload_grid(index):
+            return cls.upload(grids[index], filenames[index],
+                              **upload_options)
+
+        return _map_in_threads(upload_grid, range(len(grids)), max_workers)
 
     @classmethod
     def append_columns(cls, columns, grid=None, grid_url=None):
@@ -986,6 +1213,33 @@ class grid_ops:
         py.grid_ops.append_columns([column_1], grid_url=grid_url)
         ```
 
+        """
+        grid_id, payload = cls._get_append_columns_payload(columns, grid,
+                                                           grid_url)
+
+        api_url = (_api_v2.api_url('grids') +
+                   '/{grid_id}/col'.format(grid_id=grid_id))
+        headers = _api_v2.headers()
+        headers['content-type'] = FORM_CONTENT_TYPE
+        res = _post(api_url, _iter_form_encoded(payload), headers=headers,
+                    verify=get_config()['plotly_ssl_verification'])
+        res = _api_v2.response_handler(res)
+
+        cls._fill_in_response_column_ids(columns, res['cols'], grid_id)
+
+        if grid:
+            grid.extend(columns)
+
+    @classmethod
+    def _get_append_columns_payload(cls, columns, grid, grid_url):
+        """
+        Get the form fields to append columns with.
+
+        See `grid_ops.append_columns` for the arguments.
+
+        :return: (tuple) The grid's id and a list of (name, value) form
+                 fields.
+
         """
         grid_id = _api_v2.parse_grid_id_args(grid, grid_url)
 
@@ -999,20 +1253,11 @@ class grid_ops:
             err = exceptions.NON_UNIQUE_COLUMN_MESSAGE.format(duplicate_name)
             raise exceptions.InputError(err)
 
-        payload = {
-            'cols': json.dumps(columns, cls=utils.PlotlyJSONEncoder)
-        }
-
-        api_url = (_api_v2.api_url('grids') +
-                   '/{grid_id}/col'.format(grid_id=grid_id))
-        res = requests.post(api_url, data=payload, headers=_api_v2.headers(),
-                            verify=get_config()['plotly_ssl_verification'])
-        res = _api_v2.response_handler(res)
-
-        cls._fill_in_response_column_ids(columns, res['cols'], grid_id)
+        payload = [
+            ('cols', utils.PlotlyJSONEncoder().iterencode(columns))
+        ]
 
-        if grid:
-            grid.extend(columns)
+        return grid_id, payload
 
     @classmethod
     def append_rows(cls, rows, grid=None, grid_url=None):
@@ -1058,6 +1303,30 @@ class grid_ops:
         py.grid_ops.append_rows([row], grid=grid_url)
         ```
 
+        """
+        grid_id, payload = cls._get_append_rows_payload(rows, grid, grid_url)
+
+        api_url = (_api_v2.api_url('grids') +
+                   '/{grid_id}/row'.format(grid_id=grid_id))
+        headers = _api_v2.headers()
+        headers['content-type'] = FORM_CONTENT_TYPE
+        res = _post(api_url, _iter_form_encoded(payload), headers=headers,
+                    verify=get_config()['plotly_ssl_verification'])
+        _api_v2.response_handler(res)
+
+        if grid:
+            cls._append_rows_to_grid(rows, grid)
+
+    @classmethod
+    def _get_append_rows_payload(cls, rows, grid, grid_url):
+        """
+        Get the form fields to append rows with.
+
+        See `grid_ops.append_rows` for the arguments.
+
+        :return: (tuple) The grid's id and a list of (name, value) form
+                 fields.
+
         """
         grid_id = _api_v2.parse_grid_id_args(grid, grid_url)
 
@@ -1075,27 +1344,25 @@ class grid_ops:
                                 n_columns,
                                 'column' if n_columns == 1 else 'columns'))
 
-        payload = {
-            'rows': json.dumps(rows, cls=utils.PlotlyJSONEncoder)
-        }
+        payload = [
+            ('rows', utils.PlotlyJSONEncoder().iterencode(rows))
+        ]
 
-        api_url = (_api_v2.api_url('grids') +
-                   '/{grid_id}/row'.format(grid_id=grid_id))
-        res = requests.post(api_url, data=payload, headers=_api_v2.headers(),
-                            verify=get_config()['plotly_ssl_verification'])
-        _api_v2.response_handler(res)
+        return grid_id, payload
 
-        if grid:
-            longest_column_length = max([len(col.data) for col in grid])
+    @classmethod
+    def _append_rows_to_grid(cls, rows, grid):
+        """Append rows that were sent to plotly to the local grid."""
+        longest_column_length = max([len(col.data) for col in grid])
 
-            for column in grid:
-                n_empty_rows = longest_column_length - len(column.data)
-                empty_string_rows = ['' for _ in range(n_empty_rows)]
-                column.data.extend(empty_string_rows)
+        for column in grid:
+            n_empty_rows = longest_column_length - len(column.data)
+            empty_string_rows = ['' for _ in range(n_empty_rows)]
+            column.data.extend(empty_string_rows)
 
-            column_extensions = zip(*rows)
-            for local_column, column_extension in zip(grid, column_extensions):
-                local_column.data.extend(column_extension)
+        column_extensions = zip(*rows)
+        for local_column, column_extension in zip(grid, column_extensions):
+            local_column.data.extend(column_extension)
 
     @classmethod
     def delete(cls, grid=None, grid_url=None):
@@ -1133,8 +1400,8 @@ class grid_ops:
         """
         grid_id = _api_v2.parse_grid_id_args(grid, grid_url)
         api_url = _api_v2.api_url('grids') + '/' + grid_id
-        res = requests.delete(api_url, headers=_api_v2.headers(),
-                              verify=get_config()['plotly_ssl_verification'])
+        res = _request('delete', api_url, headers=_api_v2.headers(),
+                       verify=get_config()['plotly_ssl_verification'])
         _api_v2.response_handler(res)
 
 
@@ -1201,8 +1468,9 @@ class meta_ops:
 
         api_url = _api_v2.api_url('grids') + '/{grid_id}'.format(grid_id=grid_id)
 
-        res = requests.patch(api_url, data=payload, headers=_api_v2.headers(),
-                             verify=get_config()['plotly_ssl_verification'])
+        res = _request('patch', api_url, data=payload,
+                       headers=_api_v2.headers(),
+                       verify=get_config()['plotly_ssl_verification'])
 
         return _api_v2.response_handler(res)
 
@@ -1330,86 +1598,344 @@ def add_share_key_to_url(plot_url, attempt=0):
     Update plot's url to include the secret key
 
     """
+    url = _get_file_api_url(plot_url)
+    new_response = _request('patch', url,
+                            headers=_api_v2.headers(),
+                            data=SHARE_KEY_PAYLOAD)
+
+    plot_url, embed_url = _get_share_key_urls(plot_url, new_response)
+
+    # sometimes a share key is added, but access is still denied
+    # check for access, and retry a couple of times if this is the case
+    # https://github.com/plotly/streambed/issues/4089
+    access_res = _request('get', embed_url)
+    if access_res.status_code == 404:
+        attempt += 1
+        if attempt == 5:
+            return plot_url
+        plot_url = add_share_key_to_url(plot_url.split('?')[0], attempt)
+
+    return plot_url
+
+
+def _get_file_api_url(plot_url):
+    """Get the v2 api url for the file at a plot's url."""
     urlsplit = six.moves.urllib.parse.urlparse(plot_url)
     file_owner = urlsplit.path.split('/')[1].split('~')[1]
     file_id = urlsplit.path.split('/')[2]
 
-    url = _api_v2.api_url("files/") + file_owner + ":" + file_id
-    new_response = requests.patch(url,
-                                  headers=_api_v2.headers(),
-                                  data={"share_key_enabled":
-                                        "True",
-                                        "world_readable":
-                                        "False"})
+    return _api_v2.api_url("files/") + file_owner + ":" + file_id
+
+
+def _get_share_key_urls(plot_url, response):
+    """
+    Add the share key from a share key response to a plot's url.
 
-    _api_v2.response_handler(new_response)
+    :param (str) plot_url: The url of the plot, without a share key.
+    :param (requests.Response) response: The response to requesting a share
+                                         key, see `add_share_key_to_url`.
+    :return: (tuple) The plot url and the embed url, with the share key.
+
+    """
+    _api_v2.response_handler(response)
 
     # decode bytes for python 3.3: https://bugs.python.org/issue10976
-    str_content = new_response.content.decode('utf-8')
+    str_content = response.content.decode('utf-8')
 
     new_response_data = json.loads(str_content)
 
     plot_url += '?share_key=' + new_response_data['share_key']
-
-    # sometimes a share key is added, but access is still denied
-    # check for access, and retry a couple of times if this is the case
-    # https://github.com/plotly/streambed/issues/4089
     embed_url = plot_url.split('?')[0] + '.embed' + plot_url.split('?')[1]
-    access_res = requests.get(embed_url)
-    if access_res.status_code == 404:
-        attempt += 1
-        if attempt == 5:
-            return plot_url
-        plot_url = add_share_key_to_url(plot_url.split('?')[0], attempt)
 
-    return plot_url
+    return plot_url, embed_url
+
+
+def _iter_form_encoded(fields):
+    """
+    Yield an 'application/x-www-form-urlencoded' request body in chunks.
+
+    Values are encoded the same way `requests` encodes dicts of form data:
+    None values are dropped and anything else that isn't a string is
+    `str`-ed. Generators, e.g., from `PlotlyJSONEncoder().iterencode`, are
+    encoded a chunk at a time so they're never joined in memory.
+
+    :param (list[tuple]) fields: (name, value) pairs, in order.
+    :return: (generator) str chunks.
+
+    """
+    quote_plus = six.moves.urllib.parse.quote_plus
+    first = True
+    for name, value in fields:
+        if value is None:
+            continue
+        if not first:
+            yield '&'
+        first = False
+        yield quote_plus(_to_utf8(name)) + '='
+        if isinstance(value, types.GeneratorType):
+            for chunk in value:
+                yield quote_plus(_to_utf8(chunk))
+        else:
+            yield quote_plus(_to_utf8(value))
+
+
+def _to_utf8(value):
+    """Get utf-8 encoded bytes for form encoding, `str`-ing non-strings."""
+    if isinstance(value, six.binary_type):
+        return value
+    if not isinstance(value, six.text_type):
+        value = str(value)
+    return value.encode('utf-8')
+
+
+def _get_request_body(chunks):
+    """
+    Write str chunks into a request body without joining them in memory.
+
+    Bodies larger than REQUEST_BODY_MAX_MEMORY are spooled to a temporary
+    file as they're written. `requests` streams files from disk when sending.
+
+    :param (iterable) chunks: str or bytes chunks of the body.
+    :return: (bytes|file) The body. Files are at position 0, close them!
+
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=REQUEST_BODY_MAX_MEMORY)
+    for chunk in chunks:
+        if isinstance(chunk, six.text_type):
+            chunk = chunk.encode('utf-8')
+        body.write(chunk)
+    size = body.tell()
+    body.seek(0)
+    if size > REQUEST_BODY_MAX_MEMORY:
+        return body
+    try:
+        return body.read()
+    finally:
+        body.close()
+
+
+# {retry: requests.Session}, see `_get_session`
+_sessions = {}
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _get_session(retry=True):
+    """
+    Return the `requests.Session` shared by every request to plotly.
+
+    The session is made the first time it's needed, and again in forked
+    processes so they don't share connections with their parent. It keeps up
+    to REQUEST_POOL_SIZE connections per host alive. Connection errors are
+    retried REQUEST_RETRIES times with exponential backoff, as are
+    REQUEST_RETRY_STATUSES responses to idempotent requests (not POST or
+    PATCH, which could make a plot twice). Older versions of requests retry
+    differently, see `_get_retry`.
+
+    :param (bool) retry: False for a session that never retries, which
+                         `_request` only needs with requests < 2.4.1.
+    :return: (requests.Session)
+
+    """
+    global _session_pid
+    with _session_lock:
+        if _session_pid != os.getpid():
+            _sessions.clear()
+            _session_pid = os.getpid()
+        if retry not in _sessions:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=REQUEST_POOL_SIZE,
+                pool_maxsize=REQUEST_POOL_SIZE,
+                max_retries=_get_retry() if retry else 0
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[retry] = session
+        return _sessions[retry]
+
+
+def _get_retry():
+    """
+    Get the retry policy for `_get_session`'s adapter.
+
+    A `Retry` only retries read errors, which happen after a request was
+    sent, for `_IDEMPOTENT_METHODS`. Before requests 2.10 it can't retry on
+    statuses.
+
+    Before requests 2.4.1 there's no `Retry`, just a number of retries that
+    urllib3 uses for every error, read errors on a POST included. That could
+    make a plot twice or send a body that was already read, so `_request`
+    sends other methods with a session that doesn't retry. Retries don't
+    back off either.
+
+    :return: (Retry|int)
+
+    """
+    if Retry is None:
+        return REQUEST_RETRIES
+    try:
+        return Retry(total=REQUEST_RETRIES,
+                     backoff_factor=REQUEST_BACKOFF_FACTOR,
+                     status_forcelist=REQUEST_RETRY_STATUSES,
+                     raise_on_status=False)
+    except TypeError:
+        # before urllib3 1.15, running out of retries on a status raises
+        # instead of returning the last response, so don't retry statuses
+        return Retry(total=REQUEST_RETRIES,
+                     backoff_factor=REQUEST_BACKOFF_FACTOR)
+
+
+def _get_timeout():
+    """
+    Get REQUEST_TIMEOUT in a form this version of requests takes.
+
+    (connect, read) tuples need requests 2.4, before that the longer of the
+    two is used for both.
+
+    """
+    if isinstance(REQUEST_TIMEOUT, tuple) and requests.__build__ < 0x020400:
+        return max(REQUEST_TIMEOUT)
+    return REQUEST_TIMEOUT
+
+
+def _reset_session():
+    """Close the shared sessions. The next request makes a new one."""
+    with _session_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _request(method, url, **kwargs):
+    """
+    Make a request with the shared session, see `_get_session`.
+
+    Takes the same arguments as `requests.request`. The timeout defaults to
+    REQUEST_TIMEOUT.
+
+    """
+    kwargs.setdefault('timeout', _get_timeout())
+    retry = Retry is not None or method.upper() in _IDEMPOTENT_METHODS
+    return _get_session(retry=retry).request(method, url, **kwargs)
+
+
+def _map_in_threads(func, items, max_workers=None):
+    """
+    Call `func` on each item in a pool of worker threads.
+
+    :param (function) func: Called with one item at a time.
+    :param (iterable) items: The items, `func` gets called once for each.
+    :param (int) max_workers: How many threads to use. Defaults to
+                              REQUEST_POOL_SIZE, since there's no point
+                              sending more requests than connections are kept.
+    :return: (list) What `func` returned for each item, in order, or the
+             exception it raised.
+
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = REQUEST_POOL_SIZE
+    if max_workers < 1:
+        raise exceptions.PlotlyError("max_workers must be at least 1.")
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as err:
+            return err
+
+    pool = ThreadPool(min(max_workers, len(items)))
+    try:
+        return pool.map(call, items, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _post(url, chunks, **kwargs):
+    """POST a body built from `chunks`, see `_get_request_body`."""
+    body = _get_request_body(chunks)
+    try:
+        return _request('post', url, data=body, **kwargs)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
 
 
 def _send_to_plotly(figure, **plot_options):
     """
 
+    """
+    url = get_config()['plotly_domain'] + "/clientresp"
+    payload = _get_plot_payload(figure, plot_options)
+    r = _post(url, _iter_form_encoded(payload),
+              headers={'content-type': FORM_CONTENT_TYPE},
+              verify=get_config()['plotly_ssl_verification'])
+    r = _get_plot_response(r)
+
+    # Check if the url needs a secret key
+    if (plot_options['sharing'] == 'secret' and
+            'share_key=' not in r['url']):
+
+        # add_share_key_to_url updates the url to include the share_key
+        r['url'] = add_share_key_to_url(r['url'])
+
+    _show_plot_messages(r)
+
+    return r
+
+
+def _get_plot_payload(figure, plot_options):
+    """
+    Get the form fields to send a figure to plotly with.
+
+    :param (dict) figure: The figure to plot.
+    :param (dict) plot_options: The final plot options, see `_prepare_plot`.
+    :return: (list) (name, value) form fields. Values may be generators.
+
     """
     fig = tools._replace_newline(figure)  # does not mutate figure
-    data = json.dumps(fig['data'] if 'data' in fig else [],
-                      cls=utils.PlotlyJSONEncoder)
+    encoder = utils.PlotlyJSONEncoder()
+    data = encoder.iterencode(fig['data'] if 'data' in fig else [])
     credentials = get_credentials()
     validate_credentials(credentials)
     username = credentials['username']
     api_key = credentials['api_key']
-    kwargs = json.dumps(dict(filename=plot_options['filename'],
-                             fileopt=plot_options['fileopt'],
-                             world_readable=plot_options['world_readable'],
-                             sharing=plot_options['sharing'],
-                             layout=fig['layout'] if 'layout' in fig
-                             else {}),
-                        cls=utils.PlotlyJSONEncoder)
+    kwargs = encoder.iterencode(dict(
+        filename=plot_options['filename'],
+        fileopt=plot_options['fileopt'],
+        world_readable=plot_options['world_readable'],
+        sharing=plot_options['sharing'],
+        layout=fig['layout'] if 'layout' in fig else {}
+    ))
 
     # TODO: It'd be cool to expose the platform for RaspPi and others
-    payload = dict(platform='python',
-                   version=version.__version__,
-                   args=data,
-                   un=username,
-                   key=api_key,
-                   origin='plot',
-                   kwargs=kwargs)
+    payload = [('platform', 'python'),
+               ('version', version.__version__),
+               ('args', data),
+               ('un', username),
+               ('key', api_key),
+               ('origin', 'plot'),
+               ('kwargs', kwargs)]
+    return payload
 
-    url = get_config()['plotly_domain'] + "/clientresp"
 
-    r = requests.post(url, data=payload,
-                      verify=get_config()['plotly_ssl_verification'])
-    r.raise_for_status()
-    r = json.loads(r.text)
+def _get_plot_response(response):
+    """Get the content of a plot response as a dict. Raise any errors."""
+    response.raise_for_status()
+    r = json.loads(response.text)
 
     if 'error' in r and r['error'] != '':
         raise exceptions.PlotlyError(r['error'])
 
-    # Check if the url needs a secret key
-    if (plot_options['sharing'] == 'secret' and
-            'share_key=' not in r['url']):
+    return r
 
-        # add_share_key_to_url updates the url to include the share_key
-        r['url'] = add_share_key_to_url(r['url'])
 
+def _show_plot_messages(r):
+    """Show any error, warning or message from plotly in a plot response."""
     if 'error' in r and r['error'] != '':
         print(r['error'])
     if 'warning' in r and r['warning'] != '':
@@ -1417,8 +1943,6 @@ def _send_to_plotly(figure, **plot_options):
     if 'message' in r and r['message'] != '':
         print(r['message'])
 
-    return r
-
 
 def _open_url(url):
     try:
@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+
+from unittest import TestCase
+
+from plotly.exceptions import PlotlyError
+from plotly.graph_objs import Bar, Figure, Scatter
+
+
+class TestDiff(TestCase):
+
+    def setUp(self):
+        self.figure = Figure(
+            data=[Scatter(x=[1, 2], y=[3, 4], marker={'color': 'red'}),
+                  Bar(x=[1], y=[2])],
+            layout={'title': 'title', 'xaxis': {'range': [0, 1]},
+                    'annotations': [{'text': 'a'}, {'text': 'b'}]}
+        )
+        self.figure.checkpoint()
+
+    def test_no_changes(self):
+        self.assertEqual(self.figure.diff(), [])
+        self.assertEqual(Figure().diff(Figure()), [])
+
+    def test_restyle_and_relayout(self):
+        self.figure['data'][0]['marker']['color'] = 'blue'
+        self.figure['data'][1]['opacity'] = 0.5
+        self.figure['layout']['annotations'][1]['text'] = 'c'
+        del self.figure['layout']['xaxis']['range']
+        self.assertEqual(self.figure.diff(), [
+            ('restyle', {'marker.color': ['blue']}, [0]),
+            ('restyle', {'opacity': [0.5]}, [1]),
+            ('relayout', {'annotations[1].text': 'c', 'xaxis.range': None})
+        ])
+
+    def test_extend_traces(self):
+        scatter = self.figure['data'][0]
+        scatter['x'] = scatter['x'] + [3]
+        scatter['y'] = [3, 4, 5]
+        self.assertEqual(self.figure.diff(), [
+            ('extendTraces', {'x': [[3]], 'y': [[5]]}, [0])
+        ])
+
+        # changed points are sent as they are
+        scatter['x'] = [5, 6, 7]
+        self.assertEqual(self.figure.diff(), [
+            ('extendTraces', {'y': [[5]]}, [0]),
+            ('restyle', {'x': [[5, 6, 7]]}, [0])
+        ])
+
+    def test_changes_in_place(self):
+        scatter = self.figure['data'][0]
+        scatter['x'].append(3)
+        scatter['y'] += [5]
+        self.figure['layout']['annotations'][0]['text'] = 'c'
+        dict.__getitem__(self.figure['layout'], 'xaxis')['range'][1] = 2
+        self.assertEqual(self.figure.diff(), [
+            ('extendTraces', {'x': [[3]], 'y': [[5]]}, [0]),
+            ('relayout', {'annotations[0].text': 'c', 'xaxis.range': [0, 2]})
+        ])
+
+    def test_add_and_delete_traces(self):
+        self.figure['data'].append(Scatter(x=[1]))
+        self.assertEqual(self.figure.diff(), [
+            ('addTraces', [{'type': 'scatter', 'x': [1]}])
+        ])
+
+        self.figure.checkpoint()
+        del self.figure['data'][1:]
+        self.assertEqual(self.figure.diff(), [('deleteTraces', [1, 2])])
+
+    def test_diff_with_dict(self):
+        other = {'data': [{'type': 'scatter', 'x': [1, 2], 'y': [3, 4]}]}
+        self.assertEqual(self.figure.diff(other), [
+            ('restyle', {'marker': [{'color': 'red'}]}, [0]),
+            ('addTraces', [{'type': 'bar', 'x': [1], 'y': [2]}]),
+            ('relayout', {'title': 'title', 'xaxis': {'range': [0, 1]},
+                          'annotations': [{'text': 'a'}, {'text': 'b'}]})
+        ])
+
+    def test_checkpoint_needed(self):
+        self.assertRaises(PlotlyError, Figure().diff)
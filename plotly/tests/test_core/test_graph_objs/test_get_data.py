@@ -164,6 +164,15 @@ class TestGetData(TestCase):
 
     # TODO test for Data, Scatter, etc..
 
+    def test_get_data_doesnt_wrap(self):
+        figure = Figure(data=[{'type': 'scatter', 'x': [1, 2],
+                               'marker': {'color': [1, 2], 'size': 3}}])
+        data = figure.get_data()
+        self.assertEqual(data, [{'x': [1, 2], 'marker': {'color': [1, 2]}}])
+        trace = list.__getitem__(figure['data'], 0)
+        self.assertIs(type(trace), dict)
+        self.assertIs(type(trace['marker']), dict)
+
     def test_flatten_repeated_trace_names(self):
         dl = Data([Scatter(name='thesame', x=[1, 2, 3]) for _ in range(3)])
         data = dl.get_data(flatten=True)
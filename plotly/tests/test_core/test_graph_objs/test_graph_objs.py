@@ -1,7 +1,15 @@
+import copy
+import gc
+import pickle
+import threading
+import weakref
 from unittest import TestCase
 
 import plotly.graph_objs as go
 import plotly.graph_reference as gr
+from plotly.exceptions import PlotlyDictKeyError, PlotlyError
+from plotly.graph_objs import graph_objs_tools
+from plotly.graph_objs.graph_objs import PlotlyDict, PlotlyList
 
 OLD_CLASS_NAMES = ['AngularAxis', 'Annotation', 'Annotations', 'Area',
                    'Bar', 'Box', 'ColorBar', 'Contour', 'Contours',
@@ -47,3 +55,374 @@ class TestGraphObjs(TestCase):
         current_class_names = {key for key in go.__dict__.keys()
                                if key[0].isupper()}
         self.assertEqual(current_class_names, expected_class_names)
+
+    def test_attribute_tables_are_shared(self):
+
+        # objects in the same context share one table, not per-object copies
+
+        scatter0 = go.Scatter(marker={'color': 'red'})
+        scatter1 = go.Scatter(marker={'size': 5})
+        self.assertIs(scatter0.marker._get_attributes_table(),
+                      scatter1.marker._get_attributes_table())
+        self.assertNotIn('_valid_attributes',
+                         getattr(scatter0.marker, '__dict__', {}))
+
+        # but a different context gets a different table
+        self.assertIsNot(go.Marker()._get_attributes_table(),
+                         scatter0.marker._get_attributes_table())
+
+
+class TestValidationModes(TestCase):
+
+    figure = {'data': [{'type': 'scatter', 'x': [1, 2], 'bogus': 1,
+                        'marker': {'line': {'width': 2}}}],
+              'layout': {'xaxis2': {'title': 'x2'}}}
+
+    def tearDown(self):
+        go.set_validation_mode('full')
+
+    def test_default_mode(self):
+        self.assertEqual(go.get_validation_mode(), 'full')
+
+    def test_invalid_mode(self):
+        self.assertRaises(PlotlyError, go.set_validation_mode, 'some')
+
+    def test_context_manager_restores_mode(self):
+        with go.validation_mode('none'):
+            self.assertEqual(go.get_validation_mode(), 'none')
+        self.assertEqual(go.get_validation_mode(), 'full')
+
+        try:
+            with go.validation_mode('shallow'):
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(go.get_validation_mode(), 'full')
+
+    def test_context_manager_is_thread_local(self):
+        modes = []
+        thread = threading.Thread(
+            target=lambda: modes.append(go.get_validation_mode())
+        )
+        with go.validation_mode('none'):
+            thread.start()
+            thread.join()
+            self.assertEqual(go.get_validation_mode(), 'none')
+        self.assertEqual(modes, ['full'])
+
+        # the global mode is still used by every thread
+        go.set_validation_mode('shallow')
+        thread = threading.Thread(
+            target=lambda: modes.append(go.get_validation_mode())
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual(modes, ['full', 'shallow'])
+
+    def test_full(self):
+        self.assertRaises(PlotlyDictKeyError, go.Figure, self.figure)
+
+    def test_shallow(self):
+
+        # only the keys of the object being built are validated
+        with go.validation_mode('shallow'):
+            self.assertRaises(PlotlyDictKeyError, go.Scatter, bogus=1)
+            figure = go.Figure(self.figure)
+        self.assertEqual(figure, self.figure)
+
+    def test_none(self):
+        with go.validation_mode('none'):
+            scatter = go.Scatter(bogus=1)
+            figure = go.Figure(self.figure)
+        self.assertEqual(scatter, {'type': 'scatter', 'bogus': 1})
+        self.assertEqual(figure, self.figure)
+
+        # nested objects are still graph objects with the right parents
+        line = figure['data'][0]['marker']['line']
+        self.assertIsInstance(figure['data'], go.Data)
+        self.assertIsInstance(line, PlotlyDict)
+        self.assertEqual(line._get_path(), ('data', 0, 'marker', 'line'))
+        self.assertEqual(line._get_attribute_role('width'), 'style')
+        self.assertIsInstance(figure['layout']['xaxis2'], PlotlyDict)
+
+    def test_none_with_unknown_keys(self):
+
+        # keys the graph reference doesn't know aren't data or style
+        with go.validation_mode('none'):
+            figure = go.Figure(self.figure)
+        self.assertEqual(figure.get_data(), [{'x': [1, 2]}])
+        self.assertEqual(figure.get_data(flatten=True), {'trace_0.x': [1, 2]})
+        figure.strip_style()
+        self.assertEqual(figure['data'][0], {'type': 'scatter', 'x': [1, 2],
+                                             'bogus': 1,
+                                             'marker': {'line': {}}})
+
+    def test_setting_items_uses_mode(self):
+        scatter = go.Scatter()
+        with go.validation_mode('none'):
+            scatter['bogus'] = 1
+            scatter['marker'] = {'bogus': 2}
+        self.assertEqual(scatter, {'type': 'scatter', 'bogus': 1,
+                                   'marker': {'bogus': 2}})
+        self.assertRaises(PlotlyDictKeyError, scatter.__setitem__,
+                          'bogus', 1)
+
+
+class TestLazyWrapping(TestCase):
+
+    def setUp(self):
+        self.figure_dict = {
+            'data': [{'x': [1, 2], 'marker': {'line': {'width': 2}}},
+                     {'type': 'bar', 'y': [3]}],
+            'layout': {'xaxis2': {'title': 'x2'},
+                       'annotations': [{'text': 'a'}]}
+        }
+
+    def test_nested_objects_are_wrapped_when_accessed(self):
+        figure = go.Figure(self.figure_dict)
+        self.assertIs(type(dict.__getitem__(figure, 'layout')), dict)
+
+        layout = figure['layout']
+        self.assertIsInstance(layout, PlotlyDict)
+        self.assertEqual(layout._name, 'layout')
+        self.assertIs(figure['layout'], layout)
+        self.assertIs(figure.layout, layout)
+        self.assertIs(type(dict.__getitem__(layout, 'xaxis2')), dict)
+        self.assertIsInstance(layout.xaxis2, PlotlyDict)
+        self.assertEqual(layout.annotations[0]._name, 'annotation')
+
+        # leaves are never wrapped
+        self.assertIs(type(figure.data[0].x), list)
+
+    def test_wrapped_objects_know_their_parents(self):
+        figure = go.Figure(self.figure_dict)
+        line = figure['data'][0]['marker']['line']
+        self.assertEqual(line._get_path(), ('data', 0, 'marker', 'line'))
+        self.assertEqual(line._get_parent_object_names(),
+                         ['figure', 'data', 'scatter', 'marker'])
+        self.assertIs(line._parent._parent, figure['data'][0])
+
+    def test_data_entries(self):
+        data = go.Figure(self.figure_dict)['data']
+        self.assertEqual([trace._name for trace in data], ['scatter', 'bar'])
+        self.assertEqual([trace['type'] for trace in data[-2:]],
+                         ['scatter', 'bar'])
+        self.assertIsInstance(data.get_data()[0], dict)
+
+        data = go.Figure(self.figure_dict)['data']
+        self.assertEqual(data.pop()._name, 'bar')
+        self.assertEqual(len(data), 1)
+
+    def test_nested_objects_are_still_validated(self):
+        self.figure_dict['data'][0]['marker']['line']['bogus'] = 1
+        with self.assertRaises(PlotlyDictKeyError) as context:
+            go.Figure(self.figure_dict)
+        self.assertEqual(context.exception.path,
+                         ['data', 0, 'marker', 'line', 'bogus'])
+
+    def test_input_is_copied(self):
+        figure = go.Figure(self.figure_dict)
+        self.figure_dict['data'][0]['marker']['line']['width'] = 5
+        self.figure_dict['layout']['annotations'].append({'text': 'b'})
+        self.assertEqual(figure['data'][0]['marker']['line']['width'], 2)
+        self.assertEqual(len(figure['layout']['annotations']), 1)
+
+        # but the values themselves aren't copied
+        self.assertIs(figure['data'][0]['x'], self.figure_dict['data'][0]['x'])
+
+    def test_get_and_pop_wrap(self):
+        scatter = go.Scatter(marker={'color': 'red'})
+        self.assertIsInstance(scatter.get('marker'), PlotlyDict)
+        self.assertIsNone(scatter.get('line'))
+        self.assertIsInstance(scatter.pop('marker'), PlotlyDict)
+        self.assertEqual(scatter.pop('line', 'default'), 'default')
+
+    def test_dict_methods_wrap(self):
+        figure = go.Figure(self.figure_dict)
+        self.assertEqual(sorted(type(value).__name__
+                                for value in figure.values()),
+                         ['Data', 'PlotlyDict'])
+        self.assertEqual(dict((key, type(value).__name__)
+                              for key, value in figure.items()),
+                         {'data': 'Data', 'layout': 'PlotlyDict'})
+        self.assertEqual(type(figure.copy()), dict)
+        self.assertIsInstance(figure.copy()['layout'], PlotlyDict)
+
+        layout = figure['layout']
+        self.assertIsInstance(layout.setdefault('xaxis2', {}), PlotlyDict)
+        self.assertEqual(layout.xaxis2.title, 'x2')
+        self.assertIsInstance(layout.setdefault('yaxis', {}), PlotlyDict)
+        self.assertRaises(PlotlyDictKeyError, layout.setdefault, 'bogus', 1)
+        while layout:
+            key, value = layout.popitem()
+            self.assertIsInstance(value, (PlotlyDict, PlotlyList))
+
+    def test_list_methods_wrap(self):
+        data = go.Figure(self.figure_dict)['data']
+        self.assertEqual([trace._name for trace in reversed(data)],
+                         ['bar', 'scatter'])
+        self.assertEqual([trace._name for trace in data.copy()],
+                         ['scatter', 'bar'])
+
+    def test_changes_through_dict_methods_are_validated(self):
+        figure = go.Figure(self.figure_dict)
+        layout = dict(figure.items())['layout']
+        self.assertRaises(PlotlyDictKeyError, layout['xaxis2'].__setitem__,
+                          'bogus', 1)
+
+
+class TestCachedPaths(TestCase):
+
+    def test_paths_and_parent_names_are_cached(self):
+        figure = go.Figure(layout={'scene': {'xaxis': {'title': 'x'}}})
+        xaxis = figure['layout']['scene']['xaxis']
+        path = xaxis._get_path()
+        self.assertEqual(path, ('layout', 'scene', 'xaxis'))
+        self.assertIs(xaxis._get_path(), path)
+        self.assertEqual(xaxis._get_parent_names(),
+                         ('figure', 'layout', 'scene'))
+        self.assertEqual(xaxis._get_parent_object_names(),
+                         ['figure', 'layout', 'scene'])
+
+        # objects in the same context share their parent names
+        other = go.Figure(layout={'scene': {'xaxis': {}}})
+        self.assertIs(other['layout']['scene']['xaxis']._get_parent_names(),
+                      xaxis._get_parent_names())
+
+    def test_set_parent_clears_cached_paths(self):
+        figure = go.Figure(layout={'scene': {'xaxis': {'title': 'x'}}})
+        scene = figure['layout']['scene']
+        xaxis = scene['xaxis']
+        self.assertEqual(xaxis._get_path(), ('layout', 'scene', 'xaxis'))
+
+        scene._set_parent(go.Layout(), 'scene')
+        self.assertEqual(scene._get_path(), ('scene', ))
+        self.assertEqual(xaxis._get_path(), ('scene', 'xaxis'))
+        self.assertEqual(xaxis._get_parent_names(), ('layout', 'scene'))
+
+
+class TestSlots(TestCase):
+
+    def test_graph_objects_have_no_instance_dict(self):
+        scatter = go.Scatter(marker={'color': 'red'})
+        for obj in [scatter, scatter.marker, go.Data(), go.Annotations()]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+        # make_subplots keeps its grid on the figure
+        self.assertTrue(hasattr(go.Figure(), '__dict__'))
+
+    def test_attributes_cant_be_added(self):
+        scatter = go.Scatter()
+        self.assertRaises(PlotlyDictKeyError, setattr, scatter, 'foo', 1)
+        self.assertRaises(AttributeError, getattr, scatter, '_foo')
+
+    def test_weak_references(self):
+        scatter = go.Scatter(marker={'color': 'red'})
+        for obj in [scatter, scatter.marker, go.Data(), go.Figure()]:
+            self.assertIs(weakref.ref(obj)(), obj)
+
+        objects = weakref.WeakValueDictionary({'scatter': scatter})
+        self.assertIs(objects['scatter'], scatter)
+        del scatter
+        gc.collect()  # the wrapped marker refers back to its parent
+        self.assertNotIn('scatter', objects)
+
+    def test_pickle(self):
+        figure = go.Figure(data=[go.Scatter(marker={'color': 'red'})],
+                           layout={'xaxis': {'title': 'x'}})
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(figure, protocol))
+            self.assertIsInstance(unpickled, go.Figure)
+            self.assertEqual(unpickled, figure)
+            marker = unpickled['data'][0]['marker']
+            self.assertEqual(marker._get_path(), ('data', 0, 'marker'))
+
+        # graph objects are unpickled without their parents
+        xaxis = pickle.loads(pickle.dumps(figure['layout']['xaxis']))
+        self.assertEqual((xaxis._name, xaxis._parent), ('xaxis', None))
+
+
+class TestCopies(TestCase):
+
+    def setUp(self):
+        self.figure = go.Figure(
+            data=[go.Scatter(x=[1, 2], marker={'color': 'red'})],
+            layout={'title': 'title', 'xaxis': {'range': [0, 1]}}
+        )
+
+    def test_copy_keeps_class_and_parent(self):
+        for copy_function in [copy.copy, copy.deepcopy]:
+            copied = copy_function(self.figure)
+            self.assertIsInstance(copied, go.Figure)
+            self.assertEqual(copied, self.figure)
+
+            marker = self.figure['data'][0]['marker']
+            copied_marker = copy_function(marker)
+            self.assertEqual(copied_marker, marker)
+            self.assertEqual(copied_marker._name, 'marker')
+            self.assertIs(copied_marker._parent, marker._parent)
+            self.assertEqual(copied_marker._get_path(), ('data', 0, 'marker'))
+
+    def test_copy_shares_unwrapped_values(self):
+        layout = dict.__getitem__(self.figure, 'layout')
+        self.figure['data'][0]['marker']  # wrap this one
+        copied = copy.copy(self.figure)
+        self.assertIs(dict.__getitem__(copied['layout'], 'xaxis'),
+                      dict.__getitem__(layout, 'xaxis'))
+        self.assertIsNot(copied['data'][0]['marker'],
+                         self.figure['data'][0]['marker'])
+        self.assertIs(copied['data'][0]['x'], self.figure['data'][0]['x'])
+
+    def test_deepcopy_only_shares_data(self):
+        layout = dict.__getitem__(self.figure, 'layout')
+        copied = copy.deepcopy(self.figure)
+        self.assertIsNot(dict.__getitem__(copied['layout'], 'xaxis'),
+                         dict.__getitem__(layout, 'xaxis'))
+        self.assertIs(copied['data'][0]['x'], self.figure['data'][0]['x'])
+
+        # however the originals are reached, changing them doesn't matter
+        dict(self.figure['layout'].items())['xaxis']['range'] = [2, 3]
+        for value in self.figure['data'][0].values():
+            if isinstance(value, dict):
+                value['color'] = 'blue'
+        dict.__getitem__(layout, 'xaxis')['range'] = [4, 5]
+        self.assertEqual(copied['layout']['xaxis']['range'], [0, 1])
+        self.assertEqual(copied['data'][0]['marker']['color'], 'red')
+
+    def test_changes_arent_shared(self):
+        copied = copy.deepcopy(self.figure)
+        copied['layout']['xaxis']['range'] = [2, 3]
+        copied['data'][0]['marker']['color'] = 'blue'
+        copied['data'].append(go.Bar())
+        self.assertEqual(self.figure['layout']['xaxis']['range'], [0, 1])
+        self.assertEqual(self.figure['data'][0]['marker']['color'], 'red')
+        self.assertEqual(len(self.figure['data']), 1)
+
+        self.figure['layout']['title'] = 'new title'
+        self.assertEqual(copied['layout']['title'], 'title')
+
+    def test_copy_isnt_revalidated(self):
+        with go.validation_mode('none'):
+            scatter = go.Scatter(foo='bar')
+        self.assertEqual(copy.copy(scatter)['foo'], 'bar')
+
+    def test_strip_style_doesnt_change_copies(self):
+        copied = copy.copy(self.figure)
+        copied.strip_style()
+        self.assertEqual(copied['data'][0]['marker'], {})
+        self.assertEqual(self.figure['data'][0]['marker'], {'color': 'red'})
+
+    def test_deepcopy_memo(self):
+        copied = copy.deepcopy([self.figure, self.figure])
+        self.assertIs(copied[0], copied[1])
+
+
+class TestDocstrings(TestCase):
+
+    def test_docstrings(self):
+        for cls, object_name in [(go.Scatter, 'scatter'), (go.Data, 'data'),
+                                 (go.Figure, 'figure')]:
+            doc = graph_objs_tools.get_help(object_name)
+            self.assertEqual(cls.__doc__, doc)
+            self.assertEqual(cls().__doc__, doc)
+            self.assertIs(cls.__doc__, cls.__doc__)  # made once
@@ -4,16 +4,24 @@ A module to test functionality related to *using* the graph reference.
 """
 from __future__ import absolute_import
 
+import copy
 import json
 import os
+import shutil
+import tempfile
+import warnings
 from pkg_resources import resource_string
 from unittest import TestCase
 
 import requests
 import six
 from nose.plugins.attrib import attr
+from nose.plugins.skip import SkipTest
+from six.moves import cPickle as pickle
+from nose.tools import raises
 
 from plotly import files, graph_reference as gr, tools, utils
+from plotly.exceptions import PlotlyError
 from plotly.graph_reference import string_to_class_name, get_role
 from plotly.tests.utils import PlotlyTestCase
 
@@ -32,9 +40,62 @@ class TestGraphReferenceCaching(PlotlyTestCase):
 
         outdated_graph_reference = {'real': 'old'}
         self.set_graph_reference(outdated_graph_reference)
-        graph_reference = gr.get_graph_reference()
+        graph_reference = gr.get_graph_reference(mode='online')
         self.assertNotEqual(graph_reference, outdated_graph_reference)
 
+    def test_get_graph_reference_offline_uses_local_copy(self):
+
+        # the default mode should never make a request, even if it could
+
+        tools.set_config_file(plotly_api_domain='api.am.not.here.ly')
+        local_graph_reference = {'real': 'local'}
+        self.set_graph_reference(local_graph_reference)
+
+        def get(*args, **kwargs):
+            raise AssertionError("'offline' mode made a request.")
+
+        original_get = requests.get
+        requests.get = get
+        try:
+            graph_reference = gr.get_graph_reference(mode='offline')
+        finally:
+            requests.get = original_get
+        self.assertEqual(graph_reference, local_graph_reference)
+
+    def test_get_graph_reference_mode_from_environment(self):
+
+        # the mode comes from an env var, with a sane default
+
+        env_var = gr.GRAPH_REFERENCE_MODE_ENV_VAR
+        original_mode = os.environ.pop(env_var, None)
+        try:
+            self.assertEqual(gr.get_graph_reference_mode(), 'offline')
+            os.environ[env_var] = 'ONLINE'
+            self.assertEqual(gr.get_graph_reference_mode(), 'online')
+            os.environ[env_var] = 'wh0cares'
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                self.assertEqual(gr.get_graph_reference_mode(),
+                                 gr.DEFAULT_GRAPH_REFERENCE_MODE)
+        finally:
+            os.environ.pop(env_var, None)
+            if original_mode is not None:
+                os.environ[env_var] = original_mode
+
+    @raises(PlotlyError)
+    def test_get_graph_reference_bad_mode(self):
+        gr.get_graph_reference(mode='wh0cares')
+
+    def test_refresh_graph_reference_bad_request(self):
+
+        # a failed refresh shouldn't touch the local copy
+
+        tools.set_config_file(plotly_api_domain='api.am.not.here.ly')
+        local_graph_reference = {'real': 'local'}
+        self.set_graph_reference(local_graph_reference)
+        self.assertFalse(gr.refresh_graph_reference())
+        self.assertEqual(gr.get_graph_reference(), local_graph_reference)
+
     def test_get_graph_reference_bad_request_local_copy(self):
 
         # if the request fails (mocked by using a bad url here) and a local
@@ -83,6 +144,108 @@ class TestGraphReferenceCaching(PlotlyTestCase):
         self.assertEqual(schema, default_schema, msg=msg)
 
 
+class TestGraphReferenceIndex(PlotlyTestCase):
+
+    def setUp(self):
+        super(TestGraphReferenceIndex, self).setUp()
+        self._index = None
+        if os.path.exists(files.GRAPH_REFERENCE_INDEX_FILE):
+            with open(files.GRAPH_REFERENCE_INDEX_FILE, 'rb') as f:
+                self._index = f.read()
+
+    def tearDown(self):
+        if self._index is not None:
+            with open(files.GRAPH_REFERENCE_INDEX_FILE, 'wb') as f:
+                f.write(self._index)
+        super(TestGraphReferenceIndex, self).tearDown()
+
+    def get_graph_reference(self, trace_name):
+        return {
+            'defs': {'metaKeys': ['description', 'role']},
+            'traces': {trace_name: {'attributes': {}}},
+            'layout': {'layoutAttributes': {}}
+        }
+
+    def test_build_graph_reference_index(self):
+
+        # building from scratch should match what we loaded on import
+
+        graph_reference = copy.deepcopy(gr.GRAPH_REFERENCE)
+        index = gr.build_graph_reference_index(graph_reference)
+        self.assertEqual(sorted(index['trace_names']), sorted(gr.TRACE_NAMES))
+        self.assertEqual(index['objects'], gr.OBJECTS)
+        self.assertEqual(index['arrays'], gr.ARRAYS)
+        self.assertEqual(index['classes'], gr.CLASSES)
+        self.assertEqual(index['object_name_to_class_name'],
+                         gr.OBJECT_NAME_TO_CLASS_NAME)
+
+    def test_save_graph_reference_index(self):
+        index = gr.build_graph_reference_index(self.get_graph_reference('a'),
+                                               sha1='abc')
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmp_dir, 'index')
+            gr._save_graph_reference_index(index, filename=filename)
+            with open(filename, 'rb') as f:
+                self.assertEqual(pickle.load(f), index)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_load_graph_reference_index_follows_schema(self):
+
+        # a cached index is only valid for the schema it was built from
+
+        if not files.check_file_permissions():
+            raise SkipTest('The local graph reference cache is unavailable.')
+        utils.save_json_dict(files.GRAPH_REFERENCE_FILE,
+                             self.get_graph_reference('a'))
+        index = gr.load_graph_reference_index(mode='offline')
+        self.assertEqual(index['trace_names'], ['a'])
+
+        utils.save_json_dict(files.GRAPH_REFERENCE_FILE,
+                             self.get_graph_reference('b'))
+        index = gr.load_graph_reference_index(mode='offline')
+        self.assertEqual(index['trace_names'], ['b'])
+
+    def test_load_graph_reference_index_online_without_permissions(self):
+
+        # a downloaded schema is used even if it can't be saved
+
+        content = json.dumps({'modified': True,
+                              'schema': self.get_graph_reference('a')})
+
+        class Response(object):
+            def __init__(self):
+                self.content = content.encode('utf-8')
+
+            def raise_for_status(self):
+                pass
+
+        original_get = requests.get
+        original_check_file_permissions = files.check_file_permissions
+        requests.get = lambda *args, **kwargs: Response()
+        files.check_file_permissions = lambda: False
+        try:
+            index = gr.load_graph_reference_index(mode='online')
+        finally:
+            requests.get = original_get
+            files.check_file_permissions = original_check_file_permissions
+        self.assertEqual(index['trace_names'], ['a'])
+
+    def test_load_graph_reference_index_bad_cache(self):
+
+        # a corrupt index is ignored and rebuilt
+
+        if not files.check_file_permissions():
+            raise SkipTest('The local graph reference cache is unavailable.')
+        utils.save_json_dict(files.GRAPH_REFERENCE_FILE,
+                             self.get_graph_reference('a'))
+        with open(files.GRAPH_REFERENCE_INDEX_FILE, 'wb') as f:
+            f.write(six.b('not a pickle'))
+        index = gr.load_graph_reference_index(mode='offline')
+        self.assertEqual(index['trace_names'], ['a'])
+
+
 class TestStringToClass(PlotlyTestCase):
 
     def test_capitalize_first_letter(self):
@@ -207,6 +370,32 @@ class TestGetAttributesMethods(TestCase):
         for expected_attribute in expected_attributes:
             self.assertIn(expected_attribute, bar_deprecated_attributes)
 
+    def test_get_attributes_table(self):
+
+        # the table should agree with the other getters
+
+        parent_object_names = ('figure', 'data', 'scatter')
+        table = gr.get_attributes_table('marker', parent_object_names)
+        self.assertEqual(table['attributes']['color']['role'], 'style')
+        self.assertTrue(table['attributes']['color']['array_ok'])
+        self.assertTrue(table['attributes']['line']['is_object'])
+        self.assertIn('color', table['valid_attributes'])
+
+        layout_table = gr.get_attributes_table('layout', ('figure', ))
+        self.assertTrue(layout_table['attributes']['xaxis']['is_subplot'])
+        self.assertEqual(layout_table['subplot_attributes'],
+                         gr.get_subplot_attributes('layout', ('figure', )))
+
+        bar_table = gr.get_attributes_table('bar', ('figure', 'data'))
+        self.assertTrue(bar_table['attributes']['bardir']['deprecated'])
+
+    def test_get_attributes_table_is_cached(self):
+
+        # arrays don't change the context, so they shouldn't miss the cache
+
+        table = gr.get_attributes_table('scatter', ('figure', 'data'))
+        self.assertIs(gr.get_attributes_table('scatter', ['figure']), table)
+
 
 class TestGetAttributePathToObjectNames(TestCase):
 
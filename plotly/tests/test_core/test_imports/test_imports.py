@@ -0,0 +1,53 @@
+"""
+test_imports:
+=============
+
+A module intended for use with Nose.
+
+"""
+from __future__ import absolute_import
+
+import subprocess
+import sys
+from unittest import TestCase
+
+import plotly
+
+IMPORT_SCRIPT = """
+import sys
+import plotly
+print(sorted(name for name in ['requests', 'plotly.plotly', 'plotly.tools']
+             if name in sys.modules))
+"""
+
+
+class TestLazySubmodules(TestCase):
+
+    def test_import_plotly_is_light(self):
+        output = subprocess.check_output([sys.executable, '-c',
+                                          IMPORT_SCRIPT])
+        self.assertEqual(output.decode('utf-8').strip(), '[]')
+
+    def test_submodules_are_attributes(self):
+        from plotly import graph_objs, offline, tools
+        self.assertIs(plotly.tools, tools)
+        self.assertIs(plotly.graph_objs, graph_objs)
+        self.assertIs(plotly.offline, offline)
+        self.assertTrue(hasattr(plotly.plotly, 'plot'))
+        self.assertIn('grid_objs', dir(plotly))
+        self.assertRaises(AttributeError, getattr, plotly, 'foo')
+
+    def test_module_attributes_are_kept(self):
+        import plotly.version
+        self.assertEqual(plotly.__name__, 'plotly')
+        self.assertIn('plotly', plotly.__path__[0])
+        self.assertIs(plotly.version, sys.modules['plotly.version'])
+        self.assertIs(sys.modules['plotly'], plotly)
+
+    def test_only_public_names_are_listed(self):
+        names = dir(plotly)
+        self.assertIn('__version__', names)
+        for name in ['sys', 'importlib', 'absolute_import', '_SUBMODULES']:
+            self.assertNotIn(name, names)
+        self.assertFalse(hasattr(plotly, 'sys'))
+        self.assertFalse(hasattr(plotly, 'importlib'))
@@ -7,6 +7,9 @@ from __future__ import absolute_import
 from nose.tools import raises
 from unittest import TestCase
 import json
+import os
+import shutil
+import tempfile
 
 import plotly
 
@@ -78,3 +81,33 @@ class PlotlyOfflineTestCase(TestCase):
         })
         for resize_code_string in resize_code_strings:
             self.assertTrue(resize_code_string not in html)
+
+    def test_plot_html_is_chunked(self):
+
+        # the figure's json is yielded as it's encoded, not all at once
+
+        data_json = json.dumps(fig['data'], cls=plotly.utils.PlotlyJSONEncoder)
+        iter_plot_html = plotly.offline.offline._iter_plot_html
+        chunks = list(iter_plot_html(fig, True, 'Export to plot.ly', True,
+                                     '100%', 525, False)[0])
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(data_json in ''.join(chunks))
+
+    def test_failed_plot_keeps_existing_file(self):
+
+        # the file is only replaced once the whole figure has been encoded
+
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'plot.html')
+            with open(filename, 'w') as f:
+                f.write('old plot')
+            bad_fig = {'data': [{'x': [object()]}]}
+            self.assertRaises(TypeError, plotly.offline.plot, bad_fig,
+                              validate=False, filename=filename,
+                              auto_open=False)
+            with open(filename) as f:
+                self.assertEqual(f.read(), 'old plot')
+            self.assertEqual(os.listdir(directory), ['plot.html'])
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,188 @@
+"""
+Test plotly.plotly.aio against a local stub HTTP server.
+
+"""
+from __future__ import absolute_import
+
+import json
+import sys
+from unittest import skipIf
+
+import requests
+from six.moves.urllib.parse import parse_qs
+
+from plotly.grid_objs import Column, Grid
+from plotly.plotly import plotly as py
+from plotly.tests.test_core.test_plotly.test_requests import \
+    StubServerTestCase
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from plotly.plotly import aio
+
+
+@skipIf(sys.version_info < (3, 5), 'plotly.plotly.aio needs Python 3.5+')
+class AioTest(StubServerTestCase):
+
+    def respond(self, command, path, body):
+        fields = parse_qs(body.decode('utf-8'))
+        if path == '/clientresp':
+            filename = json.loads(fields['kwargs'][0])['filename']
+            return {'url': self.url + '/~test/' + filename, 'error': '',
+                    'warning': '', 'message': ''}
+        if path.startswith('/v2/files/'):
+            return {'share_key': 'abc'}
+        if path.startswith('/apigetfile/'):
+            return {'payload': {'figure': {'data': [{'x': [1, 2]}],
+                                           'layout': {}}}}
+        if path == '/v2/images/':
+            return b'\x89PNG'
+        if path == '/v2/grids':
+            return {'file': {'cols': [{'name': 'x', 'uid': 'abc'}],
+                             'fid': 'test:1',
+                             'web_url': self.url + '/~test/1'}}
+        if path.endswith('/col'):
+            return {'cols': [{'name': 'y', 'uid': 'def'}]}
+        return {}
+
+    def setUp(self):
+        super(AioTest, self).setUp()
+        py.sign_in('PlotlyImageTest', '786r5mecv0', plotly_domain=self.url,
+                   plotly_api_domain=self.url)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        aio.set_transport(aio.StreamTransport(limit=5))
+
+    def tearDown(self):
+        self.wait(aio.close())
+        aio.set_transport(None)
+        asyncio.set_event_loop(None)
+        self.loop.close()
+        super(AioTest, self).tearDown()
+
+    def wait(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def get_requests(self):
+        return [request[:2] for request in self.server.requests]
+
+    def test_plot(self):
+        url = self.wait(aio.plot([{'x': [1, 2]}], filename='a',
+                                 auto_open=False))
+        self.assertEqual(url, self.url + '/~test/a')
+        fields = parse_qs(self.server.requests[0][2].decode('utf-8'))
+        self.assertEqual(json.loads(fields['args'][0]), [{'x': [1, 2]}])
+        self.assertEqual(fields['un'], ['PlotlyImageTest'])
+
+    def test_concurrent_plots_share_connections(self):
+        filenames = [str(i) for i in range(50)]
+        urls = self.wait(asyncio.gather(*[
+            aio.plot([{'x': [1, 2]}], filename=filename, auto_open=False)
+            for filename in filenames
+        ]))
+        self.assertEqual(urls, [self.url + '/~test/' + filename
+                                for filename in filenames])
+        client_addresses = set(request[3] for request in self.server.requests)
+        self.assertEqual(len(self.server.requests), 50)
+        self.assertLessEqual(len(client_addresses), 5)
+
+    def test_secret_plot(self):
+        url = self.wait(aio.plot([{'x': [1, 2]}], filename='a',
+                                 sharing='secret', auto_open=False))
+        self.assertEqual(url, self.url + '/~test/a?share_key=abc')
+        self.assertEqual(self.get_requests()[1:],
+                         [('PATCH', '/v2/files/test:a'),
+                          ('GET', '/~test/a.embedshare_key=abc')])
+
+    def test_get_figure(self):
+        figure = self.wait(aio.get_figure(self.url + '/~test/3', raw=True))
+        self.assertEqual(figure, {'data': [{'x': [1, 2]}], 'layout': {}})
+        self.assertEqual(self.get_requests(), [('GET', '/apigetfile/test/3')])
+
+    def test_chunked_response(self):
+        self.server.chunked = True
+        figure = self.wait(aio.get_figure('test', 3))
+        self.assertEqual(figure['data'][0]['x'], [1, 2])
+
+    def test_image_get(self):
+        image = self.wait(aio.image.get({'data': [{'x': [1]}]}, 'png'))
+        self.assertEqual(image, b'\x89PNG')
+        self.assertEqual(json.loads(self.server.requests[0][2].decode()),
+                         {'figure': {'data': [{'x': [1]}]}, 'format': 'png'})
+
+    def test_grid_ops(self):
+        grid = Grid([Column([1, 2], 'x')])
+        url = self.wait(aio.grid_ops.upload(grid, 'folder/grid',
+                                            auto_open=False, meta={'a': 1}))
+        self.assertEqual(url, self.url + '/~test/1')
+        self.assertEqual(grid.id, 'test:1')
+        self.assertEqual(grid[0].id, 'test:1/abc')
+
+        self.wait(aio.grid_ops.append_rows([[3]], grid=grid))
+        self.assertEqual(grid[0].data, [1, 2, 3])
+        column = Column([4, 5, 6], 'y')
+        self.wait(aio.grid_ops.append_columns([column], grid=grid))
+        self.assertEqual(column.id, 'test:1/def')
+        self.wait(aio.grid_ops.delete(grid))
+        self.assertEqual(self.get_requests(),
+                         [('POST', '/v2/folders'),
+                          ('POST', '/v2/grids'),
+                          ('PATCH', '/v2/grids/test:1'),
+                          ('POST', '/v2/grids/test:1/row'),
+                          ('POST', '/v2/grids/test:1/col'),
+                          ('DELETE', '/v2/grids/test:1')])
+
+    def test_http_errors(self):
+        self.server.statuses = [500]
+        self.assertRaises(requests.exceptions.HTTPError, self.wait,
+                          aio.grid_ops.delete(grid_url=self.url + '/~a/1'))
+
+    def test_closed_connections_are_replaced(self):
+        self.server.close_connections = True
+        for _ in range(3):
+            self.wait(aio.get_figure('test', 3, raw=True))
+        client_addresses = set(request[3] for request in self.server.requests)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(client_addresses), 3)
+
+    def test_cancelled_requests_close_connections(self):
+        transport = aio.get_transport()
+        connect = transport._connect
+        connections = []
+
+        def record_connection(key):
+            connections.append(asyncio.ensure_future(connect(key)))
+            return connections[-1]
+
+        transport._connect = record_connection
+        self.server.delay = 0.5
+        self.assertRaises(asyncio.TimeoutError, self.wait, asyncio.wait_for(
+            aio.get_figure('test', 3, raw=True), 0.05
+        ))
+        self.assertEqual(len(connections), 1)
+        reader, writer = connections[0].result()
+        self.assertTrue(writer.transport.is_closing())
+        self.assertEqual(sum(map(len, transport._connections.values())), 0)
+
+    def test_timeout_is_read_when_requests_are_sent(self):
+        py.set_request_options(timeout=(10, 0.05))
+        self.server.delay = 0.5
+        self.assertRaises(aio._ReadTimeout, self.wait,
+                          aio.get_figure('test', 3, raw=True))
+
+    def test_set_transport(self):
+        sent = []
+
+        class RecordingTransport(aio.Transport):
+
+            def request(self, method, url, headers=None, body=None,
+                        verify=True):
+                sent.append((method, url))
+                future = asyncio.Future()
+                future.set_result(aio.Response(url, 200, 'OK', {}, b''))
+                return future
+
+        aio.set_transport(RecordingTransport())
+        self.wait(aio.grid_ops.delete(grid_url=self.url + '/~a/1'))
+        self.assertEqual(sent, [('DELETE', self.url + '/v2/grids/a:1')])
+        self.assertEqual(self.server.requests, [])
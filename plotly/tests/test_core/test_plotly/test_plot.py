@@ -20,6 +20,7 @@ from plotly.tests.utils import PlotlyTestCase
 from plotly.plotly import plotly as py
 from plotly.exceptions import PlotlyError, PlotlyEmptyDataError
 from plotly.files import CONFIG_FILE
+from plotly.utils import PlotlyJSONEncoder
 
 # username for tests: 'PlotlyImageTest'
 # api_key for account: '786r5mecv0'
@@ -367,3 +368,34 @@ def generate_private_sharing_and_public_world_readable_precedence():
                 gen_test_config(plot_options))
 
 generate_private_sharing_and_public_world_readable_precedence()
+
+
+class TestRequestBody(TestCase):
+
+    def test_iter_form_encoded(self):
+
+        # streamed form data should match how requests encodes a dict
+
+        data = [{'x': [1, 2], 'name': u'\xe9 & = +', 'y': [float('NaN')]}]
+        fields = [('platform', 'python'), ('world_readable', True),
+                  ('key', None), ('path', 'a b/c')]
+        expected = requests.models.RequestEncodingMixin._encode_params(
+            dict(fields + [('args', json.dumps(data, cls=PlotlyJSONEncoder))])
+        )
+        fields.append(('args', PlotlyJSONEncoder().iterencode(data)))
+        body = ''.join(py._iter_form_encoded(fields))
+        self.assertEqual(six.moves.urllib.parse.parse_qs(body),
+                         six.moves.urllib.parse.parse_qs(expected))
+
+    def test_get_request_body(self):
+
+        # small bodies are bytes, larger ones are spooled to a file
+
+        self.assertEqual(py._get_request_body(['a', u'\xe9']),
+                         u'a\xe9'.encode('utf-8'))
+        chunks = ['a' * py.REQUEST_BODY_MAX_MEMORY, 'b']
+        body = py._get_request_body(chunks)
+        try:
+            self.assertEqual(body.read(), six.b(''.join(chunks)))
+        finally:
+            body.close()
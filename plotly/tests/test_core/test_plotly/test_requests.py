@@ -0,0 +1,272 @@
+"""
+Test the shared requests session and bulk uploads against a local stub HTTP
+server.
+
+"""
+from __future__ import absolute_import
+
+import json
+import threading
+import time
+from unittest import skipIf
+
+import requests
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import parse_qs
+
+from plotly.graph_objs import validation_mode
+from plotly.grid_objs import Column, Grid
+
+from plotly.plotly import plotly as py
+from plotly.tests.utils import PlotlyTestCase
+
+# older versions of requests don't retry statuses, see `_get_retry`
+retries_statuses = bool(getattr(py._get_retry(), 'status_forcelist', None))
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    # HTTP/1.1 so the server keeps connections alive between requests
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def handle_request(self):
+        server = self.server
+        length = int(self.headers.get('content-length') or 0)
+        body = self.rfile.read(length)
+        server.requests.append((self.command, self.path, body,
+                                self.client_address))
+        if server.drops:
+            server.drops -= 1
+            self.close_connection = True  # without a response
+            return
+        if server.statuses:
+            status = server.statuses.pop(0)
+        else:
+            status = 200
+        if server.delay:
+            time.sleep(server.delay)
+        content = server.respond(self.command, self.path, body)
+        if isinstance(content, bytes):
+            content_type = 'image/png'
+        else:
+            content_type = 'application/json'
+            content = json.dumps(content).encode('utf-8')
+        self.send_response(status)
+        self.send_header('content-type', content_type)
+        if server.chunked:
+            self.send_header('transfer-encoding', 'chunked')
+            self.end_headers()
+            half = len(content) // 2
+            for chunk in [content[:half], content[half:], b'']:
+                self.wfile.write('{:x}\r\n'.format(len(chunk)).encode() +
+                                 chunk + b'\r\n')
+        else:
+            self.send_header('content-length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        if server.close_connections:
+            self.close_connection = True  # without telling the client
+
+    do_GET = do_POST = do_PATCH = do_DELETE = handle_request
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    # a thread per connection, since kept-alive connections stay open
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # e.g., the client timed out and closed the connection
+
+
+class StubServerTestCase(PlotlyTestCase):
+
+    def respond(self, command, path, body):
+        return {'path': path}
+
+    def setUp(self):
+        super(StubServerTestCase, self).setUp()
+        self.server = StubServer(('127.0.0.1', 0), StubHandler)
+        self.server.requests = []
+        self.server.statuses = []
+        self.server.delay = 0
+        self.server.chunked = False
+        self.server.close_connections = False
+        self.server.drops = 0
+        self.server.respond = self.respond
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={'poll_interval': 0.01})
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+        self.options = dict((name, getattr(py, name)) for name in
+                            ['REQUEST_POOL_SIZE', 'REQUEST_RETRIES',
+                             'REQUEST_BACKOFF_FACTOR',
+                             'REQUEST_RETRY_STATUSES', 'REQUEST_TIMEOUT'])
+        self.retry_class = py.Retry
+        py.set_request_options(backoff_factor=0)
+
+    def tearDown(self):
+        py.Retry = self.retry_class
+        py._reset_session()
+        for name, value in self.options.items():
+            setattr(py, name, value)
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        super(StubServerTestCase, self).tearDown()
+
+
+class RequestSessionTest(StubServerTestCase):
+
+    def test_session_is_shared(self):
+        session = py._get_session()
+        self.assertIsInstance(session, requests.Session)
+        self.assertIs(py._get_session(), session)
+        py._reset_session()
+        self.assertIsNot(py._get_session(), session)
+
+    def test_set_request_options(self):
+        session = py._get_session()
+        py.set_request_options(pool_size=2, retries=1, timeout=5)
+        self.assertIsNot(py._get_session(), session)
+        adapter = py._get_session().get_adapter(self.url)
+        self.assertEqual(adapter._pool_maxsize, 2)
+        self.assertEqual(getattr(adapter.max_retries, 'total',
+                                 adapter.max_retries), 1)
+        self.assertEqual((py.REQUEST_BACKOFF_FACTOR, py.REQUEST_TIMEOUT),
+                         (0, 5))
+
+        self.server.delay = 0.5
+        py.set_request_options(retries=0, timeout=0.1)
+        self.assertRaises((requests.exceptions.ConnectionError,
+                           requests.exceptions.Timeout), py._request,
+                          'get', self.url)
+
+    def test_connections_are_reused(self):
+        for path in ['/a', '/b', '/c']:
+            response = py._request('get', self.url + path)
+            self.assertEqual(response.json(), {'path': path})
+        client_addresses = set(request[3] for request in self.server.requests)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(client_addresses), 1)
+
+    @skipIf(not retries_statuses, 'needs requests 2.10+')
+    def test_get_is_retried(self):
+        self.server.statuses = [503, 502]
+        response = py._request('get', self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    @skipIf(not retries_statuses, 'needs requests 2.10+')
+    def test_failed_retries_return_response(self):
+        py.set_request_options(retries=1)
+        self.server.statuses = [503, 503, 503]
+        response = py._request('get', self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_post_is_not_retried(self):
+        self.server.statuses = [503]
+        response = py._post(self.url + '/clientresp', ['a=', '1'])
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.server.requests,
+                         [('POST', '/clientresp', b'a=1',
+                           self.server.requests[0][3])])
+
+    def test_dropped_requests(self):
+
+        # without a `Retry`, requests < 2.4.1 would resend any request
+        for retry_class in set([py.Retry, None]):
+            py.Retry = retry_class
+            py._reset_session()
+            self.server.requests = []
+            self.server.drops = 1
+            self.assertRaises(requests.exceptions.ConnectionError,
+                              py._request, 'post', self.url, data=b'a=1')
+            self.assertEqual(len(self.server.requests), 1)
+
+            self.server.drops = 1
+            response = py._request('get', self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(self.server.requests), 3)
+
+    def test_timeout(self):
+        py.set_request_options(retries=0, timeout=(0.1, 0.1))
+        self.server.delay = 0.5
+
+        # with a retry policy, requests raises read timeouts as ConnectionError
+        self.assertRaises((requests.exceptions.ConnectionError,
+                           requests.exceptions.Timeout), py._request,
+                          'get', self.url)
+
+    def test_api_v2_uses_session(self):
+        py.sign_in('PlotlyImageTest', '786r5mecv0',
+                   plotly_api_domain=self.url)
+        py.grid_ops.delete(grid_url='https://plot.ly/~someone/3')
+        py.file_ops.mkdirs('folder')
+        client_addresses = set(request[3] for request in self.server.requests)
+        self.assertEqual([request[:2] for request in self.server.requests],
+                         [('DELETE', '/v2/grids/someone:3'),
+                          ('POST', '/v2/folders')])
+
+        # without a `Retry`, the POST is sent by a session that doesn't retry
+        self.assertEqual(len(client_addresses), 1 if py.Retry else 2)
+
+
+class BulkUploadTest(StubServerTestCase):
+
+    def respond(self, command, path, body):
+        if path == '/clientresp':
+            kwargs = json.loads(parse_qs(body.decode('utf-8'))['kwargs'][0])
+            if kwargs['filename'] == 'slow':
+                time.sleep(0.1)  # finishes last, but is still first
+            return {'url': 'https://plot.ly/~test/' + kwargs['filename'],
+                    'error': '', 'warning': '', 'message': ''}
+        filename = parse_qs(body.decode('utf-8'))['filename'][0]
+        return {'file': {'cols': [{'name': 'x', 'uid': 'abc'}],
+                         'fid': 'test:' + filename,
+                         'web_url': 'https://plot.ly/~test/' + filename}}
+
+    def setUp(self):
+        super(BulkUploadTest, self).setUp()
+        py.sign_in('PlotlyImageTest', '786r5mecv0', plotly_domain=self.url,
+                   plotly_api_domain=self.url)
+
+    def test_plot_many(self):
+        figures = [[{'x': [1, 2], 'y': [i, i]}] for i in range(3)]
+        urls = py.plot_many(figures, filenames=['slow', '1', '2'],
+                            max_workers=3)
+        self.assertEqual(urls, ['https://plot.ly/~test/slow',
+                                'https://plot.ly/~test/1',
+                                'https://plot.ly/~test/2'])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_plot_many_returns_errors(self):
+        figures = [[{'x': [1]}], [{'not_an_attribute': 1}], [{'x': [3]}]]
+        results = py.plot_many(figures, filenames=['0', '1', '2'])
+        self.assertEqual(results[0], 'https://plot.ly/~test/0')
+        self.assertIsInstance(results[1], py.exceptions.PlotlyError)
+        self.assertEqual(results[2], 'https://plot.ly/~test/2')
+
+    def test_plot_many_uses_this_threads_validation_mode(self):
+        figures = [[{'x': [1], 'bogus': 1}]]
+        with validation_mode('none'):
+            results = py.plot_many(figures, filenames=['0'])
+        self.assertEqual(results, ['https://plot.ly/~test/0'])
+
+    def test_plot_many_needs_a_filename_per_figure(self):
+        self.assertRaises(py.exceptions.PlotlyError, py.plot_many,
+                          [[{'x': [1]}]], filenames=['0', '1'])
+
+    def test_upload_many(self):
+        grids = [Grid([Column([1, 2], 'x')]) for _ in range(2)]
+        urls = py.grid_ops.upload_many(grids, ['0', '1'])
+        self.assertEqual(urls, ['https://plot.ly/~test/0',
+                                'https://plot.ly/~test/1'])
+        self.assertEqual([grid.id for grid in grids], ['test:0', 'test:1'])
+        self.assertEqual(grids[1][0].id, 'test:1/abc')
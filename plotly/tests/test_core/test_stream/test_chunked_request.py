@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Test chunked_requests.Stream against a local chunked HTTP sink.
+
+"""
+from __future__ import absolute_import
+
+import socket
+import threading
+import time
+from unittest import TestCase
+
+from six.moves import http_client
+
+from plotly.plotly.chunked_requests import Stream
+
+
+class ChunkedSink(object):
+    """
+    Accept chunked POSTs, recording the chunks sent on each connection.
+
+    The sink answers with `status` and closes the connection once the client
+    ends the request, or, if `respond_after` is set, after that many chunks.
+
+    """
+    def __init__(self):
+        self.connections = []
+        self.status = 200
+        self.respond_after = None
+        self.socket = socket.socket()
+        self.socket.bind(('127.0.0.1', 0))
+        self.socket.listen(5)
+        self.port = self.socket.getsockname()[1]
+        thread = threading.Thread(target=self.serve)
+        thread.daemon = True
+        thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                connection, _ = self.socket.accept()
+            except socket.error:
+                return  # closed
+            chunks = []
+            self.connections.append(chunks)
+            thread = threading.Thread(target=self.handle,
+                                      args=(connection, chunks))
+            thread.daemon = True
+            thread.start()
+
+    def handle(self, connection, chunks):
+        reader = connection.makefile('rb')
+        while reader.readline() not in (b'\r\n', b''):
+            pass  # skip the request headers
+        while len(chunks) != self.respond_after:
+            line = reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue  # Stream.close sends an extra CRLF
+            size = int(line.strip(), 16)
+            if size == 0:
+                break
+            chunks.append(reader.read(size))
+            reader.read(2)
+        connection.sendall('HTTP/1.1 {} Status\r\ncontent-length: 2\r\n\r\n'
+                           'OK'.format(self.status).encode('ascii'))
+        reader.close()
+        connection.close()
+
+    def close(self):
+        self.socket.close()
+
+
+class ChunkedRequestTest(TestCase):
+
+    def setUp(self):
+        self.sink = ChunkedSink()
+
+    def tearDown(self):
+        self.sink.close()
+
+    def wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                return
+            time.sleep(0.01)
+        self.fail('Timed out waiting for the sink.')
+
+    def test_write_and_close(self):
+        start = time.time()
+        stream = Stream('127.0.0.1', self.sink.port)
+        self.assertLess(time.time() - start, 0.25)  # connecting doesn't sleep
+        for message in ['{"x": 1}\n', u'{"text": "é中"}\n', b'\n']:
+            stream.write(message)
+        response = stream.close()
+        self.assertIsInstance(response, http_client.HTTPResponse)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.read(), b'OK')
+        self.assertEqual(self.sink.connections,
+                         [[b'{"x": 1}\n',
+                           u'{"text": "é中"}\n'.encode('utf-8'),
+                           b'\n']])
+
+    def test_reconnects_when_the_server_responds(self):
+        self.sink.respond_after = 1
+        self.sink.status = 408
+        stream = Stream('127.0.0.1', self.sink.port)
+        stream.write('a')
+        self.wait_for(lambda: stream._has_data())
+        self.sink.respond_after = None
+        stream.write('b', reconnect_on=(408,))
+        stream.close()
+        self.assertEqual(self.sink.connections, [[b'a'], [b'b']])
+
+    def test_raises_for_other_responses(self):
+        self.sink.respond_after = 1
+        self.sink.status = 401
+        stream = Stream('127.0.0.1', self.sink.port)
+        stream.write('a')
+        self.wait_for(lambda: stream._has_data())
+        with self.assertRaisesRegexp(Exception, 'status code: 401'):
+            stream.write('b')
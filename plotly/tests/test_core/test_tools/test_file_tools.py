@@ -1,4 +1,4 @@
-from plotly import tools, session
+from plotly import files, tools, session, utils
 from plotly.tests.utils import PlotlyTestCase
 
 
@@ -78,3 +78,79 @@ class FileToolsTest(PlotlyTestCase):
         expected = ['username', 'stream_ids', 'api_key', 'proxy_username',
                     'proxy_password']
         self.assertTrue(all(x in reset_creds for x in expected))
+
+    def test_get_config_file_is_cached(self):
+
+        # Check files aren't read or rewritten when they haven't changed
+
+        tools.get_config_file()
+        original_load_json_dict = utils.load_json_dict
+        original_save_json_dict = utils.save_json_dict
+
+        def fail(*args):
+            self.fail('The config file was read from disk.')
+
+        utils.load_json_dict = utils.save_json_dict = fail
+        try:
+            config = tools.get_config_file()
+        finally:
+            utils.load_json_dict = original_load_json_dict
+            utils.save_json_dict = original_save_json_dict
+        self.assertIn('plotly_domain', config)
+
+    def test_get_config_file_returns_copies(self):
+
+        # Check changing what's returned doesn't change the cache
+
+        tools.get_config_file()['plotly_domain'] = 'changed'
+        tools.get_credentials_file()['stream_ids'].append('changed')
+        self.assertNotEqual(tools.get_config_file()['plotly_domain'],
+                            'changed')
+        self.assertNotIn('changed', tools.get_credentials_file()['stream_ids'])
+
+    def test_get_config_file_sees_changes_on_disk(self):
+
+        # Check an edit made outside of plotly invalidates the cache
+
+        tools.get_config_file()
+        config = utils.load_json_dict(files.CONFIG_FILE)
+        config['plotly_domain'] = 'https://edited.plot.ly'
+        utils.save_json_dict(files.CONFIG_FILE, config)
+        self.assertEqual(tools.get_config_file('plotly_domain'),
+                         {'plotly_domain': 'https://edited.plot.ly'})
+
+    def test_valid_files_are_not_rewritten(self):
+
+        # Check ensure_local_plotly_files only writes invalid files
+
+        tools.ensure_local_plotly_files()
+        original_save_json_dict = utils.save_json_dict
+        saved = []
+        utils.save_json_dict = lambda filename, contents: saved.append(
+            filename)
+        try:
+            tools.ensure_local_plotly_files()
+        finally:
+            utils.save_json_dict = original_save_json_dict
+        self.assertEqual(saved, [])
+
+    def test_get_config_file_sees_changes_made_while_reading(self):
+
+        # Check a write by another process mid-read isn't cached as read
+
+        tools._clear_local_plotly_files()
+        original_load_json_dict = utils.load_json_dict
+
+        def load_then_edit(filename):
+            contents = original_load_json_dict(filename)
+            edited = dict(contents, plotly_domain='https://edited.plot.ly')
+            utils.save_json_dict(filename, edited)
+            return contents
+
+        utils.load_json_dict = load_then_edit
+        try:
+            tools.get_config_file()
+        finally:
+            utils.load_json_dict = original_load_json_dict
+        self.assertEqual(tools.get_config_file('plotly_domain'),
+                         {'plotly_domain': 'https://edited.plot.ly'})
@@ -0,0 +1,53 @@
+from __future__ import absolute_import
+
+import warnings
+from unittest import TestCase
+
+import plotly.tools as tls
+from plotly.graph_objs import Figure
+
+
+class TestReplaceNewline(TestCase):
+
+    def replace_newline(self, obj):
+
+        # python 2 doesn't repeat a warning that's in the registry, even with
+        # an 'always' filter
+        getattr(tls, '__warningregistry__', {}).clear()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            replaced = tls._replace_newline(obj)
+        return replaced, len(caught)
+
+    def test_strings_are_replaced(self):
+        figure = {'data': [{'name': 'a\nb', 'text': ['c', 'd\n'],
+                            'y': [1, 'e\n', None]}],
+                  'layout': {'title': '\nf'}}
+        replaced, warning_count = self.replace_newline(figure)
+        self.assertEqual(replaced, {
+            'data': [{'name': 'a<br>b', 'text': ['c', 'd<br>'],
+                      'y': [1, 'e<br>', None]}],
+            'layout': {'title': '<br>f'}
+        })
+        self.assertEqual(warning_count, 1)
+        self.assertEqual(figure['data'][0]['name'], 'a\nb')  # not mutated
+
+    def test_untouched_values_are_shared(self):
+        x = list(range(1000))
+        figure = {'data': [{'x': x, 'name': 'a\nb'}],
+                  'layout': {'xaxis': {'title': 'x'}}}
+        replaced, warning_count = self.replace_newline(figure)
+        self.assertIs(replaced['data'][0]['x'], x)
+        self.assertIs(replaced['layout'], figure['layout'])
+
+        replaced, warning_count = self.replace_newline(figure['layout'])
+        self.assertIs(replaced, figure['layout'])
+        self.assertEqual(warning_count, 0)
+
+    def test_graph_objects(self):
+        figure = Figure(data=[{'type': 'scatter', 'x': [1, 2]}],
+                        layout={'title': 'a\nb'})
+        replaced, warning_count = self.replace_newline(figure)
+        self.assertEqual(replaced['layout'], {'title': 'a<br>b'})
+        self.assertEqual(replaced['data'], figure['data'])
+        self.assertEqual(figure['layout']['title'], 'a\nb')
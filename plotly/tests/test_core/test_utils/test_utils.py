@@ -3,7 +3,10 @@ from __future__ import absolute_import
 import json
 from unittest import TestCase
 
-from plotly.utils import PlotlyJSONEncoder, get_by_path, node_generator
+import six
+
+from plotly.utils import (PlotlyJSONEncoder, get_by_path, memoize,
+                          node_generator)
 
 
 class TestJSONEncoder(TestCase):
@@ -14,6 +17,59 @@ class TestJSONEncoder(TestCase):
         expected_result = '[1, null, null, null, "platypus"]'
         self.assertEqual(result, expected_result)
 
+    def test_nan_in_strings_is_kept(self):
+
+        # only the constants become null, strings are left alone
+
+        obj = {'NaN': [float('NaN'), 'NaN', 'a "NaN"', '\\', '-Infinity'],
+               'y': float('-Inf')}
+        result = json.dumps(obj, cls=PlotlyJSONEncoder, sort_keys=True)
+        expected_result = ('{"NaN": [null, "NaN", "a \\"NaN\\"", "\\\\", '
+                           '"-Infinity"], "y": null}')
+        self.assertEqual(result, expected_result)
+        self.assertEqual(json.loads(result)['NaN'][1:], obj['NaN'][1:])
+
+    def test_formatting_is_kept(self):
+
+        # there's no re-encoding step to lose indent or separators in
+
+        result = json.dumps([float('NaN'), 1], cls=PlotlyJSONEncoder,
+                            indent=2, separators=(',', ': '))
+        self.assertEqual(result, '[\n  null,\n  1\n]')
+
+
+class TestJSONEncoderIterencode(TestCase):
+
+    def test_json_dump_streams_same_json(self):
+
+        # writing chunks to a file should give the same json as `dumps`
+
+        figure = {'data': [{'x': [1, 2], 'y': [float('NaN'), 'NaN']},
+                           {'z': [[1, float('Inf')]]}],
+                  'layout': {'title': 'a "NaN" title'}}
+        for kwargs in [{}, {'sort_keys': True}, {'indent': 4},
+                       {'separators': (',', ':')}]:
+            f = six.StringIO()
+            json.dump(figure, f, cls=PlotlyJSONEncoder, **kwargs)
+            expected = json.dumps(figure, cls=PlotlyJSONEncoder, **kwargs)
+            self.assertEqual(f.getvalue(), expected, msg=kwargs)
+
+    def test_iterencode_chunks(self):
+
+        # dicts and lists of dicts are walked, other values are encoded whole
+
+        chunks = list(PlotlyJSONEncoder(sort_keys=True).iterencode(
+            {'data': [{'x': [1, 2, 3]}]}
+        ))
+        self.assertIn('[1, 2, 3]', chunks)
+        self.assertEqual(''.join(chunks), '{"data": [{"x": [1, 2, 3]}]}')
+
+    def test_iterencode_circular_reference(self):
+        figure = {'data': []}
+        figure['data'].append(figure)
+        with self.assertRaises(ValueError):
+            list(PlotlyJSONEncoder().iterencode(figure))
+
 
 class TestGetByPath(TestCase):
 
@@ -49,3 +105,33 @@ class TestNodeGenerator(TestCase):
         ]
         for i, item in enumerate(node_generator(node0)):
             self.assertEqual(item, expected_node_path_tuples[i])
+
+
+class TestMemoize(TestCase):
+
+    def test_memoize(self):
+
+        # results are cached per args, and the least-recently used are dropped
+
+        calls = []
+
+        @memoize(maxsize=2)
+        def add(a, b):
+            calls.append((a, b))
+            return a + b
+
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(calls, [(1, 2)])
+
+        add(2, 3)
+        add(1, 2)  # (2, 3) is now the least-recently used
+        add(3, 4)
+        self.assertEqual(add.cache_info()['currsize'], 2)
+        add(1, 2)
+        self.assertEqual(calls, [(1, 2), (2, 3), (3, 4)])
+        add(2, 3)
+        self.assertEqual(calls, [(1, 2), (2, 3), (3, 4), (2, 3)])
+
+        add.cache_clear()
+        self.assertEqual(add.cache_info()['currsize'], 0)
@@ -0,0 +1,120 @@
+"""
+Module to test that numpy arrays and pandas objects in graph objects are
+kept as they are, without being copied or converted to lists.
+
+"""
+from __future__ import absolute_import
+
+import copy
+import json
+from unittest import TestCase, skipIf
+
+import numpy as np
+import pandas as pd
+
+from plotly import graph_reference, tools, utils
+from plotly.graph_objs import Figure, Heatmap, Scatter
+
+# older pandas copy columns into blocks even if they're told not to copy
+PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split('.')[:2])
+PANDAS_KEEPS_COLUMNS = PANDAS_VERSION >= (1, 3)
+
+
+class TestArrays(TestCase):
+
+    def setUp(self):
+        self.x = np.arange(5.)
+        self.y = pd.Series(np.arange(5.) * 2)
+        self.z = np.zeros((3, 3))
+        self.figure = Figure(data=[
+            Scatter(x=self.x, y=self.y, name='a', marker={'color': self.x}),
+            Heatmap(z=self.z)
+        ])
+
+    def test_arrays_are_stored_as_is(self):
+        scatter = self.figure['data'][0]
+        self.assertIs(scatter['x'], self.x)
+        self.assertIs(scatter['y'], self.y)
+        self.assertIs(scatter['marker']['color'], self.x)
+        self.assertIs(copy.deepcopy(self.figure)['data'][1]['z'], self.z)
+
+    def test_get_data(self):
+        data = self.figure.get_data()
+        self.assertIs(data[0]['x'], self.x)
+        self.assertIs(data[0]['marker']['color'], self.x)
+        flat_data = self.figure.get_data(flatten=True)
+        self.assertIs(flat_data['a.y'], self.y)
+        self.assertIs(flat_data['trace_1.z'], self.z)
+
+        self.figure.strip_style()
+        self.assertIs(self.figure['data'][0]['x'], self.x)
+
+    def test_to_dataframe(self):
+        df = self.figure.to_dataframe()
+        self.assertEqual(df['a.x'].tolist()[:5], self.x.tolist())
+        self.assertEqual(df['a.y'].tolist()[:5], self.y.tolist())
+        self.assertEqual(df['trace_1.z'][0].tolist(), [0., 0., 0.])
+
+    def test_to_dataframe_equal_columns(self):
+        figure = Figure(data=[Scatter(x=self.x, y=list(range(5)), name='a')])
+        df = figure.to_dataframe()
+        self.assertEqual(df['a.x'].tolist(), self.x.tolist())
+        self.assertEqual(df['a.y'].tolist(), [0, 1, 2, 3, 4])
+
+    @skipIf(not PANDAS_KEEPS_COLUMNS, 'needs pandas 1.3+')
+    def test_to_dataframe_shares_memory(self):
+        df = self.figure.to_dataframe()
+        self.assertTrue(np.shares_memory(df['a.x'].values, self.x))
+        self.assertTrue(np.shares_memory(df['a.y'].values, self.y.values))
+
+        figure = Figure(data=[Scatter(x=self.x, y=list(range(5)), name='a')])
+        df = figure.to_dataframe()
+        self.assertTrue(np.shares_memory(df['a.x'].values, self.x))
+
+    def test_get_role(self):
+        self.assertEqual(graph_reference.get_role(
+            'marker', 'size', np.array([1, 2]), ('scatter', )), 'data')
+        self.assertEqual(graph_reference.get_role(
+            'marker', 'size', np.array(1), ('scatter', )), 'style')
+
+    def test_replace_newline_keeps_arrays(self):
+        replaced = tools._replace_newline(self.figure)
+        self.assertIs(replaced['data'][0]['x'], self.x)
+        self.assertIs(replaced['data'][0]['y'], self.y)
+
+    def test_arrays_are_encoded(self):
+        encoded = json.loads(json.dumps(self.figure,
+                                        cls=utils.PlotlyJSONEncoder))
+        self.assertEqual(encoded['data'][0]['x'], [0., 1., 2., 3., 4.])
+        self.assertEqual(encoded['data'][0]['y'], [0., 2., 4., 6., 8.])
+
+    def test_replace_newline_in_string_arrays(self):
+        text = np.array(['a', 'b\nc'])
+        replaced = tools._replace_newline({'text': text})
+        self.assertEqual(replaced['text'].tolist(), ['a', 'b<br>c'])
+        self.assertEqual(text.tolist(), ['a', 'b\nc'])
+
+    def test_replace_newline_in_byte_string_arrays(self):
+        text = np.array([b'a', b'b\nc'])
+        replaced = tools._replace_newline({'text': text})
+        self.assertEqual(replaced['text'].tolist(), [b'a', b'b<br>c'])
+        self.assertEqual(text.tolist(), [b'a', b'b\nc'])
+
+    def test_diff(self):
+        self.figure.checkpoint()
+        self.figure['data'][0]['x'] = np.arange(7.)
+        self.figure['data'][1]['z'] = self.z.copy()
+        patches = self.figure.diff()
+        self.assertEqual(len(patches), 1)
+        method, update, indices = patches[0]
+        self.assertEqual((method, indices), ('extendTraces', [0]))
+        self.assertEqual(update['x'][0].tolist(), [5., 6.])
+
+    def test_diff_in_place(self):
+        self.figure.checkpoint()
+        self.z[1, 1] = 5
+        patches = self.figure.diff()
+        self.assertEqual(len(patches), 1)
+        method, update, indices = patches[0]
+        self.assertEqual((method, indices), ('restyle', [1]))
+        self.assertEqual(update['z'][0][1][1], 5)
@@ -0,0 +1,77 @@
+from __future__ import absolute_import
+
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from plotly.exceptions import PlotlyDataTypeError, PlotlyDictKeyError
+from plotly.graph_objs import Data, Scatter
+
+
+class TestDataFromFrame(TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({'group': ['a', 'a', 'b', 'b', 'b', 'c'],
+                                'x': np.arange(6.),
+                                'y': np.arange(6) * 2})
+
+    def test_one_trace_per_group(self):
+        data = Data.from_frame(self.df, x='x', y='y', group='group',
+                               mode='lines', marker={'color': 'red'})
+        self.assertIsInstance(data, Data)
+        self.assertEqual([trace['name'] for trace in data], ['a', 'b', 'c'])
+        self.assertEqual(data[1]['x'].tolist(), [2., 3., 4.])
+        self.assertEqual(data[1]['y'].tolist(), [4, 6, 8])
+        self.assertEqual(data[2]['marker'], {'color': 'red'})
+        self.assertEqual(data[2]['mode'], 'lines')
+        self.assertEqual(data[2]['marker']._get_path(), (2, 'marker'))
+
+        expected = Scatter(x=self.df['x'].values[:2],
+                           y=self.df['y'].values[:2], name='a',
+                           mode='lines', marker={'color': 'red'})
+        self.assertEqual(sorted(data[0].keys()), sorted(expected.keys()))
+
+    def test_grouped_rows_are_views(self):
+        data = Data.from_frame(self.df, x='x', y='y', group='group')
+        for trace in data:
+            self.assertTrue(np.shares_memory(trace['x'], self.df['x'].values))
+
+    def test_interleaved_rows(self):
+        df = self.df.iloc[[0, 2, 1, 3, 5, 4]]
+        data = Data.from_frame(df, x='x', y='y', group='group')
+        self.assertEqual([trace['x'].tolist() for trace in data],
+                         [[0., 1.], [2., 3., 4.], [5.]])
+
+    def test_missing_groups_are_dropped(self):
+        self.df.loc[0, 'group'] = None
+        data = Data.from_frame(self.df, x='x', y='y', group='group')
+        self.assertEqual([trace['x'].tolist() for trace in data],
+                         [[1.], [2., 3., 4.], [5.]])
+
+    def test_no_group(self):
+        data = Data.from_frame(self.df, y='y', trace_type='bar')
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['type'], 'bar')
+        self.assertEqual(data[0]['x'].tolist(), list(range(6)))
+        self.assertNotIn('name', data[0])
+
+    def test_template_is_validated(self):
+        self.assertRaises(PlotlyDictKeyError, Data.from_frame, self.df,
+                          x='x', y='y', group='group', foo='bar')
+        self.assertRaises(PlotlyDataTypeError, Data.from_frame, self.df,
+                          x='x', y='y', trace_type='foo')
+
+    def test_traces_dont_share_nested_values(self):
+        data = Data.from_frame(self.df, x='x', y='y', group='group',
+                               marker={'color': 'red', 'line': {'width': 1}},
+                               text=['a'])
+        dict.__getitem__(list.__getitem__(data, 0), 'marker')['color'] = 'b'
+        for key, val in data[1].items():
+            if isinstance(val, dict):
+                val['color'] = 'blue'
+        data[1]['marker']['line']['width'] = 2
+        data[1]['text'].append('b')
+        self.assertEqual(data[2]['marker'],
+                         {'color': 'red', 'line': {'width': 1}})
+        self.assertEqual(data[2]['text'], ['a'])
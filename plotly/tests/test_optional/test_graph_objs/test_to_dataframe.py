@@ -3,7 +3,7 @@ from __future__ import absolute_import
 from unittest import TestCase
 
 from plotly.graph_objs import (Data, Figure, Layout, Line, Margin, Marker,
-                               Scatter, XAxis, YAxis)
+                               Scatter, XAxis, YAxis, validation_mode)
 
 
 class TestToDataframe(TestCase):
@@ -106,3 +106,9 @@ class TestToDataframe(TestCase):
         df = self.fig.to_dataframe()
         self.assertEqual(len(df), 9)
         self.assertEqual(len(df.columns), 12)
+
+    def test_unvalidated_figure_to_dataframe(self):
+        with validation_mode('none'):
+            fig = Figure(data=[Scatter(x=[1, 2], y=[3, 4], bogus=1)])
+        df = fig.to_dataframe()
+        self.assertEqual(sorted(df.columns), ['trace_0.x', 'trace_0.y'])
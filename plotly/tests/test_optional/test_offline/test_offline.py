@@ -10,7 +10,10 @@ from nose.plugins.attrib import attr
 from unittest import TestCase
 import json
 
+import numpy as np
+
 import plotly
+from plotly import utils
 
 # TODO: matplotlib-build-wip
 from plotly.tools import _matplotlylib_imported
@@ -51,6 +54,20 @@ class PlotlyOfflineTestCase(TestCase):
         plotly.offline.init_notebook_mode()
         plotly.offline.iplot_mpl(fig)
 
+    def test_plot_with_typed_arrays(self):
+        z = np.arange(6, dtype='f8').reshape(2, 3)
+        html = plotly.offline.plot([{'type': 'heatmap', 'z': z}],
+                                   output_type='div', include_plotlyjs=False,
+                                   typed_arrays=True)
+        self.assertIn('window.PLOTLYENV.decodeTypedArrays = ', html)
+        self.assertIn('window.PLOTLYENV.decodeTypedArrays([{', html)
+        self.assertIn(utils.encode_typed_array(z)['bdata'], html)
+
+        html = plotly.offline.plot([{'type': 'heatmap', 'z': z}],
+                                   output_type='div', include_plotlyjs=False)
+        self.assertNotIn('decodeTypedArrays', html)
+        self.assertIn('[[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]', html)
+
 
 class PlotlyOfflineMPLTestCase(TestCase):
     def setUp(self):
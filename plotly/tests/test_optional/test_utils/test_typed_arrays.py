@@ -0,0 +1,98 @@
+"""
+Module to test the base64 typed array encoding in plotly.utils.
+
+"""
+from __future__ import absolute_import
+
+import json
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from plotly import utils
+from plotly.graph_objs import Heatmap, Figure
+
+
+def _round_trip(array):
+    encoded = json.dumps(array, cls=utils.PlotlyJSONEncoder,
+                         typed_arrays=True)
+    return utils.decode_typed_array(json.loads(encoded))
+
+
+class TestTypedArrays(TestCase):
+
+    def assert_round_trips(self, array, expected_dtype=None):
+        decoded = _round_trip(array)
+        self.assertEqual(decoded.shape, array.shape)
+        if expected_dtype is not None:
+            self.assertEqual(decoded.dtype, np.dtype(expected_dtype))
+        np.testing.assert_array_equal(decoded, array)
+
+    def test_round_trip_dtypes(self):
+        for dtype in utils.TYPED_ARRAY_DTYPES:
+            array = np.arange(-5, 5).astype(dtype)
+            self.assert_round_trips(array, expected_dtype=dtype)
+
+    def test_round_trip_shapes(self):
+        for shape in [(0,), (1,), (7,), (3, 4), (2, 3, 4), (4, 0)]:
+            array = np.arange(np.prod(shape), dtype='f8').reshape(shape)
+            self.assert_round_trips(array)
+
+    def test_round_trip_non_contiguous_and_big_endian(self):
+        array = np.arange(20, dtype='>f8').reshape(4, 5)[::2, 1::2]
+        self.assert_round_trips(array, expected_dtype='f8')
+        self.assert_round_trips(array.T)
+
+    def test_round_trip_nan_and_inf(self):
+        array = np.array([np.nan, np.inf, -np.inf, 1.5], dtype='f4')
+        self.assert_round_trips(array, expected_dtype='f4')
+
+    def test_int64_downcasting(self):
+        self.assert_round_trips(np.array([1, -2, 3]), expected_dtype='i4')
+        self.assert_round_trips(np.array([1, 2], dtype='u8'),
+                                expected_dtype='u4')
+        self.assert_round_trips(np.array([1, 2 ** 40]), expected_dtype='f8')
+        self.assert_round_trips(np.array([], dtype='i8'), expected_dtype='i4')
+
+    def test_encode_typed_array_format(self):
+        typed_array = utils.encode_typed_array(np.array([1., 2.]))
+        self.assertEqual(typed_array, {'dtype': 'f8',
+                                       'bdata': 'AAAAAAAA8D8AAAAAAAAAQA=='})
+        typed_array = utils.encode_typed_array(np.zeros((2, 1), dtype='u1'))
+        self.assertEqual(typed_array, {'dtype': 'u1', 'bdata': 'AAA=',
+                                       'shape': '2, 1'})
+
+    def test_encode_typed_array_unsupported(self):
+        for array in [np.array(1.), np.array([True]), np.array(['a']),
+                      np.array([1j]), np.array([1, None])]:
+            self.assertRaises(ValueError, utils.encode_typed_array, array)
+
+    def test_unsupported_arrays_fall_back_to_lists(self):
+        data = {'b': np.array([True, False]), 'o': np.array(['a', 'b']),
+                'm': np.ma.array([1., 2.], mask=[False, True])}
+        encoded = json.dumps(data, cls=utils.PlotlyJSONEncoder,
+                             typed_arrays=True, sort_keys=True)
+        self.assertEqual(encoded,
+                         '{"b": [true, false], "m": [1.0, null], '
+                         '"o": ["a", "b"]}')
+
+    def test_pandas_values_are_typed(self):
+        series = pd.Series([1.5, 2.5])
+        index = pd.Index([1, 2, 3])
+        self.assertEqual(_round_trip(series).tolist(), [1.5, 2.5])
+        self.assertEqual(_round_trip(index).tolist(), [1, 2, 3])
+
+    def test_typed_arrays_are_opt_in(self):
+        encoded = json.dumps(np.array([1, 2]), cls=utils.PlotlyJSONEncoder)
+        self.assertEqual(encoded, '[1, 2]')
+
+    def test_figure_round_trip(self):
+        z = np.random.random((20, 30))
+        figure = Figure(data=[Heatmap(z=z)])
+        encoded = json.dumps(figure, cls=utils.PlotlyJSONEncoder,
+                             typed_arrays=True)
+        decoded = json.loads(encoded)
+        decoded_z = utils.decode_typed_array(decoded['data'][0]['z'])
+        np.testing.assert_array_equal(decoded_z, z)
+        self.assertEqual(decoded['data'][0]['type'], 'heatmap')
@@ -294,6 +294,53 @@ def test_numpy_dates():
                  '"2011-07-17"]')
 
 
+def test_numpy_datetime64_json_encoding():
+
+    # any unit of datetime64 becomes plotly time strings, nested like input
+
+    a = np.array([['2011-01-01T00:00:00', '2011-01-01T01:02:03.000001'],
+                  ['NaT', '2011-01-01T01:02:03.000000001']],
+                 dtype='datetime64[ns]')
+    j1 = json.dumps(a, cls=utils.PlotlyJSONEncoder)
+    assert(j1 == '[["2011-01-01", "2011-01-01 01:02:03.000001"], '
+                 '[null, "2011-01-01 01:02:03.000000001"]]')
+
+    b = np.array(['2011-07-11T05', '2011-07-12T00'], dtype='datetime64[h]')
+    j2 = json.dumps(b, cls=utils.PlotlyJSONEncoder)
+    assert(j2 == '["2011-07-11 05:00:00", "2011-07-12"]')
+
+
+def test_pandas_datetime_tz_json_encoding():
+
+    # timezone-aware values are converted to utc first
+
+    rng_tz = pd.date_range('1/1/2011', periods=2, freq='7H', tz='Asia/Tokyo')
+    j1 = json.dumps(rng_tz, cls=utils.PlotlyJSONEncoder)
+    assert(j1 == '["2010-12-31 15:00:00", "2010-12-31 22:00:00"]')
+
+    j2 = json.dumps(pd.Series(rng_tz), cls=utils.PlotlyJSONEncoder)
+    assert(j2 == j1)
+
+
+def test_get_encoding_method_name():
+
+    # lookups go by type, with the most specific type winning
+
+    test_tuples = [
+        (np.ndarray, 'encode_as_numpy_array'),
+        (np.ma.MaskedArray, 'encode_as_list'),
+        (np.float64, 'encode_as_list'),
+        (pd.Series, 'encode_as_pandas_array'),
+        (pd.DatetimeIndex, 'encode_as_pandas_array'),
+        (pd.Timestamp, 'encode_as_datetime'),
+        (datetime.date, 'encode_as_date'),
+        (object, None)
+    ]
+    for obj_type, expected_method_name in test_tuples:
+        method_name = utils.get_encoding_method_name(obj_type)
+        assert(method_name == expected_method_name)
+
+
 def test_datetime_dot_date():
     a = [datetime.date(2014, 1, 1), datetime.date(2014, 1, 2)]
     j1 = json.dumps(a, cls=utils.PlotlyJSONEncoder)
@@ -10,6 +10,9 @@ Functions that USERS will possibly want access to.
 from __future__ import absolute_import
 from collections import OrderedDict
 
+import copy
+import os
+import threading
 import warnings
 
 import six
@@ -20,7 +23,7 @@ from plotly import exceptions
 from plotly import graph_reference
 from plotly import session
 from plotly.files import (CONFIG_FILE, CREDENTIALS_FILE, FILE_CONTENT,
-                          GRAPH_REFERENCE_FILE, check_file_permissions)
+                          check_file_permissions)
 
 DEFAULT_PLOTLY_COLORS = ['rgb(31, 119, 180)', 'rgb(255, 127, 14)',
                          'rgb(44, 160, 44)', 'rgb(214, 39, 40)',
@@ -103,26 +106,11 @@ def get_config_defaults():
 def ensure_local_plotly_files():
     """Ensure that filesystem is setup/filled out in a valid way.
     If the config or credential files aren't filled out, then write them
-    to the disk.
+    to the disk. Files that are already valid aren't rewritten.
     """
     if check_file_permissions():
         for fn in [CREDENTIALS_FILE, CONFIG_FILE]:
-            utils.ensure_file_exists(fn)
-            contents = utils.load_json_dict(fn)
-            for key, val in list(FILE_CONTENT[fn].items()):
-                # TODO: removed type checking below, may want to revisit
-                if key not in contents:
-                    contents[key] = val
-            contents_keys = list(contents.keys())
-            for key in contents_keys:
-                if key not in FILE_CONTENT[fn]:
-                    del contents[key]
-            utils.save_json_dict(fn, contents)
-
-        # make a request to get graph reference if DNE.
-        utils.ensure_file_exists(GRAPH_REFERENCE_FILE)
-        utils.save_json_dict(GRAPH_REFERENCE_FILE,
-                             graph_reference.GRAPH_REFERENCE)
+            _ensure_local_plotly_file(fn)
 
     else:
         warnings.warn("Looks like you don't have 'read-write' permission to "
@@ -134,6 +122,81 @@ def ensure_local_plotly_files():
                       "\nQuestions? support@plot.ly")
 
 
+def _ensure_local_plotly_file(fn):
+    """Fill out a local plotly file and return its contents as a dict."""
+    utils.ensure_file_exists(fn)
+    contents = utils.load_json_dict(fn)
+    valid_contents = _get_valid_contents(fn, contents)
+    if valid_contents != contents:
+        utils.save_json_dict(fn, valid_contents)
+    return valid_contents
+
+
+def _get_valid_contents(fn, contents):
+    """Fill in missing defaults and drop unknown keys, in a copy."""
+    valid_contents = dict(contents)
+    for key, val in list(FILE_CONTENT[fn].items()):
+        # TODO: removed type checking below, may want to revisit
+        if key not in valid_contents:
+            valid_contents[key] = val
+    contents_keys = list(valid_contents.keys())
+    for key in contents_keys:
+        if key not in FILE_CONTENT[fn]:
+            del valid_contents[key]
+    return valid_contents
+
+
+# The config and credentials files are read for every api call. Their
+# validated contents are kept here, keyed by filename, along with the stat
+# result they were read with: {filename: (stamp, contents)}.
+_local_plotly_files = {}
+_local_plotly_files_lock = threading.Lock()
+
+
+def _get_file_stamp(fn):
+    """Return what's needed from `os.stat` to tell if a file has changed."""
+    try:
+        stat = os.stat(fn)
+    except OSError:
+        return None
+    return (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size,
+            stat.st_ino)
+
+
+def _load_local_plotly_file(fn, *args):
+    """
+    Return the validated contents of a local plotly file as a dict.
+
+    The file is only read when it has changed since the last call, otherwise
+    a copy of the cached contents is returned. It's never written, missing
+    defaults are filled in and unknown keys dropped in memory. Creating and
+    repairing the files is left to `ensure_local_plotly_files`.
+
+    :param (str) fn: Either `CONFIG_FILE` or `CREDENTIALS_FILE`.
+    :param (str) args: Only return these keys. Returns all if none are given.
+
+    """
+    # the stamp is taken before the file is read, so if another process
+    # writes it while it's read, the next call sees a new stamp
+    stamp = _get_file_stamp(fn)
+    with _local_plotly_files_lock:
+        cached_stamp, contents = _local_plotly_files.get(fn, (None, None))
+    if stamp is None or stamp != cached_stamp:
+        contents = _get_valid_contents(fn, utils.load_json_dict(fn))
+        with _local_plotly_files_lock:
+            _local_plotly_files[fn] = (stamp, contents)
+    if args:
+        return {key: copy.deepcopy(contents[key])
+                for key in args if key in contents}
+    return copy.deepcopy(contents)
+
+
+def _clear_local_plotly_files():
+    """Forget the cached contents of the local plotly files."""
+    with _local_plotly_files_lock:
+        _local_plotly_files.clear()
+
+
 ### credentials tools ###
 
 def set_credentials_file(username=None,
@@ -166,6 +229,7 @@ def set_credentials_file(username=None,
     if isinstance(stream_ids, (list, tuple)):
         credentials['stream_ids'] = stream_ids
     utils.save_json_dict(CREDENTIALS_FILE, credentials)
+    _clear_local_plotly_files()
     ensure_local_plotly_files()  # make sure what we just put there is OK
 
 
@@ -179,8 +243,7 @@ def get_credentials_file(*args):
 
     """
     if check_file_permissions():
-        ensure_local_plotly_files()  # make sure what's there is OK
-        return utils.load_json_dict(CREDENTIALS_FILE, *args)
+        return _load_local_plotly_file(CREDENTIALS_FILE, *args)
     else:
         return FILE_CONTENT[CREDENTIALS_FILE]
 
@@ -188,6 +251,7 @@ def get_credentials_file(*args):
 def reset_credentials_file():
     ensure_local_plotly_files()  # make sure what's there is OK
     utils.save_json_dict(CREDENTIALS_FILE, {})
+    _clear_local_plotly_files()
     ensure_local_plotly_files()  # put the defaults back
 
 
@@ -255,6 +319,7 @@ def set_config_file(plotly_domain=None,
     utils.set_sharing_and_world_readable(settings)
 
     utils.save_json_dict(CONFIG_FILE, settings)
+    _clear_local_plotly_files()
     ensure_local_plotly_files()  # make sure what we just put there is OK
 
 
@@ -268,8 +333,7 @@ def get_config_file(*args):
 
     """
     if check_file_permissions():
-        ensure_local_plotly_files()  # make sure what's there is OK
-        return utils.load_json_dict(CONFIG_FILE, *args)
+        return _load_local_plotly_file(CONFIG_FILE, *args)
     else:
         return FILE_CONTENT[CONFIG_FILE]
 
@@ -278,6 +342,7 @@ def reset_config_file():
     ensure_local_plotly_files()  # make sure what's there is OK
     f = open(CONFIG_FILE, 'w')
     f.close()
+    _clear_local_plotly_files()
     ensure_local_plotly_files()  # put the defaults back
 
 
@@ -1348,30 +1413,90 @@ def validate(obj, obj_type):
     cls(obj)  # this will raise on invalid keys/items
 
 
+# List entries of these types never hold a newline, see `_replace_newline`.
+_NON_STRING_TYPES = set(six.integer_types + (float, bool, type(None)))
+
+
 def _replace_newline(obj):
-    """Replaces '\n' with '<br>' for all strings in a collection."""
-    if isinstance(obj, dict):
-        d = dict()
-        for key, val in list(obj.items()):
-            d[key] = _replace_newline(val)
-        return d
-    elif isinstance(obj, list):
-        l = list()
-        for index, entry in enumerate(obj):
-            l += [_replace_newline(entry)]
-        return l
-    elif isinstance(obj, six.string_types):
-        s = obj.replace('\n', '<br>')
-        if s != obj:
-            warnings.warn("Looks like you used a newline character: '\\n'.\n\n"
-                          "Plotly uses a subset of HTML escape characters\n"
-                          "to do things like newline (<br>), bold (<b></b>),\n"
-                          "italics (<i></i>), etc. Your newline characters \n"
-                          "have been converted to '<br>' so they will show \n"
-                          "up right on your Plotly figure!")
-        return s
-    else:
-        return obj  # we return the actual reference... but DON'T mutate.
+    """
+    Replaces '\n' with '<br>' for all strings in a collection.
+
+    `obj` isn't mutated. Only the dicts and lists that hold a newline are
+    copied, everything else is returned (and shared) as it is. Lists of
+    numbers and numeric numpy arrays are skipped without looking at every
+    entry, lists of strings and numpy string arrays are checked in one step.
+
+    """
+    new_obj = _replace_newline_in_value(obj)
+    if new_obj is not obj:
+        warnings.warn("Looks like you used a newline character: '\\n'.\n\n"
+                      "Plotly uses a subset of HTML escape characters\n"
+                      "to do things like newline (<br>), bold (<b></b>),\n"
+                      "italics (<i></i>), etc. Your newline characters \n"
+                      "have been converted to '<br>' so they will show \n"
+                      "up right on your Plotly figure!")
+    return new_obj
+
+
+def _replace_newline_in_value(value):
+    """See `_replace_newline`, returns `value` itself if nothing changed."""
+    if isinstance(value, six.string_types):
+        if '\n' in value:
+            return value.replace('\n', '<br>')
+        return value
+
+    if isinstance(value, dict):
+
+        # dict.items skips the lazy wrapping of graph objects
+        new_value = None
+        for key, val in dict.items(value):
+            new_val = _replace_newline_in_value(val)
+            if new_val is not val:
+                if new_value is None:
+                    new_value = dict(dict.items(value))
+                new_value[key] = new_val
+        return value if new_value is None else new_value
+
+    if isinstance(value, list):
+        entry_types = set(map(type, list.__iter__(value)))
+        if entry_types <= _NON_STRING_TYPES:
+            return value
+        entry_type = entry_types.pop() if len(entry_types) == 1 else None
+        if entry_type is not None and issubclass(entry_type,
+                                                 six.string_types):
+            if '\n' not in entry_type().join(list.__iter__(value)):
+                return value
+            return [entry.replace('\n', '<br>')
+                    for entry in list.__iter__(value)]
+
+        new_value = None
+        for index, entry in enumerate(list.__iter__(value)):
+            new_entry = _replace_newline_in_value(entry)
+            if new_entry is not entry:
+                if new_value is None:
+                    new_value = list(list.__iter__(value))
+                new_value[index] = new_entry
+        return value if new_value is None else new_value
+
+    if _numpy_imported and isinstance(value, np.ndarray):
+
+        # 'S' arrays hold bytes, they're what np.array makes of str on py2
+        kind = value.dtype.kind
+        if kind == 'U':
+            newline, br = '\n', '<br>'
+        elif kind == 'S':
+            newline, br = b'\n', b'<br>'
+        else:
+            return value
+        if (np.char.find(value, newline) >= 0).any():
+
+            # make room, replace won't grow the strings past their dtype
+            max_length = (4 * value.dtype.itemsize //
+                          np.dtype(kind + '1').itemsize)
+            value = value.astype('{0}{1}'.format(kind, max_length))
+            return np.char.replace(value, newline, br)
+
+    return value  # we return the actual reference... but DON'T mutate.
 
 
 if _ipython_imported:
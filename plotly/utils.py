@@ -7,13 +7,18 @@ Low-level functionality NOT intended for users to EVER use.
 """
 from __future__ import absolute_import
 
+import base64
+import datetime
+import functools
 import json
 import os.path
 import re
 import sys
 import threading
+from collections import OrderedDict
 
 import pytz
+import six
 
 
 from . exceptions import PlotlyError
@@ -111,6 +116,206 @@ class NotEncodable(Exception):
     pass
 
 
+# (type, method name) pairs for `get_encoding_method_name`. The most specific
+# types come first.
+_ENCODING_METHOD_NAMES_BY_TYPE = []
+if _numpy_imported:
+    _ENCODING_METHOD_NAMES_BY_TYPE += [
+        (numpy.ma.core.MaskedConstant, 'encode_as_numpy'),
+        (numpy.ma.MaskedArray, 'encode_as_list'),
+        (numpy.ndarray, 'encode_as_numpy_array'),
+        (numpy.generic, 'encode_as_list')
+    ]
+if _pandas_imported:
+    _ENCODING_METHOD_NAMES_BY_TYPE += [
+        (type(pandas.NaT), 'encode_as_pandas'),
+        (pandas.Series, 'encode_as_pandas_array'),
+        (pandas.Index, 'encode_as_pandas_array')
+    ]
+_ENCODING_METHOD_NAMES_BY_TYPE += [
+    (datetime.datetime, 'encode_as_datetime'),
+    (datetime.date, 'encode_as_date')
+]
+_encoding_method_names = {}
+
+
+def get_encoding_method_name(obj_type):
+    """
+    Look up which PlotlyJSONEncoder method should encode `obj_type` objects.
+
+    Results are cached per type, so the common types cost one dict lookup.
+
+    :param (type) obj_type: The type of an object we need to encode.
+    :return: (str|None) The name of an `encode_as_*` method or None.
+
+    """
+    try:
+        return _encoding_method_names[obj_type]
+    except KeyError:
+        pass
+    method_name = None
+    for base_type, base_method_name in _ENCODING_METHOD_NAMES_BY_TYPE:
+        if issubclass(obj_type, base_type):
+            method_name = base_method_name
+            break
+    _encoding_method_names[obj_type] = method_name
+    return method_name
+
+
+# Codes for the typed arrays JavaScript has, they're also numpy dtype strings.
+TYPED_ARRAY_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8')
+
+
+def coerce_json_to_strict(json_string):
+    """
+    Replace 'NaN', 'Infinity' and '-Infinity' constants with 'null'.
+
+    Splitting on '"' alternates between text outside and inside of strings.
+    Only text outside of strings is touched, so strings containing 'NaN' are
+    left alone. Escaped quotes don't end a string and are skipped over.
+
+    :param (str) json_string: JSON, possibly with extended constants.
+    :return: (str) Strict JSON.
+
+    """
+    if 'NaN' not in json_string and 'Infinity' not in json_string:
+        return json_string  # the common case, nothing to replace.
+
+    parts = json_string.split('"')
+    in_string = False
+    for i, part in enumerate(parts):
+        if not in_string:
+            parts[i] = (part.replace('-Infinity', 'null')
+                            .replace('Infinity', 'null')
+                            .replace('NaN', 'null'))
+            in_string = True
+        elif (len(part) - len(part.rstrip('\\'))) % 2 == 0:
+            in_string = False  # this quote wasn't escaped, the string ended.
+    return '"'.join(parts)
+
+
+def encode_typed_array(array):
+    """
+    Encode a numeric numpy array as a base64 typed array.
+
+    The result has the form:
+    {
+      'dtype': 'f8',
+      'bdata': 'AAAAAAAA8D8AAAAAAAAAQA==',
+      'shape': '2, 1'
+    }
+
+    'dtype' is one of TYPED_ARRAY_DTYPES, 'bdata' holds the little-endian,
+    C-ordered bytes and 'shape' is only given for arrays that aren't 1-d.
+    64-bit ints are downcast to 32-bit ints if they fit, else to floats,
+    since there are no 64-bit int typed arrays in JavaScript. NaN and Inf
+    are kept as-is rather than becoming null.
+
+    :param (numpy.ndarray) array: The array to encode.
+    :return: (dict)
+    :raises: (ValueError) If the array can't be held in a typed array.
+
+    """
+    if array.ndim == 0:
+        raise ValueError("Can't encode a 0-d array as a typed array.")
+
+    dtype = array.dtype
+    if dtype.kind in ('i', 'u') and dtype.itemsize == 8:
+        small_dtype = numpy.dtype('{}4'.format(dtype.kind))
+        small_info = numpy.iinfo(small_dtype)
+        if (not array.size or (array.min() >= small_info.min and
+                               array.max() <= small_info.max)):
+            dtype = small_dtype
+        else:
+            dtype = numpy.dtype('f8')
+
+    typed_array_dtype = '{}{}'.format(dtype.kind, dtype.itemsize)
+    if typed_array_dtype not in TYPED_ARRAY_DTYPES:
+        raise ValueError("Can't encode '{}' arrays as typed arrays."
+                         .format(array.dtype))
+
+    array = numpy.ascontiguousarray(array, dtype=dtype.newbyteorder('<'))
+    typed_array = {
+        'dtype': typed_array_dtype,
+        'bdata': base64.b64encode(array.tobytes()).decode('ascii')
+    }
+    if array.ndim != 1:
+        typed_array['shape'] = ', '.join(str(n) for n in array.shape)
+    return typed_array
+
+
+def decode_typed_array(typed_array):
+    """
+    Decode a base64 typed array into a numpy array. See `encode_typed_array`.
+
+    :param (dict) typed_array: Has 'dtype', 'bdata' and maybe 'shape' keys.
+    :return: (numpy.ndarray) A read-only array.
+
+    """
+    dtype = numpy.dtype('<' + typed_array['dtype'])
+    data = base64.b64decode(typed_array['bdata'])
+    array = numpy.frombuffer(data, dtype=dtype)
+    if 'shape' in typed_array:
+        shape = [int(n) for n in str(typed_array['shape']).split(',')]
+        array = array.reshape(shape)
+    return array
+
+
+def datetime64_to_plotly_time_strings(values):
+    """
+    Vectorized `iso_to_plotly_time_string` for naive numpy.datetime64 arrays.
+
+    Strings match what `PlotlyJSONEncoder.encode_as_datetime` and
+    `PlotlyJSONEncoder.encode_as_date` give for each value. Times at midnight
+    are just dates and fractional seconds are only included if non-zero.
+
+    :param (numpy.ndarray) values: An array with a datetime64 dtype.
+    :return: (list) Strings, or None for NaT, nested like `values`.
+
+    """
+    shape = values.shape
+    values = values.ravel()
+    unit = numpy.datetime_data(values.dtype)[0]
+
+    # NaT is stored as the smallest int64
+    is_nat = values.view('i8') == numpy.iinfo('i8').min
+    days = values.astype('datetime64[D]')
+    if unit in ('Y', 'M', 'W', 'D'):
+        is_time = numpy.zeros(values.shape, dtype=bool)
+    else:
+        is_time = (values != days) & ~is_nat
+
+    strings = numpy.empty(values.shape, dtype=object)
+    strings[~is_time] = numpy.datetime_as_string(days[~is_time], unit='D')
+
+    if is_time.any():
+        values = values[is_time]
+        seconds = values.astype('datetime64[s]')
+        times = numpy.datetime_as_string(seconds, unit='s')
+        if times.dtype == numpy.dtype('U19'):
+            # every year has 4 digits, so 'T' is always the 11th character
+            times.view('U1').reshape(-1, 19)[:, 10] = ' '
+        else:
+            times = numpy.char.replace(times, 'T', ' ')
+        times = times.astype(object)
+
+        nanoseconds = (values - seconds).astype('timedelta64[ns]').view('i8')
+        has_fraction = nanoseconds != 0
+        if has_fraction.any():
+            nanoseconds = nanoseconds[has_fraction]
+            fractions = numpy.where(
+                nanoseconds % 1000 == 0,
+                numpy.char.mod('.%06d', nanoseconds // 1000),
+                numpy.char.mod('.%09d', nanoseconds)
+            ).astype(object)
+            times[has_fraction] += fractions
+
+        strings[is_time] = times
+
+    strings[is_nat] = None
+    return strings.reshape(shape).tolist()
+
+
 class PlotlyJSONEncoder(json.JSONEncoder):
     """
     Meant to be passed as the `cls` kwarg to json.dumps(obj, cls=..)
@@ -121,10 +326,18 @@ class PlotlyJSONEncoder(json.JSONEncoder):
     'NaN' and '-Inf' encode to 'null'. Which is stricter JSON than the Python
     version.
 
+    Pass `typed_arrays=True` to encode numeric numpy arrays (and pandas
+    Series/Index) as compact, base64 typed arrays. See `encode_typed_array`.
+    These *must* be decoded before they're given to plotly.js.
+
     """
+    def __init__(self, *args, **kwargs):
+        self.typed_arrays = kwargs.pop('typed_arrays', False)
+        super(PlotlyJSONEncoder, self).__init__(*args, **kwargs)
+
     def coerce_to_strict(self, const):
         """
-        This is used to ultimately *encode* into strict JSON, see `encode`
+        Map extended JSON constants to None. Kept for backwards compat.
 
         """
         # before python 2.7, 'true', 'false', 'null', were include here.
@@ -135,32 +348,87 @@ class PlotlyJSONEncoder(json.JSONEncoder):
 
     def encode(self, o):
         """
-        Load and then dump the result using parse_constant kwarg
+        Encode into strict JSON in a single pass.
 
-        Note that setting invalid separators will cause a failure at this step.
+        The builtin encoder can't be told how to write non-finite floats, it
+        always writes them as bare 'NaN', 'Infinity' and '-Infinity' tokens.
+        Those are swapped for 'null' in the encoded string, without parsing
+        and re-encoding the result.
 
         """
-
-        # this will raise errors in a normal-expected way
         encoded_o = super(PlotlyJSONEncoder, self).encode(o)
+        return coerce_json_to_strict(encoded_o)
 
-        # now:
-        #    1. `loads` to switch Infinity, -Infinity, NaN to None
-        #    2. `dumps` again so you get 'null' instead of extended JSON
-        try:
-            new_o = json.loads(encoded_o, parse_constant=self.coerce_to_strict)
-        except ValueError:
+    def iterencode(self, o, _one_shot=False):
+        """
+        Encode into strict JSON, yielding the result in chunks.
 
-            # invalid separators will fail here. raise a helpful exception
-            raise ValueError(
-                "Encoding into strict JSON failed. Did you set the separators "
-                "valid JSON separators?"
-            )
+        `json.dump` uses this, so `json.dump(figure, f, cls=PlotlyJSONEncoder)`
+        writes to `f` as it goes instead of building the whole string first.
+
+        Dicts with string keys and lists of dicts (e.g., figures, layouts and
+        lists of traces) are walked. Everything else, like an array of
+        numbers, is encoded in one piece with the fast, builtin encoder. So
+        chunks are about as large as the largest value in `o`.
+
+        """
+        if _one_shot:
+            # `encode` coerces to strict JSON once everything is joined.
+            return super(PlotlyJSONEncoder, self).iterencode(o, _one_shot)
+        if self.indent is not None:
+            # The builtin encoder keeps track of indentation for us. Its
+            # chunks never split a string, so each one can be coerced alone.
+            return (coerce_json_to_strict(chunk) for chunk in
+                    super(PlotlyJSONEncoder, self).iterencode(o))
+        markers = {} if self.check_circular else None
+        return self._iterencode_chunks(o, markers)
+
+    def _iterencode_chunks(self, o, markers):
+        """See `iterencode`. `markers` tracks ids of containers we're in."""
+        if isinstance(o, dict):
+            is_container = all(isinstance(key, six.string_types) for key in o)
+        elif isinstance(o, (list, tuple)):
+            # skip `__iter__` overrides, like the lazy wrapping in PlotlyList
+            if isinstance(o, list) and type(o) is not list:
+                values = list.__getitem__(o, slice(None))
+            else:
+                values = o
+            is_container = any(isinstance(item, dict) for item in values)
+        else:
+            is_container = False
+
+        if not is_container:
+            yield self.encode(o)
+            return
+
+        if markers is not None:
+            if id(o) in markers:
+                raise ValueError('Circular reference detected')
+            markers[id(o)] = o
+
+        if isinstance(o, dict):
+            items = dict.items(o)  # skip wrapping, like for lists above
+            if self.sort_keys:
+                items = sorted(items)
+            yield '{'
+            for i, (key, value) in enumerate(items):
+                if i:
+                    yield self.item_separator
+                yield self.encode(key) + self.key_separator
+                for chunk in self._iterencode_chunks(value, markers):
+                    yield chunk
+            yield '}'
         else:
-            return json.dumps(new_o, sort_keys=self.sort_keys,
-                              indent=self.indent,
-                              separators=(self.item_separator,
-                                          self.key_separator))
+            yield '['
+            for i, value in enumerate(values):
+                if i:
+                    yield self.item_separator
+                for chunk in self._iterencode_chunks(value, markers):
+                    yield chunk
+            yield ']'
+
+        if markers is not None:
+            del markers[id(o)]
 
     def default(self, obj):
         """
@@ -193,9 +461,28 @@ class PlotlyJSONEncoder(json.JSONEncoder):
         Therefore, we only anticipate either unknown iterables or values here.
 
         """
+        # objects with their own encoding always come first
+        try:
+            return self.encode_as_plotly(obj)
+        except NotEncodable:
+            pass
+
+        if self.typed_arrays:
+            try:
+                return self.encode_as_typed_array(obj)
+            except NotEncodable:
+                pass
+
+        # most objects can be encoded based on their type alone
+        encoding_method_name = get_encoding_method_name(type(obj))
+        if encoding_method_name is not None:
+            try:
+                return getattr(self, encoding_method_name)(obj)
+            except NotEncodable:
+                pass
+
         # TODO: The ordering if these methods is *very* important. Is this OK?
         encoding_methods = (
-            self.encode_as_plotly,
             self.encode_as_sage,
             self.encode_as_numpy,
             self.encode_as_pandas,
@@ -261,6 +548,54 @@ class PlotlyJSONEncoder(json.JSONEncoder):
         else:
             raise NotEncodable
 
+    @staticmethod
+    def encode_as_numpy_array(obj):
+        """Attempt to convert a numeric or datetime64 numpy.ndarray."""
+        if not _numpy_imported or not isinstance(obj, numpy.ndarray):
+            raise NotEncodable
+
+        # non-finite floats are handled by `coerce_json_to_strict`
+        if obj.dtype.kind in 'biuf':
+            return obj.tolist()
+        elif obj.dtype.kind == 'M':
+            return datetime64_to_plotly_time_strings(obj)
+        else:
+            raise NotEncodable
+
+    @staticmethod
+    def encode_as_typed_array(obj):
+        """Attempt to convert a numeric array to a base64 typed array."""
+        if not _numpy_imported:
+            raise NotEncodable
+        if _pandas_imported and isinstance(obj, (pandas.Series, pandas.Index)):
+            obj = obj.values
+        if (not isinstance(obj, numpy.ndarray) or
+                isinstance(obj, numpy.ma.MaskedArray)):
+            raise NotEncodable
+        try:
+            return encode_typed_array(obj)
+        except ValueError:
+            raise NotEncodable
+
+    @staticmethod
+    def encode_as_pandas_array(obj):
+        """Attempt to convert a numeric or datetime pandas Series or Index."""
+        if not _pandas_imported:
+            raise NotEncodable
+        if not isinstance(obj, (pandas.Series, pandas.Index)):
+            raise NotEncodable
+
+        kind = getattr(obj.dtype, 'kind', None)
+        if kind in ('b', 'i', 'u', 'f') and isinstance(obj.dtype, numpy.dtype):
+            return obj.values.tolist()
+        elif kind == 'M':
+            values = pandas.DatetimeIndex(obj)
+            if values.tz is not None:
+                values = values.tz_convert('UTC').tz_localize(None)
+            return datetime64_to_plotly_time_strings(values.values)
+        else:
+            raise NotEncodable
+
     @staticmethod
     def encode_as_datetime(obj):
         """Attempt to convert to utc-iso time string using datetime methods."""
@@ -343,6 +678,64 @@ def get_first_duplicate(items):
     return None
 
 
+### memoization
+def memoize(maxsize=128):
+    """
+    Cache the results of a function of hashable, positional arguments.
+
+    This is a small stand-in for Python 3's `functools.lru_cache`. Once
+    `maxsize` results are cached, the least-recently used one is dropped.
+    The wrapped function gets `cache_clear()` and `cache_info()` methods.
+
+    :param (int) maxsize: The maximum number of results to keep.
+    :return: (function) A decorator.
+
+    Example:
+
+        >>> @memoize(maxsize=2)
+        >>> def add(a, b):
+        >>>     return a + b
+
+    """
+    def _decorator(func):
+        cache = OrderedDict()
+        cache_lock = threading.Lock()
+        info = {'hits': 0, 'misses': 0}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            with cache_lock:
+                try:
+                    result = cache.pop(args)
+                except KeyError:
+                    pass
+                else:
+                    cache[args] = result  # re-insert as most-recently used
+                    info['hits'] += 1
+                    return result
+            result = func(*args)
+            with cache_lock:
+                info['misses'] += 1
+                cache[args] = result
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        def cache_clear():
+            with cache_lock:
+                cache.clear()
+                info.update(hits=0, misses=0)
+
+        def cache_info():
+            with cache_lock:
+                return dict(info, maxsize=maxsize, currsize=len(cache))
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_info = cache_info
+        return wrapper
+    return _decorator
+
+
 ### source key
 def is_source_key(key):
     src_regex = re.compile(r'.+src$')